@@ -0,0 +1,128 @@
+"""マニュアルのページのHTMLからmarkdownへの変換のベンチマーク
+
+ページ全体をhtml.parserで解析する従来の変換と、本文の部分木のみを解析する変換
+（html.parser・lxml）、およびハッシュ値による変換結果の再利用について、
+変換時間とピークメモリ使用量を比較する。
+
+対象のページは、--corpusで指定したディレクトリの*.htmlファイル、
+指定しない場合はread_manual・read_api_manualでキャッシュしたページのHTMLを使う。
+
+    uv run python benchmarks/bench_manual_convert.py [--corpus DIR] [--repeat N]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from html_to_markdown import convert_to_markdown  # noqa: E402
+
+from docs import converter  # noqa: E402
+from docs.manual import MANUAL_CACHE  # noqa: E402
+from docs.search import manual_source  # noqa: E402
+
+
+def load_corpus(corpus: Optional[Path]) -> List[Tuple[str, Dict[str, str]]]:
+    """(HTML, 本文の要素の属性) のリストを読み込む"""
+    if corpus:
+        # APIマニュアルのページはファイル名に"api"を含めて区別する
+        return [
+            (
+                path.read_text(encoding="utf-8"),
+                converter.API_MANUAL_CONTENT_ATTRS
+                if "api" in path.name
+                else converter.MANUAL_MAIN_ATTRS,
+            )
+            for path in sorted(corpus.glob("*.html"))
+        ]
+    return [
+        (
+            entry["Html"],
+            converter.API_MANUAL_CONTENT_ATTRS
+            if manual_source(url) == "api"
+            else converter.MANUAL_MAIN_ATTRS,
+        )
+        for url, entry in MANUAL_CACHE.items()
+        if isinstance(entry, dict) and entry.get("Html")
+    ]
+
+
+def legacy(html: str, attrs: Dict[str, str]) -> Optional[str]:
+    """ページ全体をhtml.parserで解析する従来の変換"""
+    soup = BeautifulSoup(html, "html.parser")
+    main_html = soup.find(attrs=attrs)
+    return convert_to_markdown(main_html) if main_html else None
+
+
+def measure(
+    pages: List[Tuple[str, Dict[str, str]]], convert: Callable, repeat: int
+) -> Tuple[float, float]:
+    """全ページの変換時間の中央値（秒）とピークメモリ使用量（MiB）を計測する"""
+    times = []
+    for _ in range(repeat):
+        converter.clear_converted()
+        start = time.perf_counter()
+        for html, attrs in pages:
+            convert(html, attrs)
+        times.append(time.perf_counter() - start)
+
+    converter.clear_converted()
+    tracemalloc.start()
+    for html, attrs in pages:
+        convert(html, attrs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="*.htmlファイルを置いたディレクトリ")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        sys.exit(
+            "対象のページがありません。--corpusを指定するか、read_manualでページをキャッシュしてください。"
+        )
+    size = sum(len(html.encode("utf-8")) for html, _ in pages) / 1024 / 1024
+    print(
+        f"{len(pages)}ページ（{size:.1f} MiB）, repeat={args.repeat}, lxml={converter.HTML_PARSER == 'lxml'}"
+    )
+
+    cases = [
+        ("legacy html.parser (full page)", legacy),
+        (
+            "strained html.parser",
+            lambda html, attrs: converter.extract_markdown(html, attrs, "html.parser"),
+        ),
+    ]
+    if converter.HTML_PARSER == "lxml":
+        cases.append(
+            ("strained lxml", lambda html, attrs: converter.extract_markdown(html, attrs, "lxml"))
+        )
+
+    print(f"{'case':<32}{'time [s]':>10}{'per page [ms]':>15}{'peak [MiB]':>12}")
+    for name, convert in cases:
+        elapsed, peak = measure(pages, convert, args.repeat)
+        print(f"{name:<32}{elapsed:>10.3f}{elapsed / len(pages) * 1000:>15.2f}{peak:>12.1f}")
+
+    # 変換済みのページは、ハッシュ値の計算のみで結果を返す
+    for html, attrs in pages:
+        converter.extract_markdown(html, attrs)
+    start = time.perf_counter()
+    for html, attrs in pages:
+        converter.extract_markdown(html, attrs)
+    elapsed = time.perf_counter() - start
+    print(f"{'memoised (hit)':<32}{elapsed:>10.3f}{elapsed / len(pages) * 1000:>15.2f}{'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""オブジェクトストレージのS3クライアントの使い回しのベンチマーク
+
+呼び出しごとにboto3のクライアントを作成する従来の方法と、エンドポイントと認証情報ごとに
+作成したクライアントを使い回す方法（objectstorage.client.get_s3_client）について、
+クライアントの作成時間と、ListBucketsの1秒あたりの呼び出し回数・新規コネクション数を比較する。
+
+--endpointを指定しない場合は、ローカルに起動したS3互換の模擬サーバに対して計測する
+（ネットワークの遅延を含まないため、クライアントの作成・コネクションの確立のコストの差が表れる）。
+--endpointを指定した場合は、環境変数 OBJECTSTORAGE_ACCESS_KEY_ID・OBJECTSTORAGE_SECRET_ACCESS_KEY の
+認証情報で実際のエンドポイントに対して計測する。
+
+    uv run python benchmarks/bench_objectstorage_client.py [--endpoint URL] [--calls N] [--threads N]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import boto3  # noqa: E402
+from botocore.config import Config  # noqa: E402
+
+from core.auth import get_objectstorage_api_key  # noqa: E402
+from objectstorage.client import S3_REGION, clear_s3_clients, get_s3_client  # noqa: E402
+
+LIST_BUCKETS_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<ListAllMyBucketsResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">
+<Owner><ID>owner</ID><DisplayName>owner</DisplayName></Owner>
+<Buckets><Bucket><Name>bench</Name><CreationDate>2024-01-01T00:00:00.000Z</CreationDate></Bucket></Buckets>
+</ListAllMyBucketsResult>"""
+
+
+class FakeS3Server(ThreadingHTTPServer):
+    """ListBucketsに応答し、受け付けたコネクション数を数える模擬サーバ"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeS3RequestHandler)
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeS3RequestHandler(BaseHTTPRequestHandler):
+    # キープアライブでコネクションを維持する（ヘッダと本文を分けて送るため、Nagleアルゴリズムは無効にする）
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(LIST_BUCKETS_XML)))
+        self.end_headers()
+        self.wfile.write(LIST_BUCKETS_XML)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def legacy_client(endpoint: str, api_key: Tuple[str, str]):
+    """呼び出しごとにクライアントを作成する従来の方法"""
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id=api_key[0],
+        aws_secret_access_key=api_key[1],
+        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        region_name=S3_REGION,
+    )
+
+
+def measure(call: Callable[[], None], calls: int, threads: int) -> float:
+    """呼び出しを繰り返し、1秒あたりの呼び出し回数を返す"""
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(calls):
+            call()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: call(), range(calls)))
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--endpoint", help="S3互換APIのエンドポイント（省略時はローカルの模擬サーバ）"
+    )
+    parser.add_argument("--calls", type=int, default=200, help="ListBucketsの呼び出し回数")
+    parser.add_argument("--threads", type=int, default=8, help="並列に呼び出す場合のスレッド数")
+    args = parser.parse_args()
+
+    server = None
+    if args.endpoint:
+        endpoint, api_key = args.endpoint, get_objectstorage_api_key()
+        if not all(api_key):
+            sys.exit(
+                "OBJECTSTORAGE_ACCESS_KEY_ID・OBJECTSTORAGE_SECRET_ACCESS_KEY を設定してください。"
+            )
+    else:
+        server = FakeS3Server()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        endpoint, api_key = server.endpoint, ("bench", "bench")
+    print(f"endpoint={endpoint}, calls={args.calls}, threads={args.threads}")
+
+    creation = []
+    for _ in range(20):
+        start = time.perf_counter()
+        legacy_client(endpoint, api_key)
+        creation.append(time.perf_counter() - start)
+    print(f"client creation: {statistics.median(creation) * 1000:.1f} ms (median of 20)")
+
+    cases = [
+        ("new client per call", 1, lambda: legacy_client(endpoint, api_key).list_buckets()),
+        ("cached client", 1, lambda: get_s3_client(endpoint, api_key).list_buckets()),
+        (
+            "new client per call",
+            args.threads,
+            lambda: legacy_client(endpoint, api_key).list_buckets(),
+        ),
+        ("cached client", args.threads, lambda: get_s3_client(endpoint, api_key).list_buckets()),
+    ]
+    print(f"{'case':<24}{'threads':>8}{'calls/s':>10}{'connections':>13}")
+    for name, threads, call in cases:
+        clear_s3_clients()
+        # 最初の呼び出し（クライアントの作成・接続）を計測に含めないよう、1回呼び出しておく
+        call()
+        before = server.connections if server else 0
+        rate = measure(call, args.calls, threads)
+        connections = f"{server.connections - before}" if server else "-"
+        print(f"{name:<24}{threads:>8}{rate:>10.1f}{connections:>13}")
+
+    clear_s3_clients()
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
 import httpx
 from mcp.server.fastmcp import Context
 from core.auth import SacloudApiKey
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
 from core.zone import validate_zone
 from core.auth import SacloudApiKey, check_auth, get_http_client
+from core.handlers.base import BaseHandler, HttpMethod
+from core.monitor import MONITOR_STORE, summarize_monitor
 
 
-class VpnRouterHandler: 
+class VpnRouterHandler(BaseHandler):
 
     def __init__(
         self,
@@ -21,10 +23,8 @@ class VpnRouterHandler:
             mcp: MCPサーバーインスタンス
             zone_urls: ゾーンとAPIベースURLのマッピング辞書
         """
-        self.mcp = mcp
-        self.zone_urls = zone_urls
-        self.api_key = api_key
-        
+        super().__init__(mcp, zone_urls, api_key)
+
         self.mcp.tool(name = 'get_vpn_router_list')(self.get_vpn_router_list)
         self.mcp.tool(name = 'get_vpn_monitor')(self.get_vpn_monitor)
     
@@ -81,15 +81,22 @@ class VpnRouterHandler:
         ctx: Context,
         start: Optional[str] = None,
         end: Optional[str] = None,
+        summarize: bool = False,
+        bucket_minutes: Optional[int] = None,
+        interface_index: Optional[int] = None,
     ) -> any:
 
         """さくらのクラウドAPIからVPNルータ一のネットワーク流量のリソースモニタ情報を取得します
+            期間が長い場合は、summarizeまたはbucket_minutesを指定して要約を取得してください
 
         Args:
             zone (str): 取得対象のゾーン。
             vpn_id (str): vpnルータのリソースID
             start (str, optional): 開始時刻（ISO形式、デフォルトは終了時刻の24時間前）
             end (str, optional): 終了時刻（ISO形式、デフォルトは開始時刻の24時間後）
+            summarize (bool, optional): 全サンプルの代わりに統計値の要約を返すか（デフォルト: False）
+            bucket_minutes (int, optional): 要約に含めるバケットの間隔（分）
+            interface_index (int, optional): インターフェースの番号（省略時はVPNルータ全体）
 
 
         Returns:
@@ -105,27 +112,23 @@ class VpnRouterHandler:
         if zone_error:
             return zone_error
         
-        url = f"{self.zone_urls[zone]}appliance/{vpn_id}/interface/monitor"
-
-        params = {}
-        if start:
-            params["Start"] = start
-        if end:
-            params["End"] = end
-
-        
-        try:
-            with get_http_client(self.api_key) as client:
-                response = client.get(url, params=params)
-                return response.json()
-            
-        except httpx.RequestError as e:
-            await ctx.error(f"http Request Error:{e}")
-            return f"さくらのクラウドAPIへのリクエストに失敗しました: {e}"
-        except httpx.HTTPStatusError as e:
-            await ctx.error(f"HTTP Status Error:{e}")
-            return f"さくらのクラウドAPIからエラーが返されました: {e.response.status_code} - {e.response.text}"
-        except Exception as e:
-            await ctx.error(f"Unexpected error:{e}")
-            return f"データベース一覧の取得中に予期しないエラーが発生しました: {e}"
+        if bucket_minutes is not None and bucket_minutes < 1:
+            return "バケットの間隔は1分以上で指定する必要があります。"
+
+        if interface_index is not None:
+            url = f"{self.zone_urls[zone]}appliance/{vpn_id}/interface/{interface_index}/monitor"
+        else:
+            url = f"{self.zone_urls[zone]}appliance/{vpn_id}/interface/monitor"
+
+        async def fetch(fetch_start: str, fetch_end: str) -> Union[Dict[str, Any], str]:
+            params = {"Start": fetch_start, "End": fetch_end}
+            return await self.handle_api_request(ctx, HttpMethod.GET, url, params=params)
+
+        # キャッシュ済みの期間はローカルから返し、未取得の期間のみAPIから取得する
+        response = await MONITOR_STORE.get(
+            (zone, "appliance", vpn_id, interface_index), fetch, start, end
+        )
+        if isinstance(response, str) or not (summarize or bucket_minutes):
+            return response
+        return summarize_monitor(response, bucket_minutes)
         
\ No newline at end of file
@@ -0,0 +1,128 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 集計キーと、集計結果の列名の対応
+GROUP_KEYS = ("service_class", "zone", "resource", "month")
+GROUP_COLUMN_NAMES = {
+    "service_class": "ServiceClass",
+    "zone": "Zone",
+    "resource": "Resource",
+    "month": "Month",
+}
+
+
+def detail_resource_id(detail: Dict[str, Any]) -> str:
+    """請求明細の対象リソース（契約）のIDを返す"""
+    return str(detail.get("ContractID") or detail.get("ID") or "")
+
+
+class BillDetailTable:
+    """請求明細を列ごとの配列として保持するテーブル
+
+    明細行ごとの辞書を保持せず、集計キーごとの文字列の配列と金額の配列のみを持つため、
+    数万行の明細でも集計をまとめて計算できる。
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], amount: np.ndarray):
+        """テーブルの初期化
+
+        Args:
+            columns: 集計キーごとの値の配列（値がない場合は空文字列）
+            amount: 明細行ごとの金額の配列
+        """
+        self.columns = columns
+        self.amount = amount
+
+    @classmethod
+    def from_details(cls, details: Iterable[Tuple[str, Dict[str, Any]]]) -> "BillDetailTable":
+        """(年月, 請求明細) の組からテーブルを作成する"""
+        values: Dict[str, List[str]] = {key: [] for key in GROUP_KEYS}
+        amounts: List[float] = []
+        for month, detail in details:
+            values["service_class"].append(detail.get("ServiceClassPath") or "")
+            values["zone"].append(detail.get("Zone") or "")
+            values["resource"].append(detail_resource_id(detail))
+            values["month"].append(month)
+            amounts.append(detail.get("Amount") or 0)
+
+        columns = {key: np.array(column, dtype=str) for key, column in values.items()}
+        return cls(columns, np.array(amounts, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return self.amount.size
+
+    def group_codes(self, keys: List[str]) -> Tuple[List[np.ndarray], np.ndarray]:
+        """集計キーの組み合わせごとに番号を振る
+
+        Returns:
+            Tuple: 以下の2つ
+                - グループ番号ごとの各集計キーの値の配列のリスト
+                - 明細行ごとのグループ番号の配列
+        """
+        if not keys:
+            return [], np.zeros(len(self), dtype=np.int64)
+
+        uniques = []
+        codes = []
+        for key in keys:
+            unique, code = np.unique(self.columns[key], return_inverse=True)
+            uniques.append(unique)
+            codes.append(code)
+
+        # 各キーの番号の組み合わせを1つのグループ番号にまとめる
+        combined, inverse = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+        labels = [unique[combined[:, index]] for index, unique in enumerate(uniques)]
+        return labels, inverse.reshape(-1)
+
+    def group_totals(self, keys: List[str]) -> Tuple[List[np.ndarray], np.ndarray]:
+        """集計キーの組み合わせごとの合計金額を計算する
+
+        Returns:
+            Tuple: グループごとの各集計キーの値の配列のリストと、グループごとの合計金額の配列
+        """
+        labels, groups = self.group_codes(keys)
+        size = len(labels[0]) if labels else 1
+        return labels, np.bincount(groups, weights=self.amount, minlength=size)
+
+    def monthly_totals(
+        self, keys: List[str], months: List[str]
+    ) -> Tuple[List[np.ndarray], np.ndarray]:
+        """集計キーの組み合わせ × 年月ごとの合計金額の行列を計算する
+
+        Returns:
+            Tuple: グループごとの各集計キーの値の配列のリストと、
+                グループ × 年月の合計金額の行列（明細のない年月は0）
+        """
+        labels, groups = self.group_codes(keys)
+        size = len(labels[0]) if labels else 1
+        month_index = np.searchsorted(months, self.columns["month"])
+        flat = np.bincount(
+            groups * len(months) + month_index, weights=self.amount, minlength=size * len(months)
+        )
+        return labels, flat.reshape(size, len(months))
+
+
+def month_over_month(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """グループ × 年月の合計金額の行列から、前月からの増減額と増減率を計算する
+
+    Returns:
+        Tuple: 増減額と増減率の行列（最初の月と、前月が0の場合の増減率はNaN）
+    """
+    delta = np.full(matrix.shape, np.nan)
+    rate = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] > 1:
+        previous = matrix[:, :-1]
+        delta[:, 1:] = matrix[:, 1:] - previous
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate[:, 1:] = np.where(previous != 0, delta[:, 1:] / previous, np.nan)
+    return delta, rate
+
+
+def to_optional(value: Any) -> Optional[Any]:
+    """集計結果の値をJSONで返せる形式に変換する（空文字列・NaNはNone）"""
+    if isinstance(value, (np.floating, float)):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, np.str_):
+        value = str(value)
+    return value or None
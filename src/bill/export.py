@@ -0,0 +1,148 @@
+import csv
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrowはParquet形式で出力する場合のみ必要
+    pa = None
+    pq = None
+
+from bill.analytics import detail_resource_id
+from core.cache import get_cache_dir
+
+# 出力する列（Amount以外は文字列として出力する）
+EXPORT_COLUMNS = [
+    "Month",
+    "BillID",
+    "ContractID",
+    "ServiceClassID",
+    "ServiceClassPath",
+    "Description",
+    "Zone",
+    "Usage",
+    "FormattedUsage",
+    "ContractEndAt",
+    "Amount",
+]
+EXPORT_FORMATS = ("csv", "parquet")
+
+
+def get_export_dir() -> Path:
+    """出力先のディレクトリを返す（ツールから任意のパスに書き込めないよう、出力はこの配下に限る）"""
+    return get_cache_dir() / "exports"
+
+
+def export_path(file_name: str) -> Path:
+    """出力先のディレクトリ配下のファイルのパスを返す（ディレクトリを含む名前の場合はValueError）"""
+    if (
+        not file_name
+        or file_name in (".", "..")
+        or "/" in file_name
+        or "\\" in file_name
+        or "\0" in file_name
+        or Path(file_name).name != file_name
+    ):
+        raise ValueError(
+            "ファイル名はディレクトリを含まない名前（例: bill-details.csv）で指定する必要があります。"
+        )
+    return get_export_dir() / file_name
+
+
+def export_row(month: str, bill_id: str, detail: Dict[str, Any]) -> List[Any]:
+    """請求明細を出力する行に変換する"""
+    values = {
+        **detail,
+        "Month": month,
+        "BillID": bill_id,
+        "ContractID": detail_resource_id(detail),
+        "Amount": int(detail.get("Amount") or 0),
+    }
+    return [
+        values[column] if column == "Amount" else _to_text(values.get(column))
+        for column in EXPORT_COLUMNS
+    ]
+
+
+def _to_text(value: Any) -> str:
+    """値を文字列に変換する（値がない場合は空文字列）"""
+    return "" if value is None else str(value)
+
+
+class DetailWriter:
+    """請求明細を一時ファイルに逐次書き込み、完了時に出力先へ置き換えるライタ
+
+    ページごとに書き込むため、明細の行数によらずメモリ使用量は一定となる。
+    途中で失敗した場合は一時ファイルを削除し、出力先には不完全なファイルを残さない。
+    """
+
+    def __init__(self, path: Path, export_format: str):
+        """ライタの初期化
+
+        Args:
+            path: 出力先のファイルパス
+            export_format: 出力形式（"csv" または "parquet"）
+        """
+        self.path = path
+        self.export_format = export_format
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+
+        if export_format == "parquet":
+            os.close(fd)
+            schema = pa.schema(
+                [
+                    (column, pa.int64() if column == "Amount" else pa.string())
+                    for column in EXPORT_COLUMNS
+                ]
+            )
+            self._writer = pq.ParquetWriter(self.temp_path, schema)
+        else:
+            # 表計算ソフトで文字化けしないようBOM付きのUTF-8で出力する
+            self._file = os.fdopen(fd, "w", encoding="utf-8-sig", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, rows: List[List[Any]]) -> None:
+        """行を書き込む"""
+        if not rows:
+            return
+        if self.export_format == "parquet":
+            columns = {
+                column: [row[index] for row in rows] for index, column in enumerate(EXPORT_COLUMNS)
+            }
+            self._writer.write_table(pa.Table.from_pydict(columns, schema=self._writer.schema))
+        else:
+            self._writer.writerows(rows)
+
+    def commit(self, overwrite: bool = False) -> None:
+        """書き込みを完了し、出力先にファイルを置く
+
+        overwriteを指定しない場合、出力先にファイルがあればFileExistsErrorとし、一時ファイルを削除する。
+        存在の確認と作成を1回の操作（ハードリンクの作成）で行うため、確認後に作成されたファイルも上書きしない。
+        """
+        self._close()
+        if overwrite:
+            os.replace(self.temp_path, self.path)
+            return
+        try:
+            os.link(self.temp_path, self.path)
+        finally:
+            os.unlink(self.temp_path)
+
+    def abort(self) -> None:
+        """書き込みを中止し、一時ファイルを削除する"""
+        self._close()
+        try:
+            os.unlink(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+    def _close(self) -> None:
+        if self.export_format == "parquet":
+            self._writer.close()
+        else:
+            self._file.close()
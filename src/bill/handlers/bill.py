@@ -1,13 +1,51 @@
-from typing import Dict, Any, Union, Optional
+import json
+import re
+from datetime import datetime
+from typing import AsyncIterator, Dict, Any, List, Tuple, Union, Optional
+from urllib.parse import quote
+
+import numpy as np
 from mcp.server.fastmcp import Context
 
+from bill import export
+from bill.analytics import GROUP_COLUMN_NAMES, GROUP_KEYS, BillDetailTable, month_over_month, to_optional
 from core.auth import SacloudApiKey, check_auth
+from core.cache import DiskCache
+from core.consts import JST
+from core.concurrency import DEFAULT_CONCURRENCY, gather_with_concurrency
 from core.handlers.base import BaseHandler, HttpMethod
 
+# 締め済みの月の請求は変わらないため、アカウント・年月ごとに永続キャッシュする
+BILL_CACHE = DiskCache("bill")
+
+
+def month_range(from_month: str, to_month: str) -> List[Tuple[int, int]]:
+    """YYYY-MM形式の開始月から終了月までの (年, 月) のリストを返す"""
+    from_year, from_mon = map(int, from_month.split("-"))
+    to_year, to_mon = map(int, to_month.split("-"))
+
+    months = []
+    for index in range(from_year * 12 + from_mon - 1, to_year * 12 + to_mon):
+        year, month = divmod(index, 12)
+        months.append((year, month + 1))
+    return months
+
+
+def is_closed_month(year: int, month: int) -> bool:
+    """締め済み（当月より前）の月かどうかを返す"""
+    now = datetime.now(JST)
+    return (year, month) < (now.year, now.month)
+
 
 class BillHandler(BaseHandler):
     """請求書操作用のハンドラークラス"""
 
+    MONTH_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+    MAX_RANGE_MONTHS = 36
+    MAX_TOP_K = 1000
+    DEFAULT_PAGE_SIZE = 1000
+    MAX_PAGE_SIZE = 10000
+
     def __init__(self, mcp, zone_urls, api_key: SacloudApiKey):
         """請求書ハンドラーの初期化
         MCPサーバーのインスタンスを受け取り、請求書操作用のツールを登録。
@@ -22,6 +60,9 @@ class BillHandler(BaseHandler):
         # ツールを登録
         self.mcp.tool(name="get_bill_list")(self.get_bill_list)
         self.mcp.tool(name="get_bill_list_by_month")(self.get_bill_list_by_month)
+        self.mcp.tool(name="get_bill_list_by_range")(self.get_bill_list_by_range)
+        self.mcp.tool(name="analyze_bill_details")(self.analyze_bill_details)
+        self.mcp.tool(name="export_bill_details")(self.export_bill_details)
         self.mcp.tool(name="get_coupon_list")(self.get_coupon_list)
 
     ### MCPツールメソッド
@@ -50,10 +91,7 @@ class BillHandler(BaseHandler):
         if auth_error:
             return auth_error
 
-        # 請求書APIは特定のゾーンに依存しないため、最初のゾーンを使用
-        first_zone_url = next(iter(self.zone_urls.values()), None)
-        # システムAPIのエンドポイントに変更
-        base_url = first_zone_url.replace("/api/cloud/1.1/", "/api/system/1.0/")
+        base_url = self._system_api_url()
         url = f"{base_url}bill/by-contract/{account_id}"
 
         return await self.handle_api_request(ctx, HttpMethod.GET, url)
@@ -98,14 +136,320 @@ class BillHandler(BaseHandler):
         if auth_error:
             return auth_error
 
-        # 請求書APIは特定のゾーンに依存しないため、最初のゾーンを使用
-        first_zone_url = next(iter(self.zone_urls.values()), None)
-        # システムAPIのエンドポイントに変更
-        base_url = first_zone_url.replace("/api/cloud/1.1/", "/api/system/1.0/")
+        base_url = self._system_api_url()
         url = f"{base_url}bill/by-contract/{account_id}/{year}/{month}"
 
         return await self.handle_api_request(ctx, HttpMethod.GET, url)
 
+    async def get_bill_list_by_range(
+        self, ctx: Context, account_id: str, from_month: str, to_month: str
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIから指定プロジェクトIDの複数月の請求一覧を並列に取得します
+            請求書が発行済みの締め済みの月はローカルにキャッシュされ、APIから取得するのは当月とキャッシュのない月のみです
+
+        Args:
+            account_id (str): プロジェクトID（アカウントID）
+            from_month (str): 開始年月（YYYY-MM形式）
+            to_month (str): 終了年月（YYYY-MM形式）
+
+        Returns:
+            dict: 月ごとの請求一覧
+                - Months: 月ごとの請求情報のリスト
+                    - Month: 年月（YYYY-MM形式）
+                    - Count: 件数
+                    - Amount: 請求金額の合計
+                    - Bills: 請求書情報のリスト
+                    - Cached: キャッシュから取得したか
+                - TotalAmount: 全期間の請求金額の合計
+                - Errors: 取得に失敗した月とエラーメッセージ（失敗時のみ）
+        """
+        # パラメータの検証
+        if not account_id:
+            return "アカウントIDは必須です。"
+
+        for value in (from_month, to_month):
+            if not value or not self.MONTH_PATTERN.match(value):
+                return "年月はYYYY-MM形式（例: 2025-01）で指定してください。"
+
+        if from_month > to_month:
+            return "開始年月は終了年月以前を指定してください。"
+
+        months = month_range(from_month, to_month)
+        if len(months) > self.MAX_RANGE_MONTHS:
+            return f"期間は最大{self.MAX_RANGE_MONTHS}か月まで指定できます。"
+
+        # 認証情報チェック
+        auth_error = check_auth(self.api_key)
+        if auth_error:
+            return auth_error
+
+        async def fetch(year: int, month: int) -> Tuple[Union[Dict[str, Any], str], bool]:
+            key = f"{account_id}/{year:04d}-{month:02d}"
+            closed = is_closed_month(year, month)
+            if closed:
+                cached = BILL_CACHE.get(key)
+                if cached is not None:
+                    return cached, True
+
+            response = await self.get_bill_list_by_month(ctx, account_id, f"{year:04d}", f"{month:02d}")
+            # 月末の直後は請求書が未発行の場合があるため、請求書のない月はキャッシュしない
+            if closed and isinstance(response, dict) and response.get("is_ok", True) and response.get("Bills"):
+                BILL_CACHE.set(key, response)
+            return response, False
+
+        results = await gather_with_concurrency(
+            DEFAULT_CONCURRENCY,
+            [lambda year=year, month=month: fetch(year, month) for year, month in months],
+        )
+
+        summary: Dict[str, Any] = {"Months": [], "TotalAmount": 0}
+        errors = {}
+        for (year, month), (response, cached) in zip(months, results):
+            label = f"{year:04d}-{month:02d}"
+            # 一部の月で失敗しても、取得できた月の結果は返す
+            if isinstance(response, str):
+                errors[label] = response
+                continue
+            bills = response.get("Bills") or []
+            amount = sum(bill.get("Amount") or 0 for bill in bills)
+            summary["Months"].append(
+                {"Month": label, "Count": len(bills), "Amount": amount, "Bills": bills, "Cached": cached}
+            )
+            summary["TotalAmount"] += amount
+        if errors:
+            summary["Errors"] = errors
+        return summary
+
+    async def analyze_bill_details(
+        self,
+        ctx: Context,
+        account_id: str,
+        from_month: str,
+        to_month: str,
+        group_by: Optional[List[str]] = None,
+        bill_ids: Optional[List[str]] = None,
+        top_k: int = 20,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIから指定期間の請求明細を並列に取得し、集計キーごとの合計金額と前月比を計算します
+            明細をそのまま返さず集計結果のみを返すため、明細が数万行あるアカウントでも利用できます
+
+        Args:
+            account_id (str): プロジェクトID（アカウントID）
+            from_month (str): 開始年月（YYYY-MM形式）
+            to_month (str): 終了年月（YYYY-MM形式）
+            group_by (list[str], optional): 集計キーのリスト（"service_class", "zone", "resource", "month"、デフォルト: ["service_class"]）
+            bill_ids (list[str], optional): 対象の請求書IDのリスト（デフォルトは期間内の全請求書）
+            top_k (int, optional): 返すグループ数（金額の大きい順、1-1000、デフォルト: 20）
+
+        Returns:
+            dict: 請求明細の集計結果
+                - Months: 対象の年月のリスト
+                - Lines: 集計した明細の行数
+                - TotalAmount: 合計金額
+                - Totals: 集計キーごとの合計金額
+                    - Columns: 列名のリスト（ServiceClass, Zone, Resource, Month のうち集計キーの列, Amount, Share）
+                    - Rows: グループごとの値のリスト
+                - MonthOverMonth: 集計キーごと・月ごとの金額と前月からの増減（monthを除く集計キーで集計）
+                    - Columns: 列名のリスト（集計キー, Month, Amount, Delta, DeltaRate）
+                    - Rows: グループ・月ごとの値のリスト
+                - Errors: 取得に失敗した年月・請求書とエラーメッセージ（失敗時のみ）
+        """
+        # パラメータの検証
+        group_by = group_by or ["service_class"]
+        for key in group_by:
+            if key not in GROUP_KEYS:
+                return f"集計キーは{', '.join(GROUP_KEYS)} のいずれかを指定する必要があります。"
+        if len(set(group_by)) != len(group_by):
+            return "集計キーが重複しています。"
+
+        if not 1 <= top_k <= self.MAX_TOP_K:
+            return f"取得件数は1-{self.MAX_TOP_K}の範囲で指定する必要があります。"
+
+        # 1. 期間内の請求書を取得する（締め済みの月はキャッシュから返される）
+        bills = await self.get_bill_list_by_range(ctx, account_id, from_month, to_month)
+        if isinstance(bills, str):
+            return bills
+
+        targets = [
+            (month["Month"], str(bill.get("BillID")))
+            for month in bills["Months"]
+            for bill in month["Bills"]
+            if not bill_ids or str(bill.get("BillID")) in bill_ids
+        ]
+
+        # 2. 請求明細を並列に取得する
+        responses = await gather_with_concurrency(
+            DEFAULT_CONCURRENCY,
+            [
+                lambda month=month, bill_id=bill_id: self._get_bill_details(ctx, account_id, month, bill_id)
+                for month, bill_id in targets
+            ],
+        )
+
+        errors = [{"Month": month, "Message": message} for month, message in bills.get("Errors", {}).items()]
+        details = []
+        for (month, bill_id), response in zip(targets, responses):
+            # 一部の請求書で失敗しても、取得できた明細は集計する
+            if isinstance(response, str):
+                errors.append({"Month": month, "BillID": bill_id, "Message": response})
+                continue
+            details.extend((month, detail) for detail in response.get("BillDetails") or [])
+
+        # 3. 列指向のテーブルにして集計する
+        table = BillDetailTable.from_details(details)
+        months = [f"{year:04d}-{month:02d}" for year, month in month_range(from_month, to_month)]
+        total_amount = float(table.amount.sum())
+
+        labels, totals = table.group_totals(group_by)
+        order = np.argsort(-totals, kind="stable")[:top_k] if len(table) else []
+        total_rows = []
+        for index in order:
+            share = totals[index] / total_amount if total_amount else np.nan
+            total_rows.append(
+                [to_optional(label[index]) for label in labels] + [float(totals[index]), to_optional(share)]
+            )
+
+        trend_keys = [key for key in group_by if key != "month"]
+        labels, matrix = table.monthly_totals(trend_keys, months)
+        delta, rate = month_over_month(matrix)
+        trend_rows = []
+        if len(table):
+            for index in np.argsort(-matrix.sum(axis=1), kind="stable")[:top_k]:
+                group = [to_optional(label[index]) for label in labels]
+                for month_index, month in enumerate(months):
+                    trend_rows.append(
+                        group
+                        + [
+                            month,
+                            float(matrix[index, month_index]),
+                            to_optional(delta[index, month_index]),
+                            to_optional(rate[index, month_index]),
+                        ]
+                    )
+
+        result = {
+            "Months": months,
+            "Lines": len(table),
+            "TotalAmount": total_amount,
+            "Totals": {
+                "Columns": [GROUP_COLUMN_NAMES[key] for key in group_by] + ["Amount", "Share"],
+                "Rows": total_rows,
+            },
+            "MonthOverMonth": {
+                "Columns": [GROUP_COLUMN_NAMES[key] for key in trend_keys]
+                + ["Month", "Amount", "Delta", "DeltaRate"],
+                "Rows": trend_rows,
+            },
+        }
+        if errors:
+            result["Errors"] = errors
+        return result
+
+    async def export_bill_details(
+        self,
+        ctx: Context,
+        account_id: str,
+        from_month: str,
+        to_month: str,
+        export_format: str = "csv",
+        file_name: Optional[str] = None,
+        bill_ids: Optional[List[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        overwrite: bool = False,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIから指定期間の請求明細をページ単位で取得し、ローカルのCSVまたはParquetファイルに出力します
+            明細の内容は返さず、出力先のパスと件数・金額の集計のみを返します
+
+        Args:
+            account_id (str): プロジェクトID（アカウントID）
+            from_month (str): 開始年月（YYYY-MM形式）
+            to_month (str): 終了年月（YYYY-MM形式）
+            export_format (str, optional): 出力形式（"csv" または "parquet"、デフォルト: "csv"）
+                - csvはBOM付きのUTF-8で出力します
+                - parquetの出力にはpyarrowが必要です
+            file_name (str, optional): 出力先のファイル名（ディレクトリは含めない。キャッシュディレクトリ配下のexportsに出力します。
+                デフォルトは bill-details-<アカウントID>-<開始年月>-<終了年月>.<出力形式>）
+            bill_ids (list[str], optional): 対象の請求書IDのリスト（デフォルトは期間内の全請求書）
+            page_size (int, optional): 1回のリクエストで取得する明細の件数（1-10000、デフォルト: 1000）
+            overwrite (bool, optional): 同じ名前のファイルがある場合に上書きするか（デフォルト: False）
+
+        Returns:
+            dict: 出力結果
+                - Path: 出力したファイルのパス
+                - Format: 出力形式
+                - Bills: 出力した請求書の件数
+                - Rows: 出力した明細の行数
+                - TotalAmount: 明細の金額の合計
+                - Months: 年月ごとの明細の金額の合計
+        """
+        # パラメータの検証
+        if export_format not in export.EXPORT_FORMATS:
+            return f"出力形式は{' または '.join(export.EXPORT_FORMATS)} を指定する必要があります。"
+
+        if export_format == "parquet" and export.pa is None:
+            return "Parquet形式で出力するにはpyarrowをインストールしてください（例: uv sync --extra parquet）。"
+
+        if not 1 <= page_size <= self.MAX_PAGE_SIZE:
+            return f"取得件数は1-{self.MAX_PAGE_SIZE}の範囲で指定する必要があります。"
+
+        # 出力先はキャッシュディレクトリ配下のexportsに限る
+        try:
+            output = export.export_path(
+                file_name or f"bill-details-{account_id}-{from_month}-{to_month}.{export_format}"
+            )
+        except ValueError as e:
+            return str(e)
+        exists_message = f"出力先のファイル{output.name}は既に存在します。上書きする場合はoverwriteにTrueを指定してください。"
+        if output.exists() and not overwrite:
+            return exists_message
+
+        bills = await self.get_bill_list_by_range(ctx, account_id, from_month, to_month)
+        if isinstance(bills, str):
+            return bills
+        if bills.get("Errors"):
+            month, message = next(iter(bills["Errors"].items()))
+            return f"{month}の請求一覧の取得に失敗しました: {message}"
+
+        targets = [
+            (month["Month"], str(bill.get("BillID")))
+            for month in bills["Months"]
+            for bill in month["Bills"]
+            if not bill_ids or str(bill.get("BillID")) in bill_ids
+        ]
+
+        writer = export.DetailWriter(output, export_format)
+        rows = 0
+        months: Dict[str, int] = {}
+        try:
+            for month, bill_id in targets:
+                async for page in self._iter_bill_detail_pages(ctx, bill_id, page_size):
+                    if isinstance(page, str):
+                        writer.abort()
+                        return f"請求書{bill_id}の明細の取得に失敗しました: {page}"
+
+                    # 取得したページはすぐに書き出し、明細を保持しない
+                    lines = [export.export_row(month, bill_id, detail) for detail in page.get("BillDetails") or []]
+                    writer.write(lines)
+                    rows += len(lines)
+                    months[month] = months.get(month, 0) + sum(line[-1] for line in lines)
+                await ctx.info(f"請求書{bill_id}の明細を出力しました（累計{rows}行）")
+        except BaseException:
+            writer.abort()
+            raise
+        try:
+            writer.commit(overwrite)
+        except FileExistsError:
+            return exists_message
+
+        return {
+            "Path": str(output),
+            "Format": export_format,
+            "Bills": len(targets),
+            "Rows": rows,
+            "TotalAmount": sum(months.values()),
+            "Months": months,
+        }
+
     async def get_coupon_list(
         self, ctx: Context, account_id: str
     ) -> Union[Dict[str, Any], str]:
@@ -130,10 +474,66 @@ class BillHandler(BaseHandler):
         if auth_error:
             return auth_error
 
-        # クーポンAPIは特定のゾーンに依存しないため、最初のゾーンを使用
-        first_zone_url = next(iter(self.zone_urls.values()), None)
-        # システムAPIのエンドポイントに変更
-        base_url = first_zone_url.replace("/api/cloud/1.1/", "/api/system/1.0/")
+        base_url = self._system_api_url()
         url = f"{base_url}coupon/{account_id}"
 
         return await self.handle_api_request(ctx, HttpMethod.GET, url)
+
+    ### 内部メソッド
+
+    def _system_api_url(self) -> str:
+        """システムAPI（請求書・クーポンなど）のベースURLを返す"""
+        # 請求書APIは特定のゾーンに依存しないため、最初のゾーンを使用
+        first_zone_url = next(iter(self.zone_urls.values()), None)
+        # システムAPIのエンドポイントに変更
+        return first_zone_url.replace("/api/cloud/1.1/", "/api/system/1.0/")
+
+    async def _get_bill_details(
+        self, ctx: Context, account_id: str, month: str, bill_id: str
+    ) -> Union[Dict[str, Any], str]:
+        """請求書の明細をすべてのページについて取得する（締め済みの月の明細は永続キャッシュする）
+
+        明細の出力と同じページ単位の取得を使い、集計と出力の対象の明細を一致させる。
+        """
+        closed = is_closed_month(*map(int, month.split("-")))
+        key = f"{account_id}/detail/{bill_id}"
+        if closed:
+            cached = BILL_CACHE.get(key)
+            if cached is not None:
+                return cached
+
+        details: List[Dict[str, Any]] = []
+        async for page in self._iter_bill_detail_pages(ctx, bill_id, self.MAX_PAGE_SIZE):
+            if isinstance(page, str):
+                return page
+            details.extend(page.get("BillDetails") or [])
+
+        response = {"BillDetails": details, "Total": len(details), "is_ok": True}
+        if closed:
+            BILL_CACHE.set(key, response)
+        return response
+
+    async def _iter_bill_detail_pages(
+        self, ctx: Context, bill_id: str, page_size: int
+    ) -> AsyncIterator[Union[Dict[str, Any], str]]:
+        """請求書の明細をページ単位で順に取得する（失敗した場合はエラーメッセージを返して終了する）"""
+        offset = 0
+        while True:
+            page = await self._get_bill_detail_page(ctx, bill_id, offset, page_size)
+            yield page
+            if isinstance(page, str):
+                return
+
+            details = page.get("BillDetails") or []
+            offset += len(details)
+            if len(details) < page_size or offset >= page.get("Total", offset + 1):
+                return
+
+    async def _get_bill_detail_page(
+        self, ctx: Context, bill_id: str, offset: int, count: int
+    ) -> Union[Dict[str, Any], str]:
+        """請求書の明細を1ページ分取得する"""
+        # 検索条件はJSONをクエリ文字列として渡す
+        query = quote(json.dumps({"From": offset, "Count": count}, separators=(",", ":")))
+        url = f"{self._system_api_url()}bill/id/{bill_id}/detail?{query}"
+        return await self.handle_api_request(ctx, HttpMethod.GET, url, retries=2)
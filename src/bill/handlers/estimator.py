@@ -0,0 +1,285 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+import numpy as np
+from mcp.server.fastmcp import Context
+
+from compute.handlers.provisioning import ProvisioningHandler
+from compute.handlers.server import ServerHandler
+from core.auth import SacloudApiKey, check_auth
+from core.handlers.base import BaseHandler
+from core.zone import validate_zone
+from docs.price import PriceCatalog, get_price_catalog
+from storage.handlers.disk import DiskHandler
+
+# 料金の単位（price.jsonの項目名）
+PRICE_UNITS = ("Hourly", "Daily", "Monthly")
+
+
+def unit_prices(price: Optional[Dict[str, Any]]) -> List[float]:
+    """料金の時額・日額・月額を返す（料金がない項目はNaN）"""
+    if price is None:
+        return [np.nan] * len(PRICE_UNITS)
+    return [float(price[unit]) if price.get(unit) is not None else np.nan for unit in PRICE_UNITS]
+
+
+def total_costs(
+    server_prices: np.ndarray,
+    disk_prices: np.ndarray,
+    counts: np.ndarray,
+    disk_counts: np.ndarray,
+) -> np.ndarray:
+    """構成ごとの合計料金を計算する
+
+    Args:
+        server_prices: 構成ごとのサーバ1台の時額・日額・月額（構成数 × 3）
+        disk_prices: 構成ごとのディスク1台の時額・日額・月額（構成数 × 3）
+        counts: 構成ごとのサーバ台数
+        disk_counts: 構成ごとのサーバ1台あたりのディスク数
+
+    Returns:
+        np.ndarray: 構成ごとの合計の時額・日額・月額（構成数 × 3）
+    """
+    # ディスクのない構成ではディスクの料金を0とする
+    disk_total = np.where(disk_counts[:, None] > 0, disk_prices * disk_counts[:, None], 0.0)
+    return counts[:, None] * (server_prices + disk_total)
+
+
+class EstimatorHandler(BaseHandler):
+    """サーバ・ディスク構成の料金を見積もるハンドラークラス"""
+
+    MAX_CONFIGURATIONS = 1000
+
+    def __init__(self, mcp, zone_urls, api_key: SacloudApiKey):
+        """見積もりハンドラーの初期化
+        MCPサーバのインスタンスを受け取り、料金見積もり用のツールを登録
+
+        Args:
+            mcp: MCPサーバーインスタンス
+            zone_urls: ゾーンとAPIベースURLのマッピング辞書
+            api_key: さくらのクラウドAPIキー
+        """
+        super().__init__(mcp, zone_urls, api_key)
+
+        self.mcp.tool(name="estimate_server_costs")(self.estimate_server_costs)
+
+    ### MCPツールメソッド
+
+    async def estimate_server_costs(
+        self,
+        ctx: Context,
+        configurations: List[Dict[str, Any]],
+        zones: Optional[List[str]] = None,
+    ) -> Union[Dict[str, Any], str]:
+        """サーバ・ディスクの構成ごとの料金を見積もり、月額の安い順に返します
+            サーバプラン・ディスクプランのカタログと料金表から、構成をサービスクラスに対応付けて計算します
+            （共有セグメントのIPアドレスやライセンス、転送量などの料金は含みません）
+
+        Args:
+            configurations (list[dict]): 見積もる構成のリスト
+                - zone (str): ゾーン（zonesを指定した場合は省略可）
+                - cpu (int): CPU数
+                - mem (int): メモリ容量(MB)
+                - gen (int, optional): サーバの世代（デフォルト: 200）
+                - count (int, optional): サーバ台数（デフォルト: 1）
+                - disk_plan (str, optional): ディスクプラン（"ssd" または "hdd"、デフォルト: "ssd"）
+                - disk_size_mb (int, optional): ディスク容量（例: 102400(100GB)、省略時はディスクなし）
+                - disk_count (int, optional): サーバ1台あたりのディスク数（デフォルト: 1）
+                - label (str, optional): 構成の名前
+            zones (list[str], optional): 比較するゾーンのリスト（指定した場合は各構成をすべてのゾーンで見積もる）
+
+        Returns:
+            dict: 見積もり結果
+                - Columns: 列名のリスト（Rank, Label, Zone, Count, ServerPlan, DiskPlan, Hourly, Daily, Monthly）
+                - Rows: 構成ごとの合計料金のリスト（月額の安い順）
+                - Unavailable: 見積もれなかった構成と理由のリスト
+        """
+        # 認証情報チェック（カタログの取得に必要）
+        auth_error = check_auth(self.api_key)
+        if auth_error:
+            return auth_error
+
+        for zone in zones or []:
+            zone_error = validate_zone(zone)
+            if zone_error:
+                return zone_error
+
+        candidates = []
+        for index, configuration in enumerate(configurations or []):
+            for zone in zones or [configuration.get("zone")]:
+                candidate = self._parse_configuration(index, configuration, zone)
+                if isinstance(candidate, str):
+                    return candidate
+                candidates.append(candidate)
+
+        if not candidates:
+            return "構成を1つ以上指定する必要があります。"
+
+        if len(candidates) > self.MAX_CONFIGURATIONS:
+            return f"見積もる構成はゾーンとの組み合わせで最大{self.MAX_CONFIGURATIONS}件まで指定できます。"
+
+        # 1. ゾーンごとのカタログと料金表を並列に取得する
+        target_zones = sorted({candidate["zone"] for candidate in candidates})
+        try:
+            price_catalog, *catalogs = await asyncio.gather(
+                get_price_catalog(),
+                *(self.get_cached_catalog(ctx, zone, "product/server") for zone in target_zones),
+                *(self.get_cached_catalog(ctx, zone, "product/disk") for zone in target_zones),
+            )
+        except httpx.HTTPError as e:
+            await ctx.error(f"HTTP Error:{e}")
+            return f"さくらのクラウドの料金表の取得に失敗しました: {e}"
+
+        server_catalogs = dict(zip(target_zones, catalogs[: len(target_zones)]))
+        disk_catalogs = dict(zip(target_zones, catalogs[len(target_zones) :]))
+        for catalog in catalogs:
+            if isinstance(catalog, str):
+                return catalog
+
+        # 2. 構成ごとにサービスクラスを解決し、単価を配列にまとめる
+        server_prices = np.empty((len(candidates), len(PRICE_UNITS)))
+        disk_prices = np.empty((len(candidates), len(PRICE_UNITS)))
+        plans: List[Tuple[Optional[str], Optional[str]]] = []
+        for row, candidate in enumerate(candidates):
+            server_plan, server_price, disk_plan, disk_price = self._resolve_prices(
+                candidate,
+                server_catalogs[candidate["zone"]],
+                disk_catalogs[candidate["zone"]],
+                price_catalog,
+            )
+            server_prices[row] = unit_prices(server_price)
+            disk_prices[row] = unit_prices(disk_price)
+            plans.append((server_plan, disk_plan))
+
+        # 3. 全構成の合計料金をまとめて計算し、月額の安い順に並べる
+        counts = np.array([candidate["count"] for candidate in candidates], dtype=np.float64)
+        disk_counts = np.array(
+            [
+                candidate["disk_count"] if candidate["disk_size_mb"] else 0
+                for candidate in candidates
+            ],
+            dtype=np.float64,
+        )
+        totals = total_costs(server_prices, disk_prices, counts, disk_counts)
+        monthly = totals[:, PRICE_UNITS.index("Monthly")]
+
+        rows = []
+        unavailable = []
+        for row in np.argsort(monthly, kind="stable"):
+            candidate = candidates[row]
+            server_plan, disk_plan = plans[row]
+            message = self._unavailable_reason(candidate, server_plan, disk_plan, monthly[row])
+            if message:
+                unavailable.append(
+                    {"Label": candidate["label"], "Zone": candidate["zone"], "Message": message}
+                )
+                continue
+            rows.append(
+                [
+                    len(rows) + 1,
+                    candidate["label"],
+                    candidate["zone"],
+                    candidate["count"],
+                    server_plan,
+                    disk_plan,
+                ]
+                + [None if np.isnan(value) else float(value) for value in totals[row]]
+            )
+
+        return {
+            "Columns": ["Rank", "Label", "Zone", "Count", "ServerPlan", "DiskPlan", *PRICE_UNITS],
+            "Rows": rows,
+            "Unavailable": unavailable,
+        }
+
+    ### 内部メソッド
+
+    @staticmethod
+    def _parse_configuration(
+        index: int, configuration: Dict[str, Any], zone: Optional[str]
+    ) -> Union[Dict[str, Any], str]:
+        """構成を検証し、既定値を補った構成を返す"""
+        prefix = f"構成{index + 1}: "
+        zone_error = validate_zone(zone or "")
+        if zone_error:
+            return prefix + zone_error
+
+        try:
+            candidate = {
+                "label": configuration.get("label") or f"構成{index + 1}",
+                "zone": zone,
+                "cpu": int(configuration["cpu"]),
+                "mem": int(configuration["mem"]),
+                "gen": int(configuration.get("gen", 200)),
+                "count": int(configuration.get("count", 1)),
+                "disk_plan": configuration.get("disk_plan", "ssd"),
+                "disk_size_mb": int(configuration.get("disk_size_mb") or 0),
+                "disk_count": int(configuration.get("disk_count", 1)),
+            }
+        except KeyError as e:
+            return prefix + f"{e.args[0]} は必須です。"
+        except (TypeError, ValueError):
+            return prefix + "数値の項目には整数を指定する必要があります。"
+
+        if candidate["gen"] not in ServerHandler.VALID_GENERATION:
+            return (
+                prefix
+                + f"サーバの世代は{' または '.join(map(str, ServerHandler.VALID_GENERATION))} を指定する必要があります。"
+            )
+
+        if candidate["disk_plan"] not in ProvisioningHandler.DISK_PLANS:
+            return (
+                prefix
+                + f"ディスクプランは{' または '.join(ProvisioningHandler.DISK_PLANS)} を指定する必要があります。"
+            )
+
+        if candidate["count"] < 1 or candidate["disk_count"] < 1:
+            return prefix + "台数・ディスク数は1以上を指定する必要があります。"
+        return candidate
+
+    @staticmethod
+    def _resolve_prices(
+        candidate: Dict[str, Any],
+        server_catalog: Dict[str, Any],
+        disk_catalog: Dict[str, Any],
+        price_catalog: PriceCatalog,
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[str], Optional[Dict[str, Any]]]:
+        """構成のサーバプラン・ディスクプランのサービスクラスと料金を解決する"""
+        zone = candidate["zone"]
+        server_plan = ServerHandler.find_plan(
+            server_catalog, candidate["cpu"], candidate["mem"], candidate["gen"]
+        )
+        server_class = server_plan.get("ServiceClass") if server_plan else None
+        server_price = price_catalog.price_for(server_class, zone) if server_class else None
+
+        disk_class = None
+        disk_price = None
+        if candidate["disk_size_mb"]:
+            size = DiskHandler.find_plan_size(
+                disk_catalog,
+                ProvisioningHandler.DISK_PLANS[candidate["disk_plan"]],
+                candidate["disk_size_mb"],
+            )
+            disk_class = size.get("ServiceClass") if size else None
+            disk_price = price_catalog.price_for(disk_class, zone) if disk_class else None
+        return server_class, server_price, disk_class, disk_price
+
+    @staticmethod
+    def _unavailable_reason(
+        candidate: Dict[str, Any],
+        server_plan: Optional[str],
+        disk_plan: Optional[str],
+        monthly: float,
+    ) -> Optional[str]:
+        """見積もれなかった構成の理由を返す（見積もれた場合はNone）"""
+        if not server_plan:
+            return (
+                f"CPU {candidate['cpu']}コア・メモリ {candidate['mem']}MB・"
+                f"第{candidate['gen']}世代のサーバプランは利用できません。"
+            )
+        if candidate["disk_size_mb"] and not disk_plan:
+            return f"{candidate['disk_plan']}の{candidate['disk_size_mb']}MBのディスクは利用できません。"
+        if np.isnan(monthly):
+            return "料金表に月額料金がありません。"
+        return None
@@ -1,4 +1,5 @@
 from bill.handlers.bill import BillHandler
+from bill.handlers.estimator import EstimatorHandler
 from core.auth import get_api_key
 
 def initialize_bill(mcp, zone_urls):
@@ -16,4 +17,5 @@ def initialize_bill(mcp, zone_urls):
 
     return {
         "bill": BillHandler(mcp, zone_urls, api_key),
+        "estimator": EstimatorHandler(mcp, zone_urls, api_key),
     }
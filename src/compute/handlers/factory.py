@@ -1,5 +1,6 @@
 from core.auth import get_api_key
 from compute.handlers.interface import InterfaceHandler
+from compute.handlers.provisioning import ProvisioningHandler
 from compute.handlers.server import ServerHandler
 
 
@@ -19,4 +20,5 @@ def initialize_compute(mcp, zone_urls):
     return {
         "server": ServerHandler(mcp, zone_urls, api_key),
         "interface": InterfaceHandler(mcp, zone_urls, api_key),
+        "provisioning": ProvisioningHandler(mcp, zone_urls, api_key),
     }
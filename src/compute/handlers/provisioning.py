@@ -0,0 +1,270 @@
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Union
+from mcp.server.fastmcp import Context
+
+from compute.handlers.server import ServerHandler
+from core.auth import SacloudApiKey
+from core.handlers.base import BaseHandler, HttpMethod
+from storage.handlers.disk import DiskHandler
+
+
+class ProvisioningHandler(BaseHandler):
+    """サーバ・ディスク・NICの作成から起動までを一括で行うハンドラークラス"""
+
+    # ディスクプラン名とプランIDの対応
+    DISK_PLANS = {"ssd": 4, "hdd": 2}
+    DISK_POLL_INTERVAL_SECONDS = 10
+    DEFAULT_TIMEOUT_SECONDS = 1200
+    TOTAL_STEPS = 5
+
+    def __init__(self, mcp, zone_urls, api_key: SacloudApiKey):
+        """プロビジョニングハンドラーの初期化
+        MCPサーバのインスタンスを受け取り、プロビジョニング用のツールを登録
+
+        Args:
+            mcp: MCPサーバーインスタンス
+            zone_urls: ゾーンとAPIベースURLのマッピング辞書
+            api_key: さくらのクラウドAPIキー
+        """
+        super().__init__(mcp, zone_urls, api_key)
+
+        self.mcp.tool(name="provision_server")(self.provision_server)
+
+    ### MCPツールメソッド
+
+    async def provision_server(
+        self,
+        ctx: Context,
+        zone: str,
+        name: str,
+        cpu: int,
+        mem: int,
+        gen: int,
+        archive: str,
+        disk_size_mb: int,
+        disk_plan: str = "ssd",
+        description: str = "",
+        boot: bool = True,
+        timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIでサーバ・ディスク・NICを作成し、起動までを一括で行います
+            サーバプラン・ディスクプラン・アーカイブの解決は並列に行い、以降は
+            サーバ作成 → ディスク作成と接続 → ディスクの利用可能待ち → 起動 の順に実行します
+            途中で失敗した場合は、それまでに作成したリソースを返します（自動では削除しません）
+
+        Args:
+            zone (str): 作成対象ゾーン
+            name (str): サーバ名・ディスク名(1-61文字)
+            cpu (int): CPU数
+            mem (int): メモリ容量(MB)
+            gen (int): サーバの世代
+            archive (str): コピー元アーカイブのIDまたは名前の一部（例: "Ubuntu Server 24.04"）
+            disk_size_mb (int): ディスク容量(例:20480(20GB))
+            disk_plan (str, optional): ディスクプラン（"ssd" または "hdd"、デフォルト: "ssd"）
+            description (str, optional): サーバ・ディスクの説明（最大512文字）
+            boot (bool, optional): 作成後にサーバを起動するか（デフォルト: True）
+            timeout_seconds (int, optional): ディスクが利用可能になるまでの待機時間の上限（秒）
+
+        Returns:
+            dict: プロビジョニング結果
+                - Server: 作成したサーバ（ID, Name）
+                - Disk: 作成したディスク（ID, Name）
+                - Steps: 実行したステップと結果のリスト
+                - Error: エラーメッセージ（失敗時のみ）
+        """
+        # 前処理（ゾーン検証 + 認証チェック）
+        error = self.validate_request_context(zone)
+        if error:
+            return error
+
+        # パラメータの検証
+        if not name or len(name) > ServerHandler.MAX_NAME_LENGTH:
+            return f"サーバ名は1-{ServerHandler.MAX_NAME_LENGTH}文字で指定する必要があります。"
+
+        if description and len(description) > ServerHandler.MAX_DESCRIPTION_LENGTH:
+            return f"説明は最大{ServerHandler.MAX_DESCRIPTION_LENGTH}文字まで指定できます。"
+
+        if gen not in ServerHandler.VALID_GENERATION:
+            return f"サーバの世代は{' または '.join(map(str, ServerHandler.VALID_GENERATION))} を指定する必要があります。"
+
+        if disk_plan not in self.DISK_PLANS:
+            return f"ディスクプランは{' または '.join(self.DISK_PLANS)} を指定する必要があります。"
+
+        if not archive:
+            return "アーカイブは必須です。"
+
+        result: Dict[str, Any] = {"Steps": []}
+
+        # 1. カタログから各種プランとアーカイブを並列に解決する
+        await self._report(ctx, 0, "プランとアーカイブを解決しています")
+        plan_error, archive_result, disk_error = await asyncio.gather(
+            self._resolve_server_plan(ctx, zone, cpu, mem, gen),
+            self._resolve_archive(ctx, zone, archive),
+            self._validate_disk_plan(ctx, zone, self.DISK_PLANS[disk_plan], disk_size_mb),
+        )
+        resolve_error = (
+            plan_error
+            or (archive_result if isinstance(archive_result, str) else None)
+            or disk_error
+        )
+        if resolve_error:
+            return self._fail(result, "resolve", resolve_error)
+
+        if archive_result.get("SizeMB", 0) > disk_size_mb:
+            return self._fail(
+                result,
+                "resolve",
+                f"ディスク容量はアーカイブの容量({archive_result['SizeMB']}MB)以上を指定する必要があります。",
+            )
+        self._record(result, "resolve", f"アーカイブ: {archive_result['Name']}")
+
+        # 2. サーバ（共有セグメントに接続するNICを含む）を作成する
+        await self._report(ctx, 1, "サーバを作成しています")
+        response = await self.handle_api_request(
+            ctx,
+            HttpMethod.POST,
+            f"{self.zone_urls[zone]}server",
+            ServerHandler.build_create_request(name, description, cpu, mem, gen),
+        )
+        if isinstance(response, str):
+            return self._fail(result, "create_server", response)
+        server_id = response["Server"]["ID"]
+        result["Server"] = {"ID": server_id, "Name": name}
+        self._record(result, "create_server", server_id)
+
+        # 3. アーカイブからディスクを作成し、サーバに接続する
+        await self._report(ctx, 2, "ディスクを作成しています")
+        response = await self.handle_api_request(
+            ctx,
+            HttpMethod.POST,
+            f"{self.zone_urls[zone]}disk",
+            DiskHandler.build_create_request(
+                name,
+                description,
+                self.DISK_PLANS[disk_plan],
+                disk_size_mb,
+                archive_result["ID"],
+                server_id,
+            ),
+        )
+        if isinstance(response, str):
+            return self._fail(result, "create_disk", response)
+        disk_id = response["Disk"]["ID"]
+        result["Disk"] = {"ID": disk_id, "Name": name}
+        self._record(result, "create_disk", disk_id)
+
+        # 4. ディスクのコピー完了を待つ
+        await self._report(ctx, 3, "ディスクが利用可能になるまで待機しています")
+        wait_error = await self._wait_disk_available(ctx, zone, disk_id, timeout_seconds)
+        if wait_error:
+            return self._fail(result, "wait_disk", wait_error)
+        self._record(result, "wait_disk", "available")
+
+        # 5. サーバを起動する
+        if boot:
+            await self._report(ctx, 4, "サーバを起動しています")
+            response = await self.handle_api_request(
+                ctx, HttpMethod.PUT, f"{self.zone_urls[zone]}server/{server_id}/power"
+            )
+            if isinstance(response, str):
+                return self._fail(result, "boot", response)
+            self._record(result, "boot", "ok")
+
+        await self._report(ctx, self.TOTAL_STEPS, "完了しました")
+        return result
+
+    ### 内部メソッド
+
+    async def _resolve_server_plan(
+        self, ctx: Context, zone: str, cpu: int, mem: int, gen: int
+    ) -> Optional[str]:
+        """指定したCPU・メモリ・世代のサーバプランが利用可能か確認する"""
+        catalog = await self.get_cached_catalog(ctx, zone, "product/server")
+        if isinstance(catalog, str):
+            return catalog
+
+        if ServerHandler.find_plan(catalog, cpu, mem, gen):
+            return None
+        return f"CPU {cpu}コア・メモリ {mem}MB・第{gen}世代のサーバプランは利用できません。"
+
+    async def _resolve_archive(
+        self, ctx: Context, zone: str, archive: str
+    ) -> Union[Dict[str, Any], str]:
+        """アーカイブのIDまたは名前から、利用可能なアーカイブを1つに特定する"""
+        catalog = await self.get_cached_catalog(ctx, zone, "archive")
+        if isinstance(catalog, str):
+            return catalog
+
+        archives = [
+            item
+            for item in catalog.get("Archives", [])
+            if item.get("Availability", "available") == "available"
+        ]
+        for item in archives:
+            if str(item.get("ID")) == archive or item.get("Name") == archive:
+                return item
+
+        keyword = archive.lower()
+        candidates: List[Dict[str, Any]] = [
+            item for item in archives if keyword in (item.get("Name") or "").lower()
+        ]
+        if len(candidates) == 1:
+            return candidates[0]
+        if not candidates:
+            return f"アーカイブ「{archive}」が見つかりません。"
+        names = ", ".join(item["Name"] for item in candidates[:5])
+        return f"アーカイブ「{archive}」に一致する候補が複数あります。IDまたは正確な名前を指定してください: {names}"
+
+    async def _validate_disk_plan(
+        self, ctx: Context, zone: str, plan_id: int, size_mb: int
+    ) -> Optional[str]:
+        """ディスクプランで指定した容量が利用可能か確認する"""
+        catalog = await self.get_cached_catalog(ctx, zone, "product/disk")
+        if isinstance(catalog, str):
+            return catalog
+
+        if DiskHandler.find_plan_size(catalog, plan_id, size_mb) is not None:
+            return None
+        sizes = DiskHandler.available_plan_sizes(catalog, plan_id)
+        if sizes is None:
+            return "指定したディスクプランはこのゾーンで利用できません。"
+        return f"ディスク容量は{', '.join(map(str, sizes))}(MB)のいずれかを指定する必要があります。"
+
+    async def _wait_disk_available(
+        self, ctx: Context, zone: str, disk_id: str, timeout_seconds: int
+    ) -> Optional[str]:
+        """ディスクが利用可能な状態になるまでポーリングする"""
+        url = f"{self.zone_urls[zone]}disk/{disk_id}"
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            response = await self.handle_api_request(ctx, HttpMethod.GET, url)
+            if isinstance(response, str):
+                return response
+
+            availability = response.get("Disk", {}).get("Availability")
+            if availability == "available":
+                return None
+            if availability == "failed":
+                return "ディスクの作成に失敗しました。"
+            if time.monotonic() >= deadline:
+                return f"ディスクが{timeout_seconds}秒以内に利用可能になりませんでした（状態: {availability}）。"
+
+            await asyncio.sleep(self.DISK_POLL_INTERVAL_SECONDS)
+
+    async def _report(self, ctx: Context, step: int, message: str) -> None:
+        """進捗を通知する"""
+        await ctx.info(message)
+        await ctx.report_progress(step, self.TOTAL_STEPS, message)
+
+    @staticmethod
+    def _record(result: Dict[str, Any], step: str, detail: Any) -> None:
+        """成功したステップを記録する"""
+        result["Steps"].append({"Step": step, "Result": "ok", "Detail": detail})
+
+    @staticmethod
+    def _fail(result: Dict[str, Any], step: str, message: str) -> Dict[str, Any]:
+        """失敗したステップを記録し、それまでの結果とともに返す"""
+        result["Steps"].append({"Step": step, "Result": "error"})
+        result["Error"] = message
+        return result
@@ -1,8 +1,18 @@
-from typing import Dict, Any, Union
+import json
+from collections import Counter
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Union
+from urllib.parse import quote
+
 from mcp.server.fastmcp import Context
 
-from core.auth import SacloudApiKey
+from core.auth import SacloudApiKey, check_auth
+from core.concurrency import (
+    DEFAULT_CONCURRENCY,
+    gather_with_concurrency,
+    validate_concurrency,
+)
 from core.handlers.base import BaseHandler, HttpMethod
+from core.zone import validate_zone
 
 
 class ServerHandler(BaseHandler):
@@ -25,8 +35,11 @@ class ServerHandler(BaseHandler):
         self.mcp.tool(name="get_server_plan")(self.get_server_plan)
         self.mcp.tool(name="create_server")(self.create_server)
         self.mcp.tool(name="get_server_power_status")(self.get_server_power_status)
+        self.mcp.tool(name="get_server_status_summary")(self.get_server_status_summary)
         self.mcp.tool(name="stop_server")(self.stop_server)
         self.mcp.tool(name="start_server")(self.start_server)
+        self.mcp.tool(name="bulk_stop_servers")(self.bulk_stop_servers)
+        self.mcp.tool(name="bulk_start_servers")(self.bulk_start_servers)
 
     async def create_server(
         self,
@@ -72,8 +85,32 @@ class ServerHandler(BaseHandler):
             return f"サーバの世代は{' または '.join(map(str, self.VALID_GENERATION))} を指定する必要があります。"
 
         url = f"{self.zone_urls[zone]}server"
+        params = self.build_create_request(name, description, cpu, mem, gen)
+
+        return await self.handle_api_request(ctx, HttpMethod.POST, url, params)
 
-        params = {
+    @staticmethod
+    def find_plan(
+        catalog: Dict[str, Any], cpu: int, mem: int, gen: int
+    ) -> Optional[Dict[str, Any]]:
+        """サーバプランのカタログ（product/server）から、指定したCPU・メモリ・世代の利用可能なプランを探す"""
+        for plan in catalog.get("ServerPlans", []):
+            if (
+                plan.get("CPU") == cpu
+                and plan.get("MemoryMB") == mem
+                and plan.get("Generation") == gen
+                and plan.get("Commitment", "standard") == "standard"
+                and plan.get("Availability") == "available"
+            ):
+                return plan
+        return None
+
+    @staticmethod
+    def build_create_request(
+        name: str, description: str, cpu: int, mem: int, gen: int
+    ) -> Dict[str, Any]:
+        """サーバ作成APIのリクエストボディを構築する（共有セグメントに接続するNICを1つ持つ）"""
+        return {
             "Server": {
                 "Name": name,
                 "Description": description,
@@ -92,8 +129,6 @@ class ServerHandler(BaseHandler):
             "Count": 0,
         }
 
-        return await self.handle_api_request(ctx, HttpMethod.POST, url, params)
-
     async def get_server_plan(self, zone: str, ctx: Context) -> any:
         """さくらのクラウドAPIからサーバプラン一覧を取得します"""
         # 前処理（ゾーン検証 + 認証チェック）
@@ -154,6 +189,72 @@ class ServerHandler(BaseHandler):
         url = f"{self.zone_urls[zone]}server/{server_id}/power"
         return await self.handle_api_request(ctx, HttpMethod.GET, url)
 
+    async def get_server_status_summary(
+        self,
+        ctx: Context,
+        zones: Optional[List[str]] = None,
+        include_histogram: bool = False,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIから複数ゾーンのサーバーの電源状態を一括で取得します
+        ゾーンごとにサーバー一覧を1回だけ取得するため、多数のサーバーの状態確認に適しています
+
+        Args:
+            zones (list[str], optional): 対象ゾーンのリスト（デフォルトは全ゾーン）
+            include_histogram (bool, optional): 電源状態ごとの台数を含めるか（デフォルト: False）
+
+        Returns:
+            dict: サーバーの電源状態の一覧
+                - Columns: 列名のリスト（Zone, ID, Name, Status, StatusChangedAt）
+                - Rows: サーバーごとの値のリスト
+                - Histogram: 電源状態ごとの台数（include_histogram指定時のみ）
+                - Errors: 取得に失敗したゾーンとエラーメッセージ（失敗時のみ）
+        """
+        # 認証情報チェック
+        auth_error = check_auth(self.api_key)
+        if auth_error:
+            return auth_error
+
+        zones = zones or list(self.zone_urls.keys())
+        for zone in zones:
+            zone_error = validate_zone(zone)
+            if zone_error:
+                return zone_error
+
+        include = ["ID", "Name", "Instance.Status", "Instance.StatusChangedAt"]
+        responses = await gather_with_concurrency(
+            len(zones),
+            [lambda zone=zone: self._list_servers(ctx, zone, include) for zone in zones],
+        )
+
+        rows = []
+        errors = {}
+        for zone, response in zip(zones, responses):
+            # 一部のゾーンで失敗しても、取得できたゾーンの結果は返す
+            if isinstance(response, str):
+                errors[zone] = response
+                continue
+            for server in response.get("Servers", []):
+                instance = server.get("Instance") or {}
+                rows.append(
+                    [
+                        zone,
+                        server.get("ID"),
+                        server.get("Name"),
+                        instance.get("Status"),
+                        instance.get("StatusChangedAt"),
+                    ]
+                )
+
+        summary = {
+            "Columns": ["Zone", "ID", "Name", "Status", "StatusChangedAt"],
+            "Rows": rows,
+        }
+        if include_histogram:
+            summary["Histogram"] = dict(Counter(row[3] or "unknown" for row in rows))
+        if errors:
+            summary["Errors"] = errors
+        return summary
+
     async def stop_server(
         self, ctx: Context, zone: str, server_id: str, force: bool = False
     ) -> Union[Dict[str, Any], str]:
@@ -226,3 +327,182 @@ class ServerHandler(BaseHandler):
 
         url = f"{self.zone_urls[zone]}server/{server_id}/power"
         return await self.handle_api_request(ctx, HttpMethod.PUT, url)
+
+    async def bulk_stop_servers(
+        self,
+        ctx: Context,
+        servers: Optional[List[Dict[str, str]]] = None,
+        tag: Optional[str] = None,
+        zones: Optional[List[str]] = None,
+        force: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIで複数のサーバーを並列に停止します
+        対象はサーバーのリスト、またはタグで指定します（両方指定した場合は和集合）
+
+        Args:
+            servers (list[dict], optional): 対象サーバーのリスト
+                - zone (str): 対象ゾーン
+                - server_id (str): サーバーID
+            tag (str, optional): 対象サーバーのタグ
+            zones (list[str], optional): タグで検索するゾーン（デフォルトは全ゾーン）
+            force (bool, optional): 強制停止フラグ（デフォルト: False）
+            concurrency (int, optional): 同時実行数（デフォルト: 10）
+
+        Returns:
+            dict: サーバーごとの処理結果
+                - Results: 処理結果のリスト
+                    - Zone: ゾーン
+                    - ServerID: サーバーID
+                    - Name: サーバー名（タグ指定時のみ）
+                    - Result: "ok" または "error"
+                    - Message: エラーメッセージ（エラー時のみ）
+                - Summary: 処理結果の集計
+                    - Total: 対象サーバー数
+                    - Succeeded: 成功数
+                    - Failed: 失敗数
+        """
+
+        async def stop(zone: str, server_id: str) -> Union[Dict[str, Any], str]:
+            return await self.stop_server(ctx, zone, server_id, force)
+
+        return await self._run_bulk_power(ctx, stop, servers, tag, zones, concurrency)
+
+    async def bulk_start_servers(
+        self,
+        ctx: Context,
+        servers: Optional[List[Dict[str, str]]] = None,
+        tag: Optional[str] = None,
+        zones: Optional[List[str]] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIで複数のサーバーを並列に起動します
+        対象はサーバーのリスト、またはタグで指定します（両方指定した場合は和集合）
+
+        Args:
+            servers (list[dict], optional): 対象サーバーのリスト
+                - zone (str): 対象ゾーン
+                - server_id (str): サーバーID
+            tag (str, optional): 対象サーバーのタグ
+            zones (list[str], optional): タグで検索するゾーン（デフォルトは全ゾーン）
+            concurrency (int, optional): 同時実行数（デフォルト: 10）
+
+        Returns:
+            dict: サーバーごとの処理結果
+                - Results: 処理結果のリスト
+                    - Zone: ゾーン
+                    - ServerID: サーバーID
+                    - Name: サーバー名（タグ指定時のみ）
+                    - Result: "ok" または "error"
+                    - Message: エラーメッセージ（エラー時のみ）
+                - Summary: 処理結果の集計
+                    - Total: 対象サーバー数
+                    - Succeeded: 成功数
+                    - Failed: 失敗数
+        """
+
+        async def start(zone: str, server_id: str) -> Union[Dict[str, Any], str]:
+            return await self.start_server(ctx, zone, server_id)
+
+        return await self._run_bulk_power(ctx, start, servers, tag, zones, concurrency)
+
+    ### 内部メソッド
+
+    async def _run_bulk_power(
+        self,
+        ctx: Context,
+        operation: Callable[[str, str], Awaitable[Union[Dict[str, Any], str]]],
+        servers: Optional[List[Dict[str, str]]],
+        tag: Optional[str],
+        zones: Optional[List[str]],
+        concurrency: int,
+    ) -> Union[Dict[str, Any], str]:
+        """対象サーバーを解決し、電源操作を同時実行数を制限して並列実行する"""
+        # 認証情報チェック
+        auth_error = check_auth(self.api_key)
+        if auth_error:
+            return auth_error
+
+        concurrency_error = validate_concurrency(concurrency)
+        if concurrency_error:
+            return concurrency_error
+
+        if not servers and not tag:
+            return "対象サーバーのリスト(servers)またはタグ(tag)のいずれかを指定してください。"
+
+        targets = {}
+        for server in servers or []:
+            zone = server.get("zone", "")
+            server_id = server.get("server_id", "")
+            if not server_id:
+                return "serversの各要素にはzoneとserver_idを指定する必要があります。"
+            targets[(zone, server_id)] = {"Zone": zone, "ServerID": server_id}
+
+        if tag:
+            tagged = await self._find_servers_by_tag(ctx, tag, zones)
+            if isinstance(tagged, str):
+                return tagged
+            for row in tagged:
+                targets[(row["Zone"], row["ServerID"])] = row
+
+        rows = list(targets.values())
+
+        async def run(row: Dict[str, Any]) -> Dict[str, Any]:
+            # 不正なゾーンは他のサーバーの処理を止めずに、そのサーバーのみエラーとする
+            zone_error = validate_zone(row["Zone"])
+            response = zone_error or await operation(row["Zone"], row["ServerID"])
+            if isinstance(response, str):
+                return {**row, "Result": "error", "Message": response}
+            return {**row, "Result": "ok"}
+
+        results = await gather_with_concurrency(
+            concurrency, [lambda row=row: run(row) for row in rows]
+        )
+
+        succeeded = sum(1 for result in results if result["Result"] == "ok")
+        return {
+            "Results": results,
+            "Summary": {
+                "Total": len(results),
+                "Succeeded": succeeded,
+                "Failed": len(results) - succeeded,
+            },
+        }
+
+    async def _find_servers_by_tag(
+        self, ctx: Context, tag: str, zones: Optional[List[str]]
+    ) -> Union[List[Dict[str, Any]], str]:
+        """指定ゾーンのサーバー一覧を並列に取得し、タグが一致するサーバーを返す"""
+        zones = zones or list(self.zone_urls.keys())
+        for zone in zones:
+            zone_error = validate_zone(zone)
+            if zone_error:
+                return zone_error
+
+        responses = await gather_with_concurrency(
+            len(zones),
+            [
+                lambda zone=zone: self._list_servers(ctx, zone, ["ID", "Name", "Tags"])
+                for zone in zones
+            ],
+        )
+
+        rows = []
+        for zone, response in zip(zones, responses):
+            if isinstance(response, str):
+                return response
+            for server in response.get("Servers", []):
+                if tag in (server.get("Tags") or []):
+                    rows.append(
+                        {"Zone": zone, "ServerID": server["ID"], "Name": server.get("Name")}
+                    )
+        return rows
+
+    async def _list_servers(
+        self, ctx: Context, zone: str, include: List[str]
+    ) -> Union[Dict[str, Any], str]:
+        """サーバー一覧を必要な項目のみに絞り込んで取得する"""
+        # 検索条件はJSONをクエリ文字列として渡す
+        query = quote(json.dumps({"Include": include}, separators=(",", ":")))
+        url = f"{self.zone_urls[zone]}server?{query}"
+        return await self.handle_api_request(ctx, HttpMethod.GET, url)
@@ -53,3 +53,8 @@ def check_objectstorage_auth(objectstorage_api_key:ObjectStorageApiKey):
 def get_http_client(api_key: SacloudApiKey) -> httpx.Client:
     """認証情報が設定されたHTTPクライアントを返す"""
     return httpx.Client(auth=(api_key))
+
+
+def get_async_http_client(api_key: SacloudApiKey) -> httpx.AsyncClient:
+    """認証情報が設定された非同期HTTPクライアントを返す"""
+    return httpx.AsyncClient(auth=(api_key))
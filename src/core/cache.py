@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class TTLCache:
+    """有効期限付きのインメモリキャッシュ"""
+
+    def __init__(self, ttl_seconds: float):
+        """キャッシュの初期化
+
+        Args:
+            ttl_seconds: キャッシュの有効期間（秒）
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """キャッシュから値を取得し、存在しないか期限切れであれば取得して保存する
+
+        取得結果が文字列（エラーメッセージ）の場合はキャッシュしない。
+
+        Args:
+            key: キャッシュキー
+            fetch: 値を取得するコルーチンを生成する関数
+
+        Returns:
+            Any: キャッシュされた値または取得結果
+        """
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        value = await fetch()
+        if not isinstance(value, str):
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    def clear(self) -> None:
+        """キャッシュをすべて削除する"""
+        self._entries.clear()
+
+
+def get_cache_dir() -> Path:
+    """永続キャッシュの保存先ディレクトリを返す
+
+    環境変数 SACLOUD_MCP_CACHE_DIR が設定されていればそのディレクトリ、
+    なければ XDG_CACHE_HOME（未設定時は ~/.cache）配下の sacloud-mcp を使用する。
+    """
+    cache_dir = os.getenv("SACLOUD_MCP_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir).expanduser()
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(cache_home).expanduser() / "sacloud-mcp"
+
+
+class DiskCache:
+    """JSONで保存する永続キャッシュ
+
+    請求情報などを含むため、ディレクトリ・ファイルは所有者のみが読み書きできる権限で作成する。
+    """
+
+    def __init__(self, namespace: str, cache_dir: Optional[Path] = None):
+        """キャッシュの初期化
+
+        Args:
+            namespace: キャッシュの種類（保存先のサブディレクトリ名）
+            cache_dir: 保存先ディレクトリ（デフォルトは get_cache_dir() の値）
+        """
+        self.namespace = namespace
+        self._cache_dir = cache_dir
+
+    @property
+    def directory(self) -> Path:
+        """保存先ディレクトリ（環境変数の変更を反映するため、参照のたびに解決する）"""
+        return (self._cache_dir or get_cache_dir()) / self.namespace
+
+    def path(self, key: str) -> Path:
+        """キーに対応するファイルのパスを返す"""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """キャッシュから値を取得する（存在しないか読み込めない場合はNone）"""
+        try:
+            with open(self.path(key), encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        # ハッシュの衝突に備えてキーを確認する
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        """値をキャッシュに保存する（書き込み途中のファイルを読まないよう、一時ファイルから置き換える）"""
+        directory = self.directory
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"key": key, "value": value}, file, ensure_ascii=False)
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        """キャッシュから値を削除する"""
+        try:
+            os.unlink(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """キャッシュしたすべてのキーと値を返す（読み込めないファイルは無視する）"""
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    entry = json.load(file)
+            except (OSError, ValueError):
+                continue
+            if isinstance(entry, dict) and "key" in entry:
+                yield entry["key"], entry.get("value")
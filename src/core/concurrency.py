@@ -0,0 +1,72 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 一括操作時の同時実行数のデフォルト値と上限
+DEFAULT_CONCURRENCY = 10
+MAX_CONCURRENCY = 50
+
+
+class RateLimiter:
+    """APIリクエストの送信間隔を一定以上に保つレートリミッタ
+
+    イベントループ内で状態の読み書きの間にawaitを挟まないため、ロックを使わずに
+    複数のコルーチンから共有できる。
+    """
+
+    def __init__(self, rate_per_second: float):
+        """レートリミッタの初期化
+
+        Args:
+            rate_per_second: 1秒あたりの最大リクエスト数（0以下の場合は制限なし）
+        """
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """次のリクエストを送信できるまで待機する"""
+        if not self.interval:
+            return
+
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# さくらのクラウドAPIへのリクエストで共有するレートリミッタ
+API_RATE_LIMITER = RateLimiter(float(os.getenv("SACLOUD_API_RATE_LIMIT", "10")))
+
+
+def validate_concurrency(concurrency: int) -> Optional[str]:
+    """同時実行数を検証し、不正であればエラーメッセージを返す"""
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        return f"同時実行数は1-{MAX_CONCURRENCY}の範囲で指定する必要があります。"
+    return None
+
+
+async def gather_with_concurrency(
+    limit: int, factories: Iterable[Callable[[], Awaitable[T]]]
+) -> List[T]:
+    """同時実行数を制限しながらコルーチンを並列実行する
+
+    Args:
+        limit: 同時実行数の上限
+        factories: 実行するコルーチンを生成する関数のリスト
+
+    Returns:
+        List[T]: 各コルーチンの実行結果（factoriesと同じ順序）
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(run(factory) for factory in factories))
@@ -1,4 +1,4 @@
-
+from datetime import timedelta, timezone
 
 # ゾーンとAPIベースURLのマッピング
 ZONE_URLS = {
@@ -7,4 +7,7 @@ ZONE_URLS = {
     'is1a': 'https://secure.sakura.ad.jp/cloud/zone/is1a/api/cloud/1.1/',
     'is1b': 'https://secure.sakura.ad.jp/cloud/zone/is1b/api/cloud/1.1/',
     'tk1v': 'https://secure.sakura.ad.jp/cloud/zone/tk1v/api/cloud/1.1/',
-}
\ No newline at end of file
+}
+
+# さくらのクラウドAPIの日時はJSTで返される
+JST = timezone(timedelta(hours=9))
@@ -0,0 +1,103 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+class BoundedExecutor:
+    """イベントループを止めないよう、同期処理をワーカーで実行するエグゼキュータ
+
+    待機中を含む投入数を上限までに制限し、上限に達した場合は空きができるまで投入を待たせる。
+    ワーカーは最初の投入時に作成する。
+    """
+
+    def __init__(self, kind: str, max_workers: int, max_pending: int, name: str = "worker"):
+        """エグゼキュータの初期化
+
+        Args:
+            kind: ワーカーの種類（"thread" または "process"）
+            max_workers: ワーカー数
+            max_pending: 実行中・待機中を合わせた投入数の上限
+            name: スレッド名の接頭辞
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"kind must be one of {EXECUTOR_KINDS}: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.name = name
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        # asyncio.Semaphoreはイベントループごとに作成する
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # スレッドを使うサーバのプロセスをforkするとデッドロックしうるため、spawnで起動する
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=self.name
+                    )
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """関数をワーカーで実行し、結果を返す
+
+        プロセスで実行する場合、関数と引数はpickleできる必要がある（モジュールレベルの関数を渡す）。
+        呼び出し元がキャンセルされた場合、開始前の処理は取り消され、実行中の処理は結果を破棄する。
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(loop, asyncio.Semaphore(self.max_pending))
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """ワーカーを終了する（次の投入時に作成し直す）"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _env_int(name: str, default: int) -> int:
+    """環境変数を正の整数として読み込む（未設定・不正な値の場合はデフォルト値）"""
+    try:
+        value = int(os.getenv(name, ""))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def create_parse_executor() -> BoundedExecutor:
+    """HTMLの解析などCPU負荷の高い処理のエグゼキュータを環境変数の設定から作成する
+
+    - SACLOUD_MCP_PARSE_EXECUTOR: "thread"（デフォルト）または "process"
+    - SACLOUD_MCP_PARSE_WORKERS: ワーカー数（デフォルト: CPU数と4の小さい方）
+    - SACLOUD_MCP_PARSE_QUEUE: 実行中・待機中を合わせた投入数の上限（デフォルト: ワーカー数の4倍）
+    """
+    kind = os.getenv("SACLOUD_MCP_PARSE_EXECUTOR", "thread").lower()
+    if kind not in EXECUTOR_KINDS:
+        kind = "thread"
+    workers = _env_int("SACLOUD_MCP_PARSE_WORKERS", min(os.cpu_count() or 1, 4))
+    pending = _env_int("SACLOUD_MCP_PARSE_QUEUE", workers * 4)
+    return BoundedExecutor(kind, workers, pending, name="parse")
+
+
+# ドキュメントの解析で共有するエグゼキュータ
+PARSE_EXECUTOR = create_parse_executor()
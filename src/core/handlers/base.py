@@ -1,11 +1,21 @@
+import asyncio
 import httpx
 from enum import Enum
 from typing import Dict, Any, Union, Optional
 from mcp.server.fastmcp import Context
 
-from core.auth import SacloudApiKey, check_auth, get_http_client
+from core.auth import SacloudApiKey, check_auth, get_async_http_client
+from core.cache import TTLCache
+from core.concurrency import API_RATE_LIMITER
 from core.zone import validate_zone
 
+# プランやパブリックアーカイブなどのカタログ情報は頻繁に変わらないため、一定時間キャッシュする
+CATALOG_TTL_SECONDS = 3600
+CATALOG_CACHE = TTLCache(CATALOG_TTL_SECONDS)
+
+# 再試行で解消する可能性のあるHTTPステータスコード（リソースの使用中・ロック中、レート制限、サーバーエラー）
+RETRYABLE_STATUS_CODES = {409, 423, 429, 500, 502, 503, 504}
+
 
 class HttpMethod(Enum):
     """HTTPメソッドの定数定義"""
@@ -59,6 +69,8 @@ class BaseHandler:
         url: str,
         json_data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        retries: int = 0,
+        backoff_seconds: float = 1.0,
     ) -> Union[Dict[str, Any], str]:
         """API リクエストの統一処理
 
@@ -68,38 +80,79 @@ class BaseHandler:
             url: リクエストURL
             json_data: JSONリクエストボディ（POSTやPUT時）
             params: クエリパラメータ
+            retries: 一時的なエラー（通信エラー、409/423/429/5xx）時の再試行回数
+            backoff_seconds: 再試行までの待機時間（秒、再試行ごとに2倍）
 
         Returns:
             Union[Dict[str, Any], str]: APIレスポンスまたはエラーメッセージ
         """
-        try:
-            with get_http_client(self.api_key) as client:
-                if method == HttpMethod.GET:
-                    response = client.get(url, params=params)
-                elif method == HttpMethod.POST:
-                    response = client.post(url, json=json_data, params=params)
-                elif method == HttpMethod.PUT:
-                    response = client.put(url, json=json_data, params=params)
-                elif method == HttpMethod.DELETE:
-                    if json_data:
-                        # 例外的にDELETEメソッドでJSONボディを送信する場合がある
-                        response = client.request(
-                            "DELETE", url, json=json_data, params=params
-                        )
+        attempt = 0
+        while True:
+            try:
+                # 一括操作などで並列にリクエストする場合も、共有のレートリミッタで送信間隔を制御する
+                await API_RATE_LIMITER.acquire()
+                async with get_async_http_client(self.api_key) as client:
+                    if method == HttpMethod.GET:
+                        response = await client.get(url, params=params)
+                    elif method == HttpMethod.POST:
+                        response = await client.post(url, json=json_data, params=params)
+                    elif method == HttpMethod.PUT:
+                        response = await client.put(url, json=json_data, params=params)
+                    elif method == HttpMethod.DELETE:
+                        if json_data:
+                            # 例外的にDELETEメソッドでJSONボディを送信する場合がある
+                            response = await client.request(
+                                "DELETE", url, json=json_data, params=params
+                            )
+                        else:
+                            response = await client.delete(url, params=params)
                     else:
-                        response = client.delete(url, params=params)
-                else:
-                    return f"サポートされていないHTTPメソッドです: {method.value}"
-
-                response.raise_for_status()
-                return response.json()
-
-        except httpx.RequestError as e:
-            await ctx.error(f"http Request Error:{e}")
-            return f"さくらのクラウドAPIへのリクエストに失敗しました: {e}"
-        except httpx.HTTPStatusError as e:
-            await ctx.error(f"HTTP Status Error:{e}")
-            return f"さくらのクラウドAPIからエラーが返されました: {e.response.status_code} - {e.response.text}"
-        except Exception as e:
-            await ctx.error(f"Unexpected error:{e}")
-            return f"API リクエスト中に予期しないエラーが発生しました: {e}"
+                        return f"サポートされていないHTTPメソッドです: {method.value}"
+
+                    response.raise_for_status()
+                    return response.json()
+
+            except httpx.RequestError as e:
+                if attempt < retries:
+                    attempt += 1
+                    await self._wait_before_retry(ctx, attempt, backoff_seconds, e)
+                    continue
+                await ctx.error(f"http Request Error:{e}")
+                return f"さくらのクラウドAPIへのリクエストに失敗しました: {e}"
+            except httpx.HTTPStatusError as e:
+                if attempt < retries and e.response.status_code in RETRYABLE_STATUS_CODES:
+                    attempt += 1
+                    await self._wait_before_retry(ctx, attempt, backoff_seconds, e)
+                    continue
+                await ctx.error(f"HTTP Status Error:{e}")
+                return f"さくらのクラウドAPIからエラーが返されました: {e.response.status_code} - {e.response.text}"
+            except Exception as e:
+                await ctx.error(f"Unexpected error:{e}")
+                return f"API リクエスト中に予期しないエラーが発生しました: {e}"
+
+    async def _wait_before_retry(
+        self, ctx: Context, attempt: int, backoff_seconds: float, error: Exception
+    ) -> None:
+        """指数バックオフで再試行まで待機する"""
+        delay = backoff_seconds * 2 ** (attempt - 1)
+        await ctx.warning(f"retry {attempt} after {delay}s: {error}")
+        await asyncio.sleep(delay)
+
+    async def get_cached_catalog(
+        self, ctx: Context, zone: str, resource: str
+    ) -> Union[Dict[str, Any], str]:
+        """カタログ情報（product/server, product/disk, archive等）をキャッシュ経由で取得する
+
+        Args:
+            ctx: MCPコンテキスト
+            zone: 対象ゾーン
+            resource: 取得するリソースのパス（例: "product/server"）
+
+        Returns:
+            Union[Dict[str, Any], str]: APIレスポンスまたはエラーメッセージ
+        """
+        url = f"{self.zone_urls[zone]}{resource}"
+        return await CATALOG_CACHE.get_or_fetch(
+            (zone, resource),
+            lambda: self.handle_api_request(ctx, HttpMethod.GET, url),
+        )
@@ -0,0 +1,492 @@
+import time
+import warnings
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.consts import JST
+
+
+def parse_monitor_data(
+    data: Optional[Dict[str, Dict[str, Any]]],
+) -> Tuple[np.ndarray, List[str], Dict[str, np.ndarray]]:
+    """モニタ情報のDataを時刻順の配列に変換する
+
+    Args:
+        data: モニタ情報のData（時刻文字列 -> {項目名: 値}）
+
+    Returns:
+        Tuple: 以下の3つ
+            - 各サンプルのUNIX時刻（秒）の配列
+            - 各サンプルの時刻文字列のリスト
+            - 項目名ごとの値の配列（欠損値はNaN）
+    """
+    if not data:
+        return np.empty(0, dtype=np.int64), [], {}
+
+    parsed = sorted(
+        (datetime.fromisoformat(key), key, values or {}) for key, values in data.items()
+    )
+    timestamps = np.array([int(item[0].timestamp()) for item in parsed], dtype=np.int64)
+    keys = [item[1] for item in parsed]
+
+    names = sorted({name for _, _, values in parsed for name in values})
+    metrics = {
+        name: np.array(
+            [
+                values.get(name) if isinstance(values.get(name), (int, float)) else np.nan
+                for _, _, values in parsed
+            ],
+            dtype=np.float64,
+        )
+        for name in names
+    }
+    # 数値を1件も含まない項目は集計対象外とする
+    metrics = {name: values for name, values in metrics.items() if not np.isnan(values).all()}
+    return timestamps, keys, metrics
+
+
+def metric_statistics(values: np.ndarray, keys: List[str]) -> Dict[str, Any]:
+    """1項目分の値から統計値を計算する"""
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return {"Count": 0}
+
+    peak = int(np.nanargmax(values))
+    return {
+        "Count": int(valid.sum()),
+        "Min": float(np.nanmin(values)),
+        "Max": float(values[peak]),
+        "Mean": float(np.nanmean(values)),
+        "P95": float(np.nanpercentile(values, 95)),
+        "Sum": float(np.nansum(values)),
+        "PeakAt": keys[peak],
+    }
+
+
+def bucket_statistics(
+    timestamps: np.ndarray,
+    metrics: Dict[str, np.ndarray],
+    bucket_seconds: int,
+    tz: timezone = JST,
+) -> Dict[str, Any]:
+    """サンプルを一定間隔のバケットにまとめ、バケットごとの平均値と最大値を計算する
+
+    Args:
+        timestamps: 時刻順に並んだUNIX時刻（秒）の配列
+        metrics: 項目名ごとの値の配列
+        bucket_seconds: バケットの間隔（秒）
+        tz: バケットの境界を揃えるタイムゾーン
+
+    Returns:
+        dict: 列名のリストとバケットごとの値のリスト
+    """
+    names = sorted(metrics)
+    columns = ["Start"] + [f"{name}.{stat}" for name in names for stat in ("Mean", "Max")]
+    if timestamps.size == 0:
+        return {"Columns": columns, "Rows": []}
+
+    # ローカル時刻の境界（例: 1日単位なら0時）に揃えてバケットに割り当てる
+    offset = int(tz.utcoffset(None).total_seconds())
+    bucket_ids = (timestamps + offset) // bucket_seconds
+    starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+
+    table = [bucket_ids[starts] * bucket_seconds - offset]
+    for name in names:
+        values = metrics[name]
+        valid = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        counts = np.add.reduceat(valid.astype(np.int64), starts)
+        maxima = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table.append(np.where(counts > 0, sums / counts, np.nan))
+        table.append(np.where(np.isfinite(maxima), maxima, np.nan))
+
+    rows = []
+    for index in range(starts.size):
+        start = datetime.fromtimestamp(int(table[0][index]), tz).isoformat()
+        values = [None if np.isnan(column[index]) else float(column[index]) for column in table[1:]]
+        rows.append([start] + values)
+    return {"Columns": columns, "Rows": rows}
+
+
+def summarize_monitor(
+    response: Dict[str, Any], bucket_minutes: Optional[int] = None
+) -> Dict[str, Any]:
+    """モニタ情報のAPIレスポンスを統計値の要約に変換する
+
+    Args:
+        response: モニタ情報のAPIレスポンス
+        bucket_minutes: バケットの間隔（分）。指定した場合はバケットごとの平均値と最大値を含める
+
+    Returns:
+        dict: モニタ情報の要約
+            - Points: サンプル数
+            - Start: 最初のサンプルの時刻
+            - End: 最後のサンプルの時刻
+            - Metrics: 項目ごとの統計値（Count, Min, Max, Mean, P95, Sum, PeakAt）
+            - Buckets: バケットごとの平均値と最大値（bucket_minutes指定時のみ）
+    """
+    timestamps, keys, metrics = parse_monitor_data(response.get("Data"))
+
+    summary: Dict[str, Any] = {
+        "Points": len(keys),
+        "Start": keys[0] if keys else None,
+        "End": keys[-1] if keys else None,
+        "Metrics": {name: metric_statistics(values, keys) for name, values in metrics.items()},
+    }
+    if bucket_minutes:
+        summary["Buckets"] = bucket_statistics(timestamps, metrics, bucket_minutes * 60)
+    return summary
+
+
+def align_series(
+    series: List[Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """複数の系列を共通の時刻軸に揃えた行列に変換する
+
+    Args:
+        series: (時刻の配列, 値の配列) のリスト
+
+    Returns:
+        Tuple: 以下の2つ
+            - 全系列の時刻を合わせた時刻順の配列
+            - 系列ごとの値の行列（系列数 × 時刻数、値がない時刻はNaN）
+    """
+    if not series:
+        return np.empty(0, dtype=np.int64), np.empty((0, 0))
+
+    grid = np.unique(np.concatenate([timestamps for timestamps, _ in series]))
+    matrix = np.full((len(series), grid.size), np.nan)
+    for row, (timestamps, values) in enumerate(series):
+        matrix[row, np.searchsorted(grid, timestamps)] = values
+    return grid, matrix
+
+
+# 中央値の計算で一度に展開するウィンドウの要素数の上限（float64で16MiB）
+ROLLING_CHUNK_ELEMENTS = 1 << 21
+
+
+def window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """各時刻tについて、t-windowからt-1までの値の合計を累積和から計算する
+
+    Returns:
+        np.ndarray: 系列数 × (時刻数 - window) の行列（列iは時刻window+iの基準）
+    """
+    cumulative = np.zeros((values.shape[0], values.shape[1] + 1), dtype=values.dtype)
+    np.cumsum(values, axis=1, out=cumulative[:, 1:])
+    return cumulative[:, window:-1] - cumulative[:, : -window - 1]
+
+
+def rolling_mean_std(
+    matrix: np.ndarray, valid: np.ndarray, counts: np.ndarray, window: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """直前のwindow個のサンプルの平均と標準偏差を累積和で計算する
+
+    桁落ちを抑えるため、系列ごとに平均を引いた値の累積和を使う。
+
+    Returns:
+        Tuple: 系列ごとに引いた値、基準の平均（引いた後の値）、標準偏差、丸め誤差の許容値
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        shift = np.nan_to_num(np.nanmean(matrix, axis=1))
+    shifted = np.where(valid, matrix - shift[:, None], 0.0)
+    squares = shifted * shifted
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = window_sums(shifted, window) / counts
+        variance = window_sums(squares, window) / counts - mean * mean
+    # 累積和の丸め誤差より小さい分散は0（基準が一定）とみなす
+    tolerance = 1e-9 * squares.max(axis=1, initial=0.0)
+    variance = np.where(variance <= tolerance[:, None], 0.0, variance)
+    return shift, mean, np.sqrt(variance), np.sqrt(tolerance)
+
+
+def rolling_median_mad(matrix: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """直前のwindow個のサンプルの中央値と中央絶対偏差を計算する
+
+    ウィンドウを展開するとサンプル数 × windowの大きさになるため、
+    系列・時刻のブロックごとに ROLLING_CHUNK_ELEMENTS 以下に分けて計算する。
+    """
+    rows, points = matrix.shape[0], matrix.shape[1] - window
+    center = np.full((rows, points), np.nan)
+    scale = np.full((rows, points), np.nan)
+    span = max(1, ROLLING_CHUNK_ELEMENTS // window)
+    columns = min(points, span)
+    row_step = max(1, span // columns)
+    with warnings.catch_warnings():
+        # 欠損値のみのウィンドウではNaNになるため、警告は無視する
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for row in range(0, rows, row_step):
+            for column in range(0, points, columns):
+                end = min(points, column + columns)
+                # 時刻window+column以降の基準は、時刻columnからのサンプル
+                block = matrix[row : row + row_step, column : end + window - 1]
+                windows = np.lib.stride_tricks.sliding_window_view(block, window, axis=1)
+                median = np.nanmedian(windows, axis=2)
+                center[row : row + row_step, column:end] = median
+                # 正規分布の標準偏差と同じ尺度にするための係数
+                scale[row : row + row_step, column:end] = 1.4826 * np.nanmedian(
+                    np.abs(windows - median[..., None]), axis=2
+                )
+    return center, scale
+
+
+def rolling_scores(matrix: np.ndarray, window: int, method: str = "zscore") -> np.ndarray:
+    """各時刻の値について、直前のwindow個のサンプルを基準としたスコアを全系列まとめて計算する
+
+    zscoreは累積和で計算し、madは一定の大きさのブロックごとに計算するため、
+    使用するメモリは系列数 × 時刻数に比例し、windowには比例しない。
+
+    Args:
+        matrix: 系列ごとの値の行列（系列数 × 時刻数）
+        window: 基準に使う直前のサンプル数
+        method: "zscore"（平均・標準偏差）または "mad"（中央値・中央絶対偏差）
+
+    Returns:
+        np.ndarray: matrixと同じ形のスコアの行列（基準を計算できない時刻はNaN）
+    """
+    scores = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] <= window:
+        return scores
+
+    # 時刻tの基準は t-window から t-1 までのサンプル（現在の値を含めない）
+    valid = ~np.isnan(matrix)
+    counts = window_sums(valid.astype(np.int64), window)
+    current = matrix[:, window:]
+    if method == "mad":
+        center, scale = rolling_median_mad(matrix, window)
+        deviation = current - center
+    else:
+        shift, mean, scale, tolerance = rolling_mean_std(matrix, valid, counts, window)
+        deviation = (current - shift[:, None]) - mean
+        # 基準が一定の場合、丸め誤差の範囲の差は変化なしとみなす
+        deviation = np.where(
+            (scale == 0) & (np.abs(deviation) <= tolerance[:, None]), 0.0, deviation
+        )
+
+    # 基準のサンプルが半数未満の時刻はスコアを計算しない
+    enough = counts * 2 >= window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 基準が一定（ばらつき0）の場合は、値が変化していれば無限大とする
+        score = np.where(
+            scale > 0, deviation / scale, np.where(deviation == 0, 0.0, np.sign(deviation) * np.inf)
+        )
+    scores[:, window:] = np.where(enough, score, np.nan)
+    return scores
+
+
+def flagged_intervals(flags: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """真偽値の行列から、行ごとに連続して真になっている区間を取り出す
+
+    Args:
+        flags: 系列ごとの真偽値の行列（系列数 × 時刻数）
+
+    Returns:
+        Tuple: 区間ごとの行番号、開始位置、終了位置（終了位置を含む）の配列
+    """
+    padded = np.zeros((flags.shape[0], flags.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = flags
+    changes = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(changes == 1)
+    _, ends = np.nonzero(changes == -1)
+    return rows, starts, ends - 1
+
+
+def parse_time(value: str) -> int:
+    """ISO形式の時刻をUNIX時刻（秒）に変換する（タイムゾーンがない場合はJSTとみなす）"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=JST)
+    return int(parsed.timestamp())
+
+
+def format_time(timestamp: int) -> str:
+    """UNIX時刻（秒）をAPIと同じ形式（JSTのISO形式）の時刻に変換する"""
+    return datetime.fromtimestamp(int(timestamp), JST).isoformat()
+
+
+def response_envelope(response: Dict[str, Any]) -> Dict[str, Any]:
+    """モニタ情報のAPIレスポンスから、Data以外の項目を返す"""
+    return {name: value for name, value in response.items() if name != "Data"}
+
+
+class MonitorRingBuffer:
+    """1リソース分のモニタ情報を保持する固定長のリングバッファ"""
+
+    def __init__(self, capacity: int):
+        """リングバッファの初期化
+
+        Args:
+            capacity: 保持するサンプル数の上限
+        """
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.values: Dict[str, np.ndarray] = {}
+        self.head = 0  # 最も古いサンプルの位置
+        self.size = 0
+        # この時刻以降のサンプルはすべてバッファに含まれている
+        self.covered_from: Optional[int] = None
+        # 最後に取得したAPIレスポンスのData以外の項目（is_okなど）
+        self.envelope: Dict[str, Any] = {"is_ok": True}
+
+    def last_timestamp(self) -> Optional[int]:
+        """最新のサンプルの時刻を返す"""
+        if not self.size:
+            return None
+        return int(self.timestamps[(self.head + self.size - 1) % self.capacity])
+
+    def extend(self, timestamps: np.ndarray, metrics: Dict[str, np.ndarray]) -> None:
+        """時刻順のサンプルを追加する（最新のサンプルと同時刻のものは上書きし、それより古いものは無視する）"""
+        last = self.last_timestamp()
+        if last is not None and timestamps.size:
+            if timestamps[0] <= last:
+                # 集計途中だった最新のサンプルを取り直した値で置き換える
+                if last in timestamps:
+                    index = int(np.flatnonzero(timestamps == last)[0])
+                    position = (self.head + self.size - 1) % self.capacity
+                    for name, values in metrics.items():
+                        self._column(name)[position] = values[index]
+                newer = timestamps > last
+                timestamps = timestamps[newer]
+                metrics = {name: values[newer] for name, values in metrics.items()}
+
+        count = timestamps.size
+        if not count:
+            return
+        if count > self.capacity:
+            timestamps = timestamps[-self.capacity :]
+            metrics = {name: values[-self.capacity :] for name, values in metrics.items()}
+            count = self.capacity
+
+        positions = (self.head + self.size + np.arange(count)) % self.capacity
+        self.timestamps[positions] = timestamps
+        for name in set(self.values) | set(metrics):
+            column = self._column(name)
+            column[positions] = metrics[name] if name in metrics else np.nan
+
+        overflow = max(0, self.size + count - self.capacity)
+        self.head = (self.head + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + count)
+        if overflow:
+            # 古いサンプルを上書きした場合は、残っている最古のサンプル以降のみを保持していることになる
+            self.covered_from = int(self.timestamps[self.head])
+
+    def query(self, start: int, end: int) -> Dict[str, Any]:
+        """指定期間のサンプルを、最後に取得したAPIレスポンスのDataを置き換えた形式で返す"""
+        order = (self.head + np.arange(self.size)) % self.capacity
+        timestamps = self.timestamps[order]
+        selected = order[(timestamps >= start) & (timestamps <= end)]
+
+        data = {}
+        for position in selected:
+            data[format_time(self.timestamps[position])] = {
+                name: None if np.isnan(column[position]) else float(column[position])
+                for name, column in self.values.items()
+            }
+        return {**self.envelope, "Data": data}
+
+    def _column(self, name: str) -> np.ndarray:
+        """項目の配列を返す（初めての項目は欠損値で初期化する）"""
+        if name not in self.values:
+            self.values[name] = np.full(self.capacity, np.nan)
+        return self.values[name]
+
+
+class MonitorStore:
+    """リソースごとのモニタ情報をリングバッファに保持し、未取得の期間のみをAPIから取得するストア"""
+
+    # 5分間隔で2週間分
+    DEFAULT_CAPACITY = 4032
+    DEFAULT_MAX_RESOURCES = 256
+    DEFAULT_WINDOW_SECONDS = 24 * 60 * 60
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        max_resources: int = DEFAULT_MAX_RESOURCES,
+    ):
+        """ストアの初期化
+
+        Args:
+            capacity: リソースごとに保持するサンプル数の上限
+            max_resources: 保持するリソース数の上限（超えた場合は最も長く使われていないものを破棄する）
+        """
+        self.capacity = capacity
+        self.max_resources = max_resources
+        self.buffers: "OrderedDict[Hashable, MonitorRingBuffer]" = OrderedDict()
+
+    async def get(
+        self,
+        key: Hashable,
+        fetch: Callable[[str, str], Awaitable[Union[Dict[str, Any], str]]],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Union[Dict[str, Any], str]:
+        """指定期間のモニタ情報を返す
+
+        Args:
+            key: リソースを識別するキー（ゾーン, リソースID, インターフェース）
+            fetch: 開始時刻・終了時刻を受け取り、APIからモニタ情報を取得する関数
+            start: 開始時刻（ISO形式、デフォルトは終了時刻の24時間前）
+            end: 終了時刻（ISO形式、デフォルトは開始時刻の24時間後、どちらも省略時は現在時刻）
+
+        Returns:
+            Union[Dict[str, Any], str]: APIレスポンスと同じ形式のモニタ情報またはエラーメッセージ
+        """
+        # APIと同じく、片方のみ指定した場合はもう片方を24時間前後とする
+        try:
+            if end:
+                end_ts = parse_time(end)
+            elif start:
+                end_ts = parse_time(start) + self.DEFAULT_WINDOW_SECONDS
+            else:
+                end_ts = int(time.time())
+            start_ts = parse_time(start) if start else end_ts - self.DEFAULT_WINDOW_SECONDS
+        except ValueError:
+            return "開始時刻・終了時刻はISO形式（例: 2025-01-01T00:00:00+09:00）で指定する必要があります。"
+        if start_ts > end_ts:
+            return "開始時刻は終了時刻より前を指定する必要があります。"
+
+        buffer = self.buffers.get(key)
+        if buffer is None or buffer.covered_from is None or start_ts < buffer.covered_from:
+            # キャッシュにない期間を含む場合は指定期間をすべて取得し直す
+            response = await fetch(format_time(start_ts), format_time(end_ts))
+            if isinstance(response, str):
+                return response
+            timestamps, _, metrics = parse_monitor_data(response.get("Data"))
+            if timestamps.size > self.capacity:
+                # バッファに収まらない期間はキャッシュせずにそのまま返す
+                return response
+            buffer = MonitorRingBuffer(self.capacity)
+            buffer.extend(timestamps, metrics)
+            buffer.envelope = response_envelope(response)
+            buffer.covered_from = start_ts
+            self._store(key, buffer)
+        else:
+            last = buffer.last_timestamp()
+            if last is None or end_ts > last:
+                # 最新のサンプル以降のみを取得する
+                fetch_from = last if last is not None else start_ts
+                response = await fetch(format_time(fetch_from), format_time(end_ts))
+                if isinstance(response, str):
+                    return response
+                timestamps, _, metrics = parse_monitor_data(response.get("Data"))
+                buffer.extend(timestamps, metrics)
+                buffer.envelope = response_envelope(response)
+            self.buffers.move_to_end(key)
+
+        return buffer.query(start_ts, end_ts)
+
+    def _store(self, key: Hashable, buffer: MonitorRingBuffer) -> None:
+        """バッファを保存し、上限を超えた場合は最も長く使われていないものを破棄する"""
+        self.buffers[key] = buffer
+        self.buffers.move_to_end(key)
+        while len(self.buffers) > self.max_resources:
+            self.buffers.popitem(last=False)
+
+
+# ルータ・VPCルータのツールで共有するモニタ情報のストア
+MONITOR_STORE = MonitorStore()
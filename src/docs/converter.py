@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+from html_to_markdown import convert_to_markdown
+
+try:
+    import lxml  # noqa: F401
+
+    # lxmlがあればC実装のパーサで解析する
+    HTML_PARSER = "lxml"
+except ImportError:  # lxmlは高速化のためのみに使う
+    HTML_PARSER = "html.parser"
+
+# マニュアル・APIマニュアルの本文の要素
+MANUAL_MAIN_ATTRS = {"role": "main"}
+API_MANUAL_CONTENT_ATTRS = {"id": "content"}
+
+# 変換結果をHTMLのハッシュ値ごとに保持する件数
+CONVERT_CACHE_SIZE = 256
+
+_CONVERTED: "OrderedDict[Tuple[str, str, str], Optional[str]]" = OrderedDict()
+_CONVERTED_LOCK = threading.Lock()
+
+
+def extract_markdown(
+    html: str, attrs: Dict[str, str], parser: Optional[str] = None
+) -> Optional[str]:
+    """HTMLから指定した属性を持つ要素のみを解析し、markdownに変換する
+
+    ページ全体を解析せず、SoupStrainerで対象の要素の部分木のみを組み立てる。
+    同じ内容のHTMLの変換結果は、HTMLのハッシュ値をキーとして保持したものを返す。
+
+    Args:
+        html: ページのHTML
+        attrs: 本文の要素の属性（例: {"role": "main"}）
+        parser: BeautifulSoupのパーサ（デフォルトはlxmlがあればlxml、なければhtml.parser）
+
+    Returns:
+        Optional[str]: 本文のmarkdown（本文の要素がない場合はNone）
+    """
+    parser = parser or HTML_PARSER
+    key = (
+        parser,
+        ",".join(f"{name}={value}" for name, value in sorted(attrs.items())),
+        hashlib.sha256(html.encode("utf-8")).hexdigest(),
+    )
+    with _CONVERTED_LOCK:
+        if key in _CONVERTED:
+            _CONVERTED.move_to_end(key)
+            return _CONVERTED[key]
+
+    soup = BeautifulSoup(html, parser, parse_only=SoupStrainer(attrs=attrs))
+    main_html = soup.find(attrs=attrs)
+    markdown = convert_to_markdown(main_html) if main_html else None
+
+    with _CONVERTED_LOCK:
+        _CONVERTED[key] = markdown
+        while len(_CONVERTED) > CONVERT_CACHE_SIZE:
+            _CONVERTED.popitem(last=False)
+    return markdown
+
+
+def manual_to_markdown(html: str) -> Optional[str]:
+    """マニュアルのページの本文（role="main"）をmarkdownに変換する"""
+    return extract_markdown(html, MANUAL_MAIN_ATTRS)
+
+
+def api_manual_to_markdown(html: str) -> Optional[str]:
+    """APIマニュアルのページの本文（id="content"）をmarkdownに変換する"""
+    return extract_markdown(html, API_MANUAL_CONTENT_ATTRS)
+
+
+def clear_converted() -> None:
+    """保持している変換結果をすべて削除する"""
+    with _CONVERTED_LOCK:
+        _CONVERTED.clear()
@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from core.concurrency import RateLimiter, gather_with_concurrency
+from docs import search
+from core.executor import PARSE_EXECUTOR
+from docs.converter import api_manual_to_markdown, manual_to_markdown
+from docs.handlers.api_documents import API_MANUAL_INDEX_URL, parse_api_manual_outline
+from docs.manual import request_manual_page
+from docs.outline import OUTLINE_PATH
+from docs.snapshot import ManualSnapshot, prune_snapshots
+
+# マニュアルのサイトに負荷をかけないよう、同時接続数と1秒あたりのリクエスト数を制限する
+DEFAULT_CRAWL_CONCURRENCY = 4
+DEFAULT_CRAWL_RATE = 5.0
+DEFAULT_KEEP_SNAPSHOTS = 3
+
+
+def outline_urls(outline: Dict[str, Any]) -> List[str]:
+    """マニュアルの目次（outline.json）に含まれるurlを重複を除いて返す
+
+    目次の各項目は 項目名: [url, {子の項目}] の形式である。
+    """
+    urls: List[str] = []
+
+    def walk(items: Dict[str, Any]) -> None:
+        for url, children in items.values():
+            if url not in urls:
+                urls.append(url)
+            walk(children)
+
+    walk(outline)
+    return urls
+
+
+async def crawl_page(
+    url: str, reformat: Callable[[str], Optional[str]], limiter: RateLimiter
+) -> Tuple[str, Optional[str], Optional[str]]:
+    """ページを取得してmarkdownに変換する
+
+    Returns:
+        Tuple: (URL, markdown, エラーメッセージ)（取得・変換できた場合はエラーメッセージがNone）
+    """
+    await limiter.acquire()
+    try:
+        response = await request_manual_page(url, {})
+    except httpx.HTTPError as e:
+        return url, None, str(e)
+    try:
+        markdown = await PARSE_EXECUTOR.run(reformat, response.text)
+    except Exception as e:
+        # 想定外の構造のページで変換に失敗しても、他のページの取得は続ける
+        return url, None, str(e)
+    if not markdown:
+        return url, None, "ページの内容をmarkdownに変換できませんでした"
+    return url, markdown, None
+
+
+async def crawl_manuals(
+    concurrency: int = DEFAULT_CRAWL_CONCURRENCY,
+    rate: float = DEFAULT_CRAWL_RATE,
+    root: Optional[Path] = None,
+) -> ManualSnapshot:
+    """マニュアル・APIマニュアルのすべてのページを取得し、新しいスナップショットを作成する
+
+    Args:
+        concurrency: 同時に取得するページ数
+        rate: 1秒あたりの最大リクエスト数
+        root: スナップショットの保存先ディレクトリ（デフォルトは get_snapshot_root() の値）
+
+    Returns:
+        ManualSnapshot: 作成したスナップショット
+    """
+    limiter = RateLimiter(rate)
+    with open(OUTLINE_PATH, encoding="utf-8") as file:
+        targets = [(url, manual_to_markdown) for url in outline_urls(json.load(file))]
+
+    await limiter.acquire()
+    response = await request_manual_page(API_MANUAL_INDEX_URL, {})
+    api_outline = await PARSE_EXECUTOR.run(parse_api_manual_outline, response.text)
+    targets += [(url, api_manual_to_markdown) for url in dict.fromkeys(api_outline.values())]
+
+    results = await gather_with_concurrency(
+        concurrency,
+        [
+            lambda url=url, reformat=reformat: crawl_page(url, reformat, limiter)
+            for url, reformat in targets
+        ],
+    )
+    pages = [(url, markdown) for url, markdown, _ in results if markdown]
+    errors = [{"Url": url, "Message": error} for url, _, error in results if error]
+    return ManualSnapshot.create(pages, api_outline, errors, root)
+
+
+def main() -> None:
+    """マニュアルのスナップショットを作成し、検索用の索引を作り直す"""
+    parser = argparse.ArgumentParser(
+        description="さくらのクラウドのマニュアルのスナップショットを作成する"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CRAWL_CONCURRENCY, help="同時に取得するページ数"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=DEFAULT_CRAWL_RATE, help="1秒あたりの最大リクエスト数"
+    )
+    parser.add_argument(
+        "--keep", type=int, default=DEFAULT_KEEP_SNAPSHOTS, help="残すスナップショットの数"
+    )
+    args = parser.parse_args()
+
+    snapshot = asyncio.run(crawl_manuals(args.concurrency, args.rate))
+    prune_snapshots(args.keep)
+    print(f"{len(snapshot)}ページのスナップショットを作成しました: {snapshot.directory}")
+    for error in snapshot.manifest["Errors"]:
+        print(f"取得できなかったページ: {error['Url']} ({error['Message']})")
+
+    index = search.build_search_index()
+    print(f"{len(index)}件のセクションの索引を作成しました: {search.get_index_dir()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.cache import DiskCache
+from core.concurrency import gather_with_concurrency
+from core.executor import PARSE_EXECUTOR
+from docs.converter import api_manual_to_markdown
+from docs.manual import get_manual_document, get_manual_max_age
+from docs.search import tokenize
+from docs.sections import section_tree
+from docs.snapshot import is_offline
+
+# APIマニュアルのページから抽出したエンドポイントの一覧を永続キャッシュに保存する
+ENDPOINT_CACHE = DiskCache("api_endpoints")
+ENDPOINT_TABLE_KEY = "table"
+
+# 抽出結果の形式を変更した場合は上げる（古い形式のキャッシュは使わない）
+ENDPOINT_TABLE_VERSION = 1
+
+# メソッドとパス（「GET /server」「| PUT | /server/:id |」、APIのURLの形式も含む）
+ENDPOINT_PATTERN = re.compile(
+    r"(?<![A-Za-z])(?P<method>GET|POST|PUT|DELETE|PATCH)(?![A-Za-z])[\s|`*:]*"
+    r"(?:https?://[^\s|`]*?/api/cloud/1\.1)?(?P<path>/[A-Za-z0-9_{}:.\-][A-Za-z0-9_{}:./\-]*)"
+)
+
+# リクエスト・レスポンスなど、APIの名前ではない見出し
+GENERIC_HEADINGS = (
+    "概要",
+    "リクエスト",
+    "レスポンス",
+    "パラメータ",
+    "例",
+    "サンプル",
+    "request",
+    "response",
+)
+
+CODE_BLOCK_PATTERN = re.compile(r"```[^\n]*\n(?P<code>.*?)```", re.DOTALL)
+TABLE_ROW_PATTERN = re.compile(r"^\|(?P<cells>.*)\|\s*$", re.MULTILINE)
+
+# 1件の結果に含める例の文字数とパラメータ数の上限
+MAX_EXAMPLE_CHARS = 200
+MAX_PARAMETERS = 20
+
+# 一覧を作成する際に同時に取得するページ数
+ENDPOINT_CONCURRENCY = 4
+
+
+def is_generic_heading(heading: str) -> bool:
+    """APIの名前ではない見出し（リクエスト・レスポンスなど）か"""
+    lowered = heading.lower()
+    return any(word in lowered for word in GENERIC_HEADINGS)
+
+
+def owner_section(sections: List[Dict[str, Any]], position: int) -> Optional[Dict[str, Any]]:
+    """位置を含むセクションのうち、APIの名前の見出しを持つ最も下位のセクションを返す"""
+    owner = None
+    for section in sections:
+        if section["Start"] <= position < section["End"] and section["Heading"]:
+            if not is_generic_heading(section["Heading"]):
+                owner = section
+    return owner
+
+
+def table_parameters(text: str) -> List[str]:
+    """本文の表の1列目から、パラメータ名を取り出す（見出し行・区切り行・メソッドの行は除く）"""
+    names = []
+    for row in TABLE_ROW_PATTERN.finditer(text):
+        first = row.group("cells").split("|")[0].strip().strip("`*")
+        if (
+            not first
+            or set(first) <= set("-: ")
+            or ENDPOINT_PATTERN.search(row.group(0))
+            or not re.fullmatch(r"[A-Za-z][A-Za-z0-9_.\[\]]*", first)
+        ):
+            continue
+        if first not in names:
+            names.append(first)
+    return names[:MAX_PARAMETERS]
+
+
+def example_body(text: str) -> str:
+    """本文のコードブロックから、リクエストボディの例（JSON）を取り出す（レスポンス以降は対象としない）"""
+    response = re.search(r"^.*(レスポンス|response).*$", text, re.MULTILINE | re.IGNORECASE)
+    request_text = text[: response.start()] if response else text
+    for block in CODE_BLOCK_PATTERN.finditer(request_text):
+        code = block.group("code").strip()
+        if code.startswith(("{", "[")):
+            compact = " ".join(code.split())
+            if len(compact) > MAX_EXAMPLE_CHARS:
+                compact = compact[:MAX_EXAMPLE_CHARS] + "…"
+            return compact
+    return ""
+
+
+def extract_endpoints(url: str, title: str, markdown: str) -> List[Dict[str, Any]]:
+    """APIマニュアルのページのmarkdownから、エンドポイントの一覧を抽出する（ワーカーで実行する）
+
+    メソッドとパスが出現するごとに、それを含むAPIの名前の見出しのセクションを探し、
+    次のエンドポイントまでの本文からパラメータとリクエストボディの例を取り出す。
+    同じメソッドとパスが複数回出現する場合（ページ冒頭の一覧など）は、情報の多いものを残す。
+
+    Returns:
+        List[Dict[str, Any]]: エンドポイントのリスト
+            - Method, Path: メソッドとパスのテンプレート
+            - Title: APIの名前（セクションの見出し）
+            - Summary: メソッドとパスを含む行の説明
+            - Parameters: パラメータ名のリスト
+            - ExampleBody: リクエストボディの例（省略あり）
+            - Page, Url, Section: ページのタイトル・url、セクションのId（read_api_manualで詳細を取得できる）
+    """
+    sections = section_tree(markdown)
+    matches = list(ENDPOINT_PATTERN.finditer(markdown))
+    endpoints: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for index, match in enumerate(matches):
+        owner = owner_section(sections, match.start())
+        end = owner["End"] if owner else len(markdown)
+        if index + 1 < len(matches):
+            end = min(end, matches[index + 1].start())
+        body = markdown[match.end() : end]
+
+        line_start = markdown.rfind("\n", 0, match.start()) + 1
+        line_end = markdown.find("\n", match.end())
+        line = markdown[line_start : line_end if line_end >= 0 else len(markdown)]
+        summary = " ".join(
+            line.replace(match.group(0), " ").replace("|", " ").replace("`", " ").split()
+        )
+
+        endpoint = {
+            "Method": match.group("method"),
+            "Path": match.group("path").rstrip("."),
+            "Title": owner["Heading"] if owner else title,
+            "Summary": summary,
+            "Parameters": table_parameters(body),
+            "ExampleBody": example_body(body),
+            "Page": title,
+            "Url": url,
+            "Section": owner["Id"] if owner else "",
+        }
+        key = (endpoint["Method"], endpoint["Path"])
+        if key not in endpoints or detail(endpoint) > detail(endpoints[key]):
+            endpoints[key] = endpoint
+    return list(endpoints.values())
+
+
+def detail(endpoint: Dict[str, Any]) -> int:
+    """エンドポイントの情報量（パラメータ数と例の有無）"""
+    return len(endpoint["Parameters"]) + (1 if endpoint["ExampleBody"] else 0)
+
+
+def load_endpoint_table() -> Optional[Dict[str, Any]]:
+    """キャッシュしたエンドポイントの一覧を返す
+
+    期間を過ぎた場合・形式が古い場合はNoneを返す（オフラインモードでは期間を過ぎていても返す）。
+    """
+    table = ENDPOINT_CACHE.get(ENDPOINT_TABLE_KEY)
+    if not table or table.get("Version") != ENDPOINT_TABLE_VERSION:
+        return None
+    if not is_offline() and time.time() - table["BuiltAt"] >= get_manual_max_age():
+        return None
+    return table
+
+
+async def build_endpoint_table(outline: Dict[str, str]) -> Dict[str, Any]:
+    """APIマニュアルの目次の各ページからエンドポイントの一覧を作成し、キャッシュに保存する
+
+    各ページはマニュアルのページのキャッシュから読み込み、キャッシュにないページのみ取得する。
+    取得できなかったページはErrorsに記録し、残りのページで一覧を作成する。
+
+    Args:
+        outline: APIマニュアルの目次（項目名からurlへの辞書）
+    """
+
+    async def endpoints_of(title: str, url: str) -> List[Dict[str, Any]]:
+        document = await get_manual_document(url, api_manual_to_markdown)
+        if not document:
+            return []
+        return await PARSE_EXECUTOR.run(extract_endpoints, url, title, document["Markdown"])
+
+    async def collect(title: str, url: str) -> Tuple[str, Any]:
+        try:
+            return url, await endpoints_of(title, url)
+        except Exception as e:
+            return url, e
+
+    results = await gather_with_concurrency(
+        ENDPOINT_CONCURRENCY,
+        [lambda title=title, url=url: collect(title, url) for title, url in outline.items()],
+    )
+    endpoints: List[Dict[str, Any]] = []
+    errors: Dict[str, str] = {}
+    for url, result in results:
+        if isinstance(result, Exception):
+            errors[url] = str(result)
+        else:
+            endpoints.extend(result)
+
+    table = {
+        "Version": ENDPOINT_TABLE_VERSION,
+        "BuiltAt": time.time(),
+        "Endpoints": endpoints,
+        "Errors": errors,
+    }
+    if endpoints:
+        ENDPOINT_CACHE.set(ENDPOINT_TABLE_KEY, table)
+    return table
+
+
+def search_endpoints(
+    endpoints: List[Dict[str, Any]],
+    keyword: Optional[str] = None,
+    path_prefix: Optional[str] = None,
+    method: Optional[str] = None,
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
+    """エンドポイントをキーワード・パスの前方一致・メソッドで検索する
+
+    キーワードは検索用のトークンに分割し、APIの名前・説明・パス・パラメータ名・ページのタイトルに
+    含まれるトークンの割合が高い順に返す。
+    """
+    if path_prefix:
+        prefix = "/" + path_prefix.strip().lstrip("/").lower()
+        endpoints = [
+            endpoint for endpoint in endpoints if endpoint["Path"].lower().startswith(prefix)
+        ]
+    if method:
+        endpoints = [endpoint for endpoint in endpoints if endpoint["Method"] == method.upper()]
+    if not keyword or not keyword.strip():
+        return endpoints[:limit]
+
+    query = set(tokenize(keyword))
+    if not query:
+        return []
+    scored = []
+    for order, endpoint in enumerate(endpoints):
+        text = " ".join(
+            [
+                endpoint["Title"],
+                endpoint["Summary"],
+                endpoint["Path"],
+                endpoint["Page"],
+                *endpoint["Parameters"],
+            ]
+        )
+        score = len(query & set(tokenize(text))) / len(query)
+        if score:
+            scored.append((-score, order, endpoint))
+    return [endpoint for _, _, endpoint in sorted(scored, key=lambda item: item[:2])[:limit]]
@@ -1,7 +1,34 @@
 from bs4 import BeautifulSoup
 from mcp.server.fastmcp import Context
+from typing import Optional
 import httpx
-from html_to_markdown import convert_to_markdown
+
+from core.cache import TTLCache
+from core.executor import PARSE_EXECUTOR
+from docs.converter import api_manual_to_markdown
+from docs.endpoints import build_endpoint_table, load_endpoint_table, search_endpoints
+from docs.manual import get_manual_document, get_manual_max_age
+from docs.object_storage_api import (
+    find_operation,
+    get_object_storage_api_index,
+    operation_markdown,
+    operation_outline,
+)
+from docs.sections import select_chunk
+from docs.snapshot import current_snapshot, is_offline
+
+API_MANUAL_INDEX_URL = 'https://manual.sakura.ad.jp/cloud-api/1.1/index.html'
+
+def parse_api_manual_outline(html: str) -> dict:
+    """APIマニュアルの目次のページから、項目名と対応するurlを取り出す"""
+    links = {}
+    soup = BeautifulSoup(html, "html.parser")
+    a_tags = soup.find_all("a",class_="js-toggle-guides")
+    for a in a_tags:
+        href = f"https://manual.sakura.ad.jp/cloud-api/1.1/{a['href']}"
+        text = a.get_text(strip=True)
+        links[text] = href
+    return links
 
 class APIDocumentsHandler:
     """ドキュメントのMCPサーバハンドラ"""
@@ -9,13 +36,16 @@ class APIDocumentsHandler:
         self,
         mcp,
     ):
-        self.manual_outlines = None
+        # APIマニュアルの目次は、マニュアルのページを再検証する期間と同じだけ保持する
+        self.manual_outlines = TTLCache(get_manual_max_age())
         self.mcp = mcp
 
         # MCPサーバのツール登録
         self.mcp.tool(name='get_api_manual_outline')(self.get_api_manual_outline)
         self.mcp.tool(name='read_api_manual')(self.read_api_manual)
+        self.mcp.tool(name='find_api_endpoint')(self.find_api_endpoint)
         self.mcp.tool(name='read_object_storage_api_manual')(self.read_object_storage_api_manual)
+        self.mcp.tool(name='read_object_storage_api_operation')(self.read_object_storage_api_operation)
 
     async def get_api_manual_outline(self,ctx: Context):
         """
@@ -24,19 +54,23 @@ class APIDocumentsHandler:
             dict:  さくらのクラウドのマニュアルの目次
                 - 目次名(str): url(str)
         """
-        links = {}
-        url = 'https://manual.sakura.ad.jp/cloud-api/1.1/index.html'
+        # オフラインモードではスナップショットに保存した目次を返す
+        snapshot = current_snapshot() if is_offline() else None
+        if snapshot and snapshot.manifest.get("ApiOutline"):
+            return snapshot.manifest["ApiOutline"]
+        # 取得した目次は一定期間保持する（エラーの場合は保持しない）
+        return await self.manual_outlines.get_or_fetch(
+            API_MANUAL_INDEX_URL, lambda: self.fetch_api_manual_outline(ctx)
+        )
+
+    async def fetch_api_manual_outline(self,ctx: Context):
+        """APIマニュアルの目次のページを取得して解析する（失敗した場合はエラーメッセージを返す）"""
         try:
             async with httpx.AsyncClient(timeout=10.0) as client:
-                    response = await client.get(url)
+                    response = await client.get(API_MANUAL_INDEX_URL)
                     response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            a_tags = soup.find_all("a",class_="js-toggle-guides")
-            for a in a_tags:
-                href = f"https://manual.sakura.ad.jp/cloud-api/1.1/{a['href']}"
-                text = a.get_text(strip=True)
-                links[text] = href
-            return  links
+            # HTMLの解析はCPU負荷が高いため、イベントループを止めないようワーカーで行う
+            return await PARSE_EXECUTOR.run(parse_api_manual_outline, response.text)
         except httpx.RequestError as e:
             await ctx.error(f"http Request Error:{e}")
             return f"さくらのクラウドのAPIマニュアルへのリクエストに失敗しました: {e}"
@@ -48,33 +82,37 @@ class APIDocumentsHandler:
             return  f"APIドキュメント目次取得で予期しないエラーが発生しました。: {e}"
         
     # mainを抜き出して、htmlからmarkdownに変更する
-    def reformat_manual_page(self,html:str) -> str:
-        soup = BeautifulSoup(html, "html.parser")
-        main_html = soup.find(id="content")
-        if not main_html:
-            return None
-        main_markdown = convert_to_markdown(main_html)
-        return main_markdown
+    @staticmethod
+    def reformat_manual_page(html:str) -> str:
+        return api_manual_to_markdown(html)
     
-    async def read_api_manual(self,ctx:Context,url:str):
+    async def read_api_manual(self,ctx:Context,url:str,section:Optional[str]=None,page:Optional[int]=None):
         """
             指定したさくらのクラウドのAPIマニュアル(https://manual.sakura.ad.jp/cloud-api/~)のurlを受け取り、markdownに変換し、主要の内容を取得します。
+            長いページは目次と最初のページを返すため、section・pageで必要な部分を指定して取得してください。
             Args:
                 url (str): さくらのクラウドのAPIマニュアルのurl
+                section (str, optional): 取得するセクションのIdまたは見出し（目次のId、例: "2.1"）
+                page (int, optional): 取得するページ番号（1から始まる）
             Returns:
-                str: さくらのAPIクラウドのマニュアルの内容
+                str | dict: さくらのクラウドのAPIマニュアルの内容
+                    - ページ全体が長くなく、section・pageを指定しない場合は本文(str)
+                    - それ以外の場合は以下の辞書（長いページでsectionを指定しない場合は目次を含む）
+                        - Url (str): ページのurl
+                        - Section (str), Heading (str): 取得したセクションのIdと見出し（sectionを指定した場合）
+                        - Page (int), TotalPages (int): ページ番号と総ページ数
+                        - Content (str): 本文
+                        - TableOfContents (list): 目次（Id, Level, Heading, Chars）
         """
         if not url.startswith('https://manual.sakura.ad.jp/cloud-api/'):
             return 'さくらのクラウドのAPIマニュアルのurlではないので、有効なurlを指定してください'
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-            content = self.reformat_manual_page(response.text)
-            if not content:
+            # 取得・変換済みのページはキャッシュから返す（変換はワーカーで行う）
+            document = await get_manual_document(url, api_manual_to_markdown)
+            if not document:
                 await ctx.error(f"format failed")
                 return 'error:urlをフォーマットできなかった'
-            return content
+            return select_chunk(url, document["Markdown"], document["Chunks"], section, page)
         except httpx.RequestError as e:
             await ctx.error(f"HTTP Request Error:{e}")
             return f"さくらのクラウドのAPIマニュアルへのリクエストに失敗しました: {e}"
@@ -84,32 +122,109 @@ class APIDocumentsHandler:
         except Exception as e:
             await ctx.error(f"Unexpected error:{e}")
             return  f"さくらのクラウドのAPIマニュアルの内容取得で予期しないエラーが発生しました: {e}" 
+    async def find_api_endpoint(
+        self,
+        ctx: Context,
+        keyword: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+        method: Optional[str] = None,
+        limit: int = 10,
+        rebuild: bool = False,
+    ):
+        """
+        さくらのクラウドのAPIマニュアルから抽出したエンドポイントの一覧を、キーワード・パスの前方一致で検索します。
+        ページ全体を読み込まずに、APIのメソッド・パス・パラメータ・リクエストボディの例を確認できます。
+        詳細はread_api_manualにUrlとSectionを指定して取得してください。
+        Args:
+            keyword (str, optional): 検索する文字列（例: "サーバ 作成"）
+            path_prefix (str, optional): パスの前方一致（例: "/server"）
+            method (str, optional): HTTPメソッド（例: "POST"）
+            limit (int, optional): 返すエンドポイントの最大数（1-50、デフォルト: 10）
+            rebuild (bool, optional): APIマニュアルの各ページから一覧を作り直す（デフォルト: False）
+        Returns:
+            dict: 検索結果
+                - Count (int): 返したエンドポイントの数
+                - Endpoints (list): 一致したエンドポイントのリスト
+                    - Method (str), Path (str): メソッドとパスのテンプレート
+                    - Title (str): APIの名前
+                    - Summary (str): 説明
+                    - Parameters (list): パラメータ名
+                    - ExampleBody (str): リクエストボディの例（省略あり）
+                    - Page (str), Url (str), Section (str): ページのタイトル・url、セクションのId
+        """
+        if not 1 <= limit <= 50:
+            return "limitは1-50の範囲で指定してください"
+        try:
+            table = None if rebuild else load_endpoint_table()
+            if table is None:
+                # 一覧がないか古い場合は、目次の各ページから作り直す
+                outline = await self.get_api_manual_outline(ctx)
+                if not isinstance(outline, dict):
+                    return outline
+                table = await build_endpoint_table(outline)
+                for url, error in table["Errors"].items():
+                    await ctx.error(f"Failed to extract endpoints from {url}: {error}")
+            endpoints = search_endpoints(table["Endpoints"], keyword, path_prefix, method, limit)
+            return {"Count": len(endpoints), "Endpoints": endpoints}
+        except Exception as e:
+            await ctx.error(f"Unexpected error:{e}")
+            return f"さくらのクラウドのAPIマニュアルのエンドポイントの検索で予期しないエラーが発生しました: {e}"
+
     async def read_object_storage_api_manual(self,ctx:Context):
         """
-            指定したさくらのクラウドのオブジェクトストレージAPIマニュアル(https://manual.sakura.ad.jp/cloud-api/~)のurlを受け取り、markdownに変換し、主要の内容を取得します。
+            さくらのクラウドのオブジェクトストレージAPIマニュアル(https://manual.sakura.ad.jp/api/cloud/objectstorage/)の操作の一覧を取得します。
+            各操作の詳細はread_object_storage_api_operationで取得してください。
             Returns:
-                str: さくらのAPIクラウドのオブジェクトストレージのAPIマニュアルの内容
+                dict: オブジェクトストレージのAPIの操作の一覧
+                    - Title (str): APIの名前
+                    - Servers (list): APIのエンドポイントのURL
+                    - Operations (list): 操作の一覧（Method, Path, Summary, Tags）
         """
-        url = "https://manual.sakura.ad.jp/api/cloud/objectstorage/"
         try:
-            async with httpx.AsyncClient(timeout=10.0,) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            content = soup.find_all("div",class_="api-content")
-            if not content:
+            index = await get_object_storage_api_index()
+            if not index["Operations"]:
                 await ctx.error(f"Failed Get Http Contents")
                 return 'error:urlをフォーマットできなかった'
-            return content
+            return {
+                "Title": index["Title"],
+                "Servers": index["Servers"],
+                "Operations": operation_outline(index["Operations"]),
+            }
         except httpx.RequestError as e:
             await ctx.error(f"HTTP Request Error:{e}")
             return f"さくらのクラウドのオブジェクトストレージAPIマニュアルへのリクエストに失敗しました: {e}"
-        except httpx.RequestError as e:
+        except httpx.HTTPStatusError as e:
             await ctx.error(f"HTTP Status Error:{e.response.status_code} - {e.response.text}")
             return f"さくらのクラウドのオブジェクトストレージのAPIマニュアルからエラーが返されました: {e.response.status_code} - {e.response.text}"
         except Exception as e:
             await ctx.error(f"Unexpected error:{e}")
             return f"さくらのクラウドのオブジェクトストレージのAPIマニュアルの内容取得で予期しないエラーが発生しました: {e}"
 
-
+    async def read_object_storage_api_operation(self,ctx:Context,method:str,path:str):
+        """
+            さくらのクラウドのオブジェクトストレージAPIマニュアルから、指定した操作のパラメータ・リクエスト・レスポンスをmarkdownで取得します。
+            Args:
+                method (str): HTTPメソッド（例: "GET"）
+                path (str): read_object_storage_api_manualで取得した操作のパス（例: "/fed/v1/buckets/{name}"）
+            Returns:
+                str: 操作の内容(markdown)
+        """
+        try:
+            index = await get_object_storage_api_index()
+            operation = find_operation(index["Operations"], method, path)
+            if not operation:
+                candidates = [key for key, candidate in index["Operations"].items() if candidate["Path"] == path]
+                return (
+                    f"操作「{method.upper()} {path}」が見つかりません。"
+                    f"read_object_storage_api_manualで取得した操作を指定してください: {candidates}"
+                )
+            return operation_markdown(operation)
+        except httpx.RequestError as e:
+            await ctx.error(f"HTTP Request Error:{e}")
+            return f"さくらのクラウドのオブジェクトストレージAPIマニュアルへのリクエストに失敗しました: {e}"
+        except httpx.HTTPStatusError as e:
+            await ctx.error(f"HTTP Status Error:{e.response.status_code} - {e.response.text}")
+            return f"さくらのクラウドのオブジェクトストレージのAPIマニュアルからエラーが返されました: {e.response.status_code} - {e.response.text}"
+        except Exception as e:
+            await ctx.error(f"Unexpected error:{e}")
+            return f"さくらのクラウドのオブジェクトストレージのAPIマニュアルの内容取得で予期しないエラーが発生しました: {e}"
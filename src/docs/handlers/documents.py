@@ -1,9 +1,14 @@
-from bs4 import BeautifulSoup
 import asyncio
 from mcp.server.fastmcp import Context
 import httpx
-from html_to_markdown import convert_to_markdown
-import json
+from typing import Optional
+
+from docs.converter import manual_to_markdown
+from docs.manual import get_manual_document
+from docs.outline import load_manual_outline
+from docs.price import get_price_catalog
+from docs.search import MANUAL_SOURCES, get_search_index
+from docs.sections import select_chunk
 
 class DocumentsHandler:
     """ドキュメントのMCPサーバハンドラ"""
@@ -11,20 +16,27 @@ class DocumentsHandler:
         self,
         mcp,
     ):
-        self.manual_outlines = None
+        # 同梱した目次は一度だけ読み込み、検索用に展開しておく
+        self.manual_outlines = load_manual_outline()
         self.mcp = mcp
 
         # MCPサーバのツール登録
         self.mcp.tool(name='get_manual_outline')(self.get_manual_outline)
+        self.mcp.tool(name='lookup_manual_outline')(self.lookup_manual_outline)
         self.mcp.tool(name='read_manual')(self.read_manual)
+        self.mcp.tool(name='search_manual')(self.search_manual)
         self.mcp.tool(name='get_price')(self.get_price)
+        self.mcp.tool(name='lookup_price')(self.lookup_price)
 
     # さくらのマニュアルのサイドバーのリンクを取得し、再帰的にアクセス
             
 
-    async def get_manual_outline(self,ctx: Context):
+    async def get_manual_outline(self,ctx: Context,depth:Optional[int]=None):
         """
         さくらのクラウドの使い方のマニュアルの目次を項目名と対応するurlを辞書型で返します。
+        目次全体は大きいため、特定の項目を探す場合はlookup_manual_outlineを使ってください。
+        Args:
+            depth (int, optional): 返す目次の階層数（省略時はすべての階層）
         Returns:
             dict:  さくらのクラウドのマニュアルの目次
                 - 目次名(dict):
@@ -33,42 +45,75 @@ class DocumentsHandler:
                         - url
                         ....     
         """
+        if depth is not None and depth < 1:
+            return "depthは1以上を指定してください"
         try:
-            with open("./docs/materials/outline.json") as f:
-                contents = json.load(f)
-            return contents
+            return self.manual_outlines.outline(depth)
         except Exception as e:
-            ctx.error(f"can't open file: {e}")
-            return f"ファイルが開けませんでした。: {e}"
+            await ctx.error(f"Unexpected error:{e}")
+            return f"マニュアルの目次の取得で予期しないエラーが発生しました: {e}"
+
+    async def lookup_manual_outline(self,ctx: Context,keyword:str,limit:int=10,depth:int=1):
+        """
+        さくらのクラウドの使い方のマニュアルの目次から、項目名にキーワードを含む項目をその配下の項目とともに返します。
+        Args:
+            keyword (str): 項目名に含まれる文字列（空白で区切った場合はすべてを含む項目、例: "サーバ 作成"）
+            limit (int, optional): 返す項目の最大数（1-50、デフォルト: 10）
+            depth (int, optional): 返す配下の項目の階層数（0-10、デフォルト: 1）
+        Returns:
+            dict: 検索結果
+                - Count (int): 返した項目の数
+                - Items (list): 一致した項目のリスト
+                    - Title (str): 項目名
+                    - Url (str): マニュアルのurl（read_manualで内容を取得できる）
+                    - Path (list): 上位の項目名
+                    - Children (dict): 配下の項目（get_manual_outlineと同じ形式）
+        """
+        if not keyword.strip():
+            return "keywordを指定してください"
+        if not 1 <= limit <= 50:
+            return "limitは1-50の範囲で指定してください"
+        if not 0 <= depth <= 10:
+            return "depthは0-10の範囲で指定してください"
+        try:
+            items = self.manual_outlines.lookup(keyword, limit, depth)
+            return {"Count": len(items), "Items": items}
+        except Exception as e:
+            await ctx.error(f"Unexpected error:{e}")
+            return f"マニュアルの目次の検索で予期しないエラーが発生しました: {e}"
         
     # mainを抜き出して、htmlからmarkdownに変更する
-    def reformat_manual_page(self,html:str) -> str:
-        soup = BeautifulSoup(html, "html.parser")
-        main_html =  soup.find(attrs={'role': 'main'})
-        if not main_html:
-            return None
-        main_markdown = convert_to_markdown(main_html)
-        return main_markdown
+    @staticmethod
+    def reformat_manual_page(html:str) -> str:
+        return manual_to_markdown(html)
     
-    async def read_manual(self,ctx:Context,url:str):
+    async def read_manual(self,ctx:Context,url:str,section:Optional[str]=None,page:Optional[int]=None):
         """
             指定したさくらのクラウドのマニュアル(https://manual.sakura.ad.jp/cloud/~)のurlを受け取り、markdownに変換し、主要の内容を取得します。
+            長いページは目次と最初のページを返すため、section・pageで必要な部分を指定して取得してください。
             Args:
                 url (str): さくらのクラウドのマニュアルのurl
+                section (str, optional): 取得するセクションのIdまたは見出し（目次のId、例: "2.1"）
+                page (int, optional): 取得するページ番号（1から始まる）
             Returns:
-                str: さくらのクラウドのマニュアルの内容
+                str | dict: さくらのクラウドのマニュアルの内容
+                    - ページ全体が長くなく、section・pageを指定しない場合は本文(str)
+                    - それ以外の場合は以下の辞書（長いページでsectionを指定しない場合は目次を含む）
+                        - Url (str): ページのurl
+                        - Section (str), Heading (str): 取得したセクションのIdと見出し（sectionを指定した場合）
+                        - Page (int), TotalPages (int): ページ番号と総ページ数
+                        - Content (str): 本文
+                        - TableOfContents (list): 目次（Id, Level, Heading, Chars）
         """
         if not url.startswith('https://manual.sakura.ad.jp/cloud/'):
             return 'さくらのクラウドのマニュアルのurlではないので、有効なurlを指定してください'
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-            content = self.reformat_manual_page(response.text)
-            if not content:
+            # 取得・変換済みのページはキャッシュから返す（変換はワーカーで行う）
+            document = await get_manual_document(url, manual_to_markdown)
+            if not document:
                 await ctx.error(f"Failed Get Http Contents")
                 return 'error:urlをフォーマットできなかった'
-            return content
+            return select_chunk(url, document["Markdown"], document["Chunks"], section, page)
         except httpx.RequestError as e:
             await ctx.error(f"HTTP Request Error:{e}")
             return f"さくらのクラウドのマニュアルへのリクエストに失敗しました: {e}"
@@ -78,6 +123,49 @@ class DocumentsHandler:
         except Exception as e:
             await ctx.error(f"Unexpected error:{e}")
             return  f"さくらのクラウドのマニュアルの内容取得で予期しないエラーが発生しました: {e}" 
+    async def search_manual(
+        self,
+        ctx: Context,
+        query: str,
+        source: Optional[str] = None,
+        limit: int = 10,
+        rebuild: bool = False,
+    ):
+        """
+        さくらのクラウドのマニュアル・APIマニュアルを全文検索し、一致したセクションを関連度の高い順に返します。
+        マニュアルのスナップショットと読み込み済み（キャッシュ済み）のページが検索対象となり、ネットワークにはアクセスしません。
+        Args:
+            query (str): 検索する文字列（例: "サーバ プラン変更"）
+            source (str, optional): 検索対象のマニュアル（"cloud" または "api"、省略時は両方）
+            limit (int, optional): 返すセクションの最大数（1-50、デフォルト: 10）
+            rebuild (bool, optional): スナップショットとキャッシュ済みのページから索引を作り直す（デフォルト: False）
+                読み込んだページは一定の件数・時間ごとにまとめて索引に反映するため、直後に検索する場合は指定してください
+        Returns:
+            dict: 検索結果
+                - Count (int): 返したセクションの数
+                - Sections (list): 一致したセクションのリスト
+                    - Url (str): ページのurl（read_manual・read_api_manualで全文を取得できる）
+                    - Title (str): ページのタイトル
+                    - Heading (str): セクションの見出し
+                    - Score (float): 関連度（BM25）
+                    - Snippet (str): 一致した箇所付近の本文
+        """
+        if not query.strip():
+            return "queryを指定してください"
+        if source and source not in MANUAL_SOURCES:
+            return f"sourceは{' または '.join(MANUAL_SOURCES)} を指定してください"
+        if not 1 <= limit <= 50:
+            return "limitは1-50の範囲で指定してください"
+        try:
+            index = await get_search_index(rebuild)
+            if not len(index):
+                return "検索対象のページがありません。read_manual・read_api_manualでページを読み込んでから検索してください"
+            sections = index.search(query, limit, source)
+            return {"Count": len(sections), "Sections": sections}
+        except Exception as e:
+            await ctx.error(f"Unexpected error:{e}")
+            return f"さくらのクラウドのマニュアルの検索で予期しないエラーが発生しました: {e}"
+
     async def get_price(self,ctx:Context):
         """
         さくらのクラウドの利用料金を取得します。
@@ -100,14 +188,55 @@ class DocumentsHandler:
                         - ServiceClassPath (str): サービスクラスのパス
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0,headers={'X-Requested-With': 'XMLHttpRequest'}) as client:
-                response = await client.get("https://secure.sakura.ad.jp/cloud/zone/is1a/api/cloud/1.1/public/price.json")
-                response.raise_for_status()
-            content = response.text
-            if not content:
+            # 解析済みの料金表をキャッシュから返す
+            catalog = await get_price_catalog()
+            if not catalog.raw:
                 await ctx.error(f"Failed Get Http Contents")
                 return "さくらのクラウドの利用料金取得に失敗しました"
-            return content
+            return catalog.raw
+        except httpx.RequestError as e:
+            await ctx.error(f"HTTP Request Error:{e}")
+            return f"さくらのクラウドAPIへのリクエストに失敗しました: {e}"
+        except httpx.HTTPStatusError as e:
+            await ctx.error(f"HTTP Status Error: {e.response.status_code} - {e.response.text}")
+            return f"さくらのクラウドAPIからエラーが返されました: {e.response.status_code} - {e.response.text}"
+        except Exception as e:
+            await ctx.error(f"Unexpected error:{e}")
+            return  f"さくらのクラウドAPIの内容取得で予期しないエラーが発生しました: {e}"
+
+    async def lookup_price(
+        self,
+        ctx: Context,
+        keyword: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+        service_class_name: Optional[str] = None,
+        zone: Optional[str] = None,
+        limit: int = 20,
+    ):
+        """
+        さくらのクラウドの利用料金から、条件に一致するサービスクラスのみを検索します。
+        料金表全体を返すget_priceより出力が小さいため、特定のプランの料金を調べる場合はこちらを使用してください。
+        Args:
+            keyword (str, optional): 表示名・サービスクラス名・パスに含まれる文字列（空白区切りで複数指定するとすべてを含むもの）
+            path_prefix (str, optional): ServiceClassPathの前方一致（例: "cloud/plan/"）
+            service_class_name (str, optional): ServiceClassNameまたは表示名の完全一致
+            zone (str, optional): ゾーン名（料金もそのゾーンのもののみに絞り込む）
+            limit (int, optional): 返すサービスクラスの最大数（1-200、デフォルト: 20）
+        Returns:
+            dict: 検索結果
+                - Count (int): 条件に一致したサービスクラスの総数
+                - ServiceClasses (list): 一致したサービスクラスのリスト（最大limit件）
+                    - ServiceClassID, ServiceClassName, ServiceClassPath, DisplayName, ServiceCharge, IsPublic
+                    - Price (list): ゾーンごとの料金（Zone, Hourly, Daily, Monthly など）
+        """
+        if not (keyword or path_prefix or service_class_name or zone):
+            return "keyword, path_prefix, service_class_name, zone のいずれかを指定してください"
+        if not 1 <= limit <= 200:
+            return "limitは1-200の範囲で指定してください"
+        try:
+            catalog = await get_price_catalog()
+            matches = catalog.lookup(keyword, path_prefix, service_class_name, zone)
+            return {"Count": len(matches), "ServiceClasses": matches[:limit]}
         except httpx.RequestError as e:
             await ctx.error(f"HTTP Request Error:{e}")
             return f"さくらのクラウドAPIへのリクエストに失敗しました: {e}"
@@ -116,4 +245,4 @@ class DocumentsHandler:
             return f"さくらのクラウドAPIからエラーが返されました: {e.response.status_code} - {e.response.text}"
         except Exception as e:
             await ctx.error(f"Unexpected error:{e}")
-            return  f"さくらのクラウドAPIの内容取得で予期しないエラーが発生しました: {e}"
\ No newline at end of file
+            return  f"さくらのクラウドAPIの内容取得で予期しないエラーが発生しました: {e}"
@@ -0,0 +1,161 @@
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from core.cache import DiskCache
+from core.executor import PARSE_EXECUTOR
+from docs.sections import build_chunks
+from docs.snapshot import current_snapshot, is_offline
+
+# マニュアルのページは、取得元のURLをキーとしてHTMLと変換後のmarkdownを永続キャッシュに保存する
+MANUAL_CACHE = DiskCache("manual")
+
+# キャッシュしたページを取得元に再検証するまでの期間（秒）
+DEFAULT_MANUAL_MAX_AGE_SECONDS = 24 * 60 * 60
+
+# キャッシュに新しい内容のページを保存した回数（検索用の索引が古くなったかどうかの判定に使う）
+_CACHE_GENERATION = 0
+
+
+def get_manual_cache_generation() -> int:
+    """キャッシュに新しい内容のページを保存した回数を返す"""
+    return _CACHE_GENERATION
+
+
+def mark_manual_cache_updated() -> None:
+    """キャッシュに新しい内容のページを保存したことを記録する"""
+    global _CACHE_GENERATION
+    _CACHE_GENERATION += 1
+
+
+def get_manual_max_age() -> float:
+    """キャッシュしたページを再検証するまでの期間（秒）を返す
+
+    環境変数 SACLOUD_MCP_MANUAL_MAX_AGE が設定されていればその値、なければ1日とする。
+    """
+    value = os.getenv("SACLOUD_MCP_MANUAL_MAX_AGE")
+    try:
+        return float(value) if value else DEFAULT_MANUAL_MAX_AGE_SECONDS
+    except ValueError:
+        return DEFAULT_MANUAL_MAX_AGE_SECONDS
+
+
+async def request_manual_page(url: str, headers: Dict[str, str]) -> httpx.Response:
+    """マニュアルのページを取得する（304以外のHTTPのエラーは呼び出し元で処理する）"""
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        response = await client.get(url, headers=headers)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+
+async def get_manual_page(url: str, reformat: Callable[[str], Optional[str]]) -> Optional[str]:
+    """マニュアルのページをmarkdownに変換して返す（取得・キャッシュの方法は get_manual_document() を参照）
+
+    Returns:
+        Optional[str]: markdownに変換したページの内容（変換できない場合はNone）
+    """
+    document = await get_manual_document(url, reformat)
+    return document["Markdown"] if document else None
+
+
+async def get_manual_document(
+    url: str, reformat: Callable[[str], Optional[str]]
+) -> Optional[Dict[str, Any]]:
+    """マニュアルのページをmarkdownに変換し、セクション・ページの区切りとともに返す
+
+    キャッシュしてから一定期間内のページは取得元にアクセスせずに返す。
+    期間を過ぎたページはETag・Last-Modifiedで条件付きリクエストを行い、
+    更新されていなければキャッシュしたmarkdownをそのまま返す。
+    取得元にアクセスできない場合は、期間を過ぎていてもキャッシュしたmarkdown、
+    またはスナップショットのmarkdownを返す。
+    オフラインモードでは取得元にアクセスせず、スナップショットまたはキャッシュから返す。
+    セクション・ページの区切りはmarkdownとともにキャッシュに保存する。
+
+    Args:
+        url: マニュアルのページのURL
+        reformat: HTMLをmarkdownに変換する関数（変換できない場合はNoneを返す。
+            プロセスで解析する設定の場合はpickleできるモジュールレベルの関数を渡す）
+
+    Returns:
+        Optional[Dict[str, Any]]: ページの内容（変換できない場合はNone）
+            - Markdown: markdownに変換したページの内容
+            - Chunks: セクション・ページの区切り（build_chunks() の結果）
+    """
+    entry = MANUAL_CACHE.get(url)
+    if is_offline():
+        markdown = snapshot_page(url)
+        if markdown:
+            return {"Markdown": markdown, "Chunks": build_chunks(markdown)}
+        if entry:
+            return cached_document(url, entry)
+        raise httpx.RequestError(
+            f"オフラインモードのため、スナップショットにないページは取得できません: {url}"
+        )
+
+    if entry and time.time() - entry["FetchedAt"] < get_manual_max_age():
+        return cached_document(url, entry)
+
+    headers = {}
+    if entry and entry.get("ETag"):
+        headers["If-None-Match"] = entry["ETag"]
+    if entry and entry.get("LastModified"):
+        headers["If-Modified-Since"] = entry["LastModified"]
+
+    try:
+        response = await request_manual_page(url, headers)
+    except httpx.RequestError:
+        if entry:
+            return cached_document(url, entry)
+        markdown = snapshot_page(url)
+        if markdown:
+            return {"Markdown": markdown, "Chunks": build_chunks(markdown)}
+        raise
+
+    if response.status_code == 304 and entry:
+        entry = {**entry, "FetchedAt": time.time()}
+        MANUAL_CACHE.set(url, entry)
+        return cached_document(url, entry)
+
+    # HTMLの解析はCPU負荷が高いため、イベントループを止めないようワーカーで行う
+    document = await PARSE_EXECUTOR.run(convert_page, reformat, response.text)
+    if document:
+        MANUAL_CACHE.set(url, manual_entry(response, document))
+        mark_manual_cache_updated()
+    return document
+
+
+def convert_page(reformat: Callable[[str], Optional[str]], html: str) -> Optional[Dict[str, Any]]:
+    """HTMLをmarkdownに変換し、セクション・ページの区切りを計算する（ワーカーで実行する）"""
+    markdown = reformat(html)
+    if not markdown:
+        return None
+    return {"Markdown": markdown, "Chunks": build_chunks(markdown)}
+
+
+def cached_document(url: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """キャッシュしたページの内容を返す（区切りを保存していない場合は計算して保存する）"""
+    if not entry.get("Chunks"):
+        entry = {**entry, "Chunks": build_chunks(entry["Markdown"])}
+        MANUAL_CACHE.set(url, entry)
+    return {"Markdown": entry["Markdown"], "Chunks": entry["Chunks"]}
+
+
+def snapshot_page(url: str) -> Optional[str]:
+    """現在のスナップショットからページのmarkdownを返す（スナップショットにない場合はNone）"""
+    snapshot = current_snapshot()
+    return snapshot.read(url) if snapshot else None
+
+
+def manual_entry(response: httpx.Response, document: Dict[str, Any]) -> Dict[str, Any]:
+    """キャッシュに保存するページの情報を作成する"""
+    return {
+        "Html": response.text,
+        "Markdown": document["Markdown"],
+        "Chunks": document["Chunks"],
+        "ETag": response.headers.get("ETag"),
+        "LastModified": response.headers.get("Last-Modified"),
+        "FetchedAt": time.time(),
+    }
@@ -0,0 +1,329 @@
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from bs4 import BeautifulSoup
+from html_to_markdown import convert_to_markdown
+
+from core.cache import DiskCache
+from core.executor import PARSE_EXECUTOR
+from docs import manual
+from docs.converter import HTML_PARSER
+from docs.snapshot import is_offline
+
+OBJECT_STORAGE_API_URL = "https://manual.sakura.ad.jp/api/cloud/objectstorage/"
+
+# 操作ごとに解析したAPIマニュアルを、取得元のURLをキーとして永続キャッシュに保存する
+OBJECT_STORAGE_API_CACHE = DiskCache("objectstorage_api")
+
+# 解析結果の形式を変更した場合は上げる（古い形式のキャッシュは使わない）
+OBJECT_STORAGE_API_INDEX_VERSION = 1
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# ReDocで生成したページは、OpenAPIの定義を __redoc_state に埋め込んでいる
+REDOC_STATE_PATTERN = re.compile(r"__redoc_state\s*=\s*")
+
+# スキーマの参照を展開する深さの上限（再帰的なスキーマで無限に展開しないため）
+MAX_SCHEMA_DEPTH = 6
+
+
+def operation_key(method: str, path: str) -> str:
+    """操作のキー（例: "GET /fed/v1/buckets/{name}"）を返す"""
+    return f"{method.upper()} {path}"
+
+
+def redoc_spec(html: str) -> Optional[Dict[str, Any]]:
+    """ReDocのページに埋め込まれたOpenAPIの定義を取り出す（埋め込まれていない場合はNone）"""
+    match = REDOC_STATE_PATTERN.search(html)
+    if not match:
+        return None
+    try:
+        state, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except json.JSONDecodeError:
+        return None
+    spec = state.get("spec", {}).get("data") if isinstance(state, dict) else None
+    return spec if isinstance(spec, dict) and spec.get("paths") else None
+
+
+def resolve_ref(spec: Dict[str, Any], value: Any) -> Any:
+    """ "$ref" の参照先を返す（参照でない場合はそのまま返す）"""
+    seen = set()
+    while isinstance(value, dict) and "$ref" in value and value["$ref"] not in seen:
+        ref = value["$ref"]
+        seen.add(ref)
+        if not ref.startswith("#/"):
+            return value
+        target: Any = spec
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(target, dict) or part not in target:
+                return value
+            target = target[part]
+        value = target
+    return value
+
+
+def schema_summary(spec: Dict[str, Any], schema: Any, depth: int = 0) -> Any:
+    """スキーマを、プロパティ名と型だけの簡潔な形に変換する
+
+    オブジェクトはプロパティ名から型への辞書、配列は要素の型を1つ含むリスト、それ以外は型名の文字列とする。
+    """
+    schema = resolve_ref(spec, schema)
+    if not isinstance(schema, dict):
+        return "any"
+    if depth >= MAX_SCHEMA_DEPTH:
+        return schema.get("type", "object")
+
+    for combinator in ("allOf", "oneOf", "anyOf"):
+        if combinator in schema:
+            parts = [schema_summary(spec, part, depth + 1) for part in schema[combinator]]
+            if combinator == "allOf" and all(isinstance(part, dict) for part in parts):
+                merged: Dict[str, Any] = {}
+                for part in parts:
+                    merged.update(part)
+                return merged
+            return {combinator: parts}
+
+    if schema.get("type") == "array" or "items" in schema:
+        return [schema_summary(spec, schema.get("items", {}), depth + 1)]
+    if schema.get("type") == "object" or "properties" in schema:
+        required = set(schema.get("required", []))
+        return {
+            name + ("" if name in required else "?"): schema_summary(spec, prop, depth + 1)
+            for name, prop in schema.get("properties", {}).items()
+        } or "object"
+
+    summary = schema.get("type", "any")
+    if schema.get("format"):
+        summary += f"({schema['format']})"
+    if schema.get("enum"):
+        summary += " [" + ", ".join(str(value) for value in schema["enum"]) + "]"
+    return summary
+
+
+def content_schema(spec: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """リクエスト・レスポンスの content から、メディアタイプとスキーマを取り出す（JSONを優先する）"""
+    if not content:
+        return {}
+    media_type = "application/json" if "application/json" in content else next(iter(content))
+    return {
+        "ContentType": media_type,
+        "Schema": schema_summary(spec, content[media_type].get("schema", {})),
+    }
+
+
+def spec_operations(spec: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """OpenAPIの定義から、操作ごとのパラメータ・リクエスト・レスポンスを取り出す"""
+    operations: Dict[str, Dict[str, Any]] = {}
+    for path, item in spec.get("paths", {}).items():
+        item = resolve_ref(spec, item)
+        common_parameters = item.get("parameters", [])
+        for method in HTTP_METHODS:
+            operation = item.get(method)
+            if not isinstance(operation, dict):
+                continue
+
+            parameters = []
+            for parameter in common_parameters + operation.get("parameters", []):
+                parameter = resolve_ref(spec, parameter)
+                parameters.append(
+                    {
+                        "Name": parameter.get("name", ""),
+                        "In": parameter.get("in", ""),
+                        "Required": bool(parameter.get("required")),
+                        "Type": schema_summary(spec, parameter.get("schema", {})),
+                        "Description": parameter.get("description", ""),
+                    }
+                )
+
+            request_body = resolve_ref(spec, operation.get("requestBody", {}))
+            responses = []
+            for status, response in operation.get("responses", {}).items():
+                response = resolve_ref(spec, response)
+                responses.append(
+                    {
+                        "Status": str(status),
+                        "Description": response.get("description", ""),
+                        **content_schema(spec, response.get("content", {})),
+                    }
+                )
+
+            operations[operation_key(method, path)] = {
+                "Method": method.upper(),
+                "Path": path,
+                "Summary": operation.get("summary", ""),
+                "Description": operation.get("description", ""),
+                "Tags": operation.get("tags", []),
+                "Parameters": parameters,
+                "RequestBody": content_schema(spec, request_body.get("content", {})),
+                "Responses": responses,
+            }
+    return operations
+
+
+def html_operations(html: str) -> Dict[str, Dict[str, Any]]:
+    """定義が埋め込まれていないページは、表示されたHTMLの操作ごとの要素から取り出す"""
+    operations: Dict[str, Dict[str, Any]] = {}
+    soup = BeautifulSoup(html, HTML_PARSER)
+    for section in soup.find_all(attrs={"data-section-id": re.compile(r"operation/")}):
+        verb = section.find("span", class_="http-verb")
+        path = verb.find_next_sibling("span") if verb else None
+        if not verb or not path:
+            continue
+        heading = section.find("h2")
+        method, path_text = verb.get_text(strip=True).upper(), path.get_text(strip=True)
+        operations[operation_key(method, path_text)] = {
+            "Method": method,
+            "Path": path_text,
+            "Summary": heading.get_text(strip=True) if heading else "",
+            "Description": convert_to_markdown(section).strip(),
+            "Tags": [],
+            "Parameters": [],
+            "RequestBody": {},
+            "Responses": [],
+        }
+    return operations
+
+
+def parse_object_storage_api(html: str) -> Dict[str, Any]:
+    """オブジェクトストレージのAPIマニュアルのページを、操作ごとに解析する（ワーカーで実行する）
+
+    Returns:
+        Dict[str, Any]: 解析結果
+            - Title: APIの名前
+            - Servers: APIのエンドポイントのURL
+            - Operations: 操作のキー（メソッドとパス）から操作の内容への辞書
+    """
+    spec = redoc_spec(html)
+    if spec is None:
+        return {"Title": "", "Servers": [], "Operations": html_operations(html)}
+    return {
+        "Title": spec.get("info", {}).get("title", ""),
+        "Servers": [server.get("url", "") for server in spec.get("servers", [])],
+        "Operations": spec_operations(spec),
+    }
+
+
+async def get_object_storage_api_index(url: str = OBJECT_STORAGE_API_URL) -> Dict[str, Any]:
+    """解析済みのオブジェクトストレージのAPIマニュアルを返す
+
+    マニュアルのページと同じく、一定期間内はキャッシュから返し、期間を過ぎたら条件付きリクエストで再検証する。
+    取得元にアクセスできない場合、オフラインモードの場合は、期間を過ぎていてもキャッシュから返す。
+    """
+    entry = OBJECT_STORAGE_API_CACHE.get(url)
+    if entry and entry.get("Version") != OBJECT_STORAGE_API_INDEX_VERSION:
+        entry = None
+    if entry and (is_offline() or time.time() - entry["FetchedAt"] < manual.get_manual_max_age()):
+        return entry["Index"]
+    if is_offline():
+        raise httpx.RequestError(
+            f"オフラインモードのため、キャッシュにないページは取得できません: {url}"
+        )
+
+    headers = {}
+    if entry and entry.get("ETag"):
+        headers["If-None-Match"] = entry["ETag"]
+    if entry and entry.get("LastModified"):
+        headers["If-Modified-Since"] = entry["LastModified"]
+
+    try:
+        response = await manual.request_manual_page(url, headers)
+    except httpx.RequestError:
+        if entry:
+            return entry["Index"]
+        raise
+
+    if response.status_code == 304 and entry:
+        OBJECT_STORAGE_API_CACHE.set(url, {**entry, "FetchedAt": time.time()})
+        return entry["Index"]
+
+    # HTMLの解析はCPU負荷が高いため、イベントループを止めないようワーカーで行う
+    index = await PARSE_EXECUTOR.run(parse_object_storage_api, response.text)
+    if index["Operations"]:
+        OBJECT_STORAGE_API_CACHE.set(
+            url,
+            {
+                "Version": OBJECT_STORAGE_API_INDEX_VERSION,
+                "Index": index,
+                "ETag": response.headers.get("ETag"),
+                "LastModified": response.headers.get("Last-Modified"),
+                "FetchedAt": time.time(),
+            },
+        )
+    return index
+
+
+def find_operation(
+    operations: Dict[str, Dict[str, Any]], method: str, path: str
+) -> Optional[Dict[str, Any]]:
+    """メソッドとパスが一致する操作を返す（パスの末尾の "/" の有無は区別しない）"""
+    operation = operations.get(operation_key(method, path))
+    if operation:
+        return operation
+    normalized = path.rstrip("/")
+    for candidate in operations.values():
+        if candidate["Method"] == method.upper() and candidate["Path"].rstrip("/") == normalized:
+            return candidate
+    return None
+
+
+def operation_outline(operations: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """操作の一覧（メソッド、パス、概要、タグ）を返す"""
+    return [
+        {
+            "Method": operation["Method"],
+            "Path": operation["Path"],
+            "Summary": operation["Summary"],
+            "Tags": operation["Tags"],
+        }
+        for operation in operations.values()
+    ]
+
+
+def schema_block(schema: Any) -> str:
+    """スキーマをmarkdownのコードブロックにする"""
+    return "```json\n" + json.dumps(schema, ensure_ascii=False, indent=2) + "\n```"
+
+
+def operation_markdown(operation: Dict[str, Any]) -> str:
+    """1つの操作の内容をmarkdownにする"""
+    lines = [f"## {operation['Method']} {operation['Path']}", ""]
+    if operation["Summary"]:
+        lines += [operation["Summary"], ""]
+    if operation["Description"]:
+        lines += [operation["Description"], ""]
+
+    if operation["Parameters"]:
+        lines += [
+            "### パラメータ",
+            "",
+            "| 名前 | 場所 | 型 | 必須 | 説明 |",
+            "| --- | --- | --- | --- | --- |",
+        ]
+        for parameter in operation["Parameters"]:
+            description = " ".join(parameter["Description"].split())
+            type_ = (
+                parameter["Type"]
+                if isinstance(parameter["Type"], str)
+                else json.dumps(parameter["Type"])
+            )
+            required = "○" if parameter["Required"] else ""
+            lines.append(
+                f"| {parameter['Name']} | {parameter['In']} | {type_} | {required} | {description} |"
+            )
+        lines.append("")
+
+    if operation["RequestBody"]:
+        lines += [f"### リクエストボディ（{operation['RequestBody']['ContentType']}）", ""]
+        lines += [schema_block(operation["RequestBody"]["Schema"]), ""]
+
+    if operation["Responses"]:
+        lines += ["### レスポンス", ""]
+        for response in operation["Responses"]:
+            lines += [f"#### {response['Status']} {response['Description']}".rstrip(), ""]
+            if "Schema" in response:
+                lines += [schema_block(response["Schema"]), ""]
+    return "\n".join(lines).rstrip() + "\n"
@@ -0,0 +1,150 @@
+import bisect
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from docs.search import normalize_text
+
+# パッケージに同梱したマニュアルの目次（起動時のカレントディレクトリによらず読み込む）
+OUTLINE_PATH = Path(__file__).parent / "materials" / "outline.json"
+
+
+class ManualOutline:
+    """マニュアルの目次を検索しやすい形に展開したもの
+
+    目次の入れ子の構造を、行きがけ順の項目の配列（部分木は項目の位置から End までの範囲）に展開し、
+    項目名のすべての接尾辞を並べた配列（接尾辞配列）を前方一致の索引とする。
+    接尾辞の前方一致で探すため、項目名の途中に含まれる文字列も見つけられる。
+    """
+
+    def __init__(self, tree: Dict[str, Any]):
+        """目次の展開
+
+        Args:
+            tree: 目次（項目名: [url, {子の項目}] の入れ子の辞書）
+        """
+        self.tree = tree
+        self.titles: List[str] = []
+        self.urls: List[str] = []
+        self.parents: List[int] = []
+        self.ends: List[int] = []
+
+        def walk(items: Dict[str, Any], parent: int) -> None:
+            for title, (url, children) in items.items():
+                index = len(self.titles)
+                self.titles.append(title)
+                self.urls.append(url)
+                self.parents.append(parent)
+                self.ends.append(index + 1)
+                walk(children, index)
+                self.ends[index] = len(self.titles)
+
+        walk(tree, -1)
+
+        suffixes: List[Tuple[str, int]] = []
+        for index, title in enumerate(self.titles):
+            normalized = normalize_text(title)
+            suffixes.extend((normalized[start:], index) for start in range(len(normalized)))
+        suffixes.sort()
+        self.suffixes = [suffix for suffix, _ in suffixes]
+        self.suffix_items = [index for _, index in suffixes]
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @classmethod
+    def load(cls, path: Path = OUTLINE_PATH) -> "ManualOutline":
+        """目次のファイルを読み込む"""
+        with open(path, encoding="utf-8") as file:
+            return cls(json.load(file))
+
+    def find(self, text: str) -> List[int]:
+        """項目名に文字列を含む項目の位置を、目次の順に返す"""
+        key = normalize_text(text)
+        start = bisect.bisect_left(self.suffixes, key)
+        found = set()
+        for position in range(start, len(self.suffixes)):
+            if not self.suffixes[position].startswith(key):
+                break
+            found.add(self.suffix_items[position])
+        return sorted(found)
+
+    def subtree(self, index: int, depth: Optional[int] = None) -> Dict[str, Any]:
+        """項目の子を、元の目次と同じ形式で返す（depthを指定した場合はその階層まで）"""
+        children: Dict[str, Any] = {}
+        if depth is not None and depth <= 0:
+            return children
+        child = index + 1
+        while child < self.ends[index]:
+            children[self.titles[child]] = [
+                self.urls[child],
+                self.subtree(child, None if depth is None else depth - 1),
+            ]
+            child = self.ends[child]
+        return children
+
+    def outline(self, depth: Optional[int] = None) -> Dict[str, Any]:
+        """目次全体を返す（depthを指定した場合はその階層まで）"""
+        if depth is None:
+            return self.tree
+        outline: Dict[str, Any] = {}
+        index = 0
+        while index < len(self.titles):
+            outline[self.titles[index]] = [self.urls[index], self.subtree(index, depth - 1)]
+            index = self.ends[index]
+        return outline
+
+    def path(self, index: int) -> List[str]:
+        """項目までの上位の項目名を、最上位から順に返す"""
+        titles = []
+        parent = self.parents[index]
+        while parent >= 0:
+            titles.append(self.titles[parent])
+            parent = self.parents[parent]
+        return titles[::-1]
+
+    def lookup(
+        self, keyword: str, limit: int = 10, depth: Optional[int] = 1
+    ) -> List[Dict[str, Any]]:
+        """項目名にキーワードを含む項目を、その部分木とともに返す
+
+        キーワードを空白で区切った場合は、すべてを含む項目を返す。
+        上位の項目が一致した場合、その部分木に含まれる項目は個別には返さない。
+
+        Returns:
+            List[Dict[str, Any]]: 一致した項目のリスト
+                - Title (str), Url (str): 項目名とurl
+                - Path (list): 上位の項目名
+                - Children (dict): 子の項目（元の目次と同じ形式）
+        """
+        words = keyword.split()
+        if not words:
+            return []
+        matches = set(self.find(words[0]))
+        for word in words[1:]:
+            matches &= set(self.find(word))
+
+        results = []
+        covered_until = -1
+        for index in sorted(matches):
+            if index < covered_until:
+                continue
+            covered_until = self.ends[index]
+            results.append(
+                {
+                    "Title": self.titles[index],
+                    "Url": self.urls[index],
+                    "Path": self.path(index),
+                    "Children": self.subtree(index, depth),
+                }
+            )
+            if len(results) >= limit:
+                break
+        return results
+
+
+@lru_cache(maxsize=1)
+def load_manual_outline() -> ManualOutline:
+    """同梱したマニュアルの目次を読み込む（読み込みはプロセスごとに1回）"""
+    return ManualOutline.load()
@@ -0,0 +1,167 @@
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from core.cache import TTLCache
+
+PRICE_URL = "https://secure.sakura.ad.jp/cloud/zone/is1a/api/cloud/1.1/public/price.json"
+
+# 料金表は頻繁に変わらないため、解析済みのものを一定時間キャッシュする
+PRICE_REFRESH_SECONDS = 6 * 60 * 60
+PRICE_CACHE = TTLCache(PRICE_REFRESH_SECONDS)
+
+
+class PriceCatalog:
+    """料金表（price.json）を検索用に索引付けしたもの"""
+
+    def __init__(self, service_classes: List[Dict[str, Any]], raw: Optional[Dict[str, Any]] = None):
+        """料金表の初期化
+
+        Args:
+            service_classes: サービスクラスのリスト
+            raw: 元の料金表のJSON
+        """
+        self.raw = raw
+        self.service_classes = [self._normalize(item) for item in service_classes]
+
+        self.by_path: Dict[str, List[int]] = {}
+        self.by_name: Dict[str, List[int]] = {}
+        self.by_display_name: Dict[str, List[int]] = {}
+        self.by_zone: Dict[str, List[int]] = {}
+        self.search_texts: List[str] = []
+        for index, item in enumerate(self.service_classes):
+            self.by_path.setdefault(item["ServiceClassPath"], []).append(index)
+            self.by_name.setdefault(item["ServiceClassName"], []).append(index)
+            self.by_display_name.setdefault(item["DisplayName"], []).append(index)
+            for zone in {price.get("Zone") or "" for price in item["Price"]}:
+                self.by_zone.setdefault(zone, []).append(index)
+            # キーワード検索用に、名前とパスを小文字にして連結しておく
+            self.search_texts.append(
+                " ".join(
+                    (item["DisplayName"], item["ServiceClassName"], item["ServiceClassPath"])
+                ).lower()
+            )
+
+        # 前方一致検索用に、パスを昇順に並べておく
+        self.sorted_paths = sorted(self.by_path)
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> "PriceCatalog":
+        """price.jsonのレスポンスから料金表を作成する"""
+        service_classes = data.get("ServiceClasses") or []
+        if isinstance(service_classes, dict):
+            service_classes = list(service_classes.values())
+        return cls(service_classes, data)
+
+    def __len__(self) -> int:
+        return len(self.service_classes)
+
+    def find_by_prefix(self, prefix: str) -> List[int]:
+        """ServiceClassPathが指定した文字列で始まるサービスクラスを返す"""
+        indexes = []
+        for path in self.sorted_paths[bisect_left(self.sorted_paths, prefix) :]:
+            if not path.startswith(prefix):
+                break
+            indexes.extend(self.by_path[path])
+        return indexes
+
+    def price_for(self, path: str, zone: str) -> Optional[Dict[str, Any]]:
+        """ServiceClassPathとゾーンに対応する料金を返す（ゾーンに依存しない料金も対象とする）"""
+        fallback = None
+        for index in self.by_path.get(path, []):
+            for price in self.service_classes[index]["Price"]:
+                if price.get("Zone") == zone:
+                    return price
+                if not price.get("Zone") and fallback is None:
+                    fallback = price
+        return fallback
+
+    def lookup(
+        self,
+        keyword: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+        service_class_name: Optional[str] = None,
+        zone: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """条件に一致するサービスクラスを返す（条件はすべて満たすものを返す）
+
+        Args:
+            keyword: 表示名・サービスクラス名・パスに含まれる文字列（空白区切りで複数指定した場合はすべてを含むもの）
+            path_prefix: ServiceClassPathの前方一致
+            service_class_name: ServiceClassNameまたは表示名の完全一致
+            zone: ゾーン名（指定した場合は料金もそのゾーンのもののみに絞り込む）
+
+        Returns:
+            List[Dict[str, Any]]: 一致したサービスクラスのリスト
+        """
+        candidates: Optional[set] = None
+
+        def narrow(indexes: List[int]) -> None:
+            nonlocal candidates
+            candidates = set(indexes) if candidates is None else candidates & set(indexes)
+
+        # 索引で絞り込める条件から先に適用する
+        if service_class_name:
+            narrow(
+                self.by_name.get(service_class_name, [])
+                + self.by_display_name.get(service_class_name, [])
+            )
+        if path_prefix:
+            narrow(self.find_by_prefix(path_prefix))
+        if zone:
+            # ゾーンに依存しないサービスクラスも含める
+            narrow(self.by_zone.get(zone, []) + self.by_zone.get("", []))
+
+        indexes = sorted(candidates) if candidates is not None else range(len(self))
+        if keyword:
+            words = keyword.lower().split()
+            indexes = [
+                index
+                for index in indexes
+                if all(word in self.search_texts[index] for word in words)
+            ]
+
+        results = []
+        for index in indexes:
+            item = self.service_classes[index]
+            if zone:
+                item = {
+                    **item,
+                    "Price": [
+                        price for price in item["Price"] if price.get("Zone") in (zone, None, "")
+                    ],
+                }
+            results.append(item)
+        return results
+
+    @staticmethod
+    def _normalize(item: Dict[str, Any]) -> Dict[str, Any]:
+        """サービスクラスの項目を揃える（Priceはゾーンごとのリストにする）"""
+        price = item.get("Price") or []
+        if isinstance(price, dict):
+            price = [price]
+        return {
+            "ServiceClassID": item.get("ServiceClassID"),
+            "ServiceClassName": item.get("ServiceClassName") or "",
+            "ServiceClassPath": item.get("ServiceClassPath") or "",
+            "DisplayName": item.get("DisplayName") or "",
+            "ServiceCharge": item.get("ServiceCharge"),
+            "IsPublic": item.get("IsPublic"),
+            "Price": price,
+        }
+
+
+async def fetch_price_catalog() -> PriceCatalog:
+    """料金表を取得して索引付けする（HTTPのエラーは呼び出し元で処理する）"""
+    async with httpx.AsyncClient(
+        timeout=10.0, headers={"X-Requested-With": "XMLHttpRequest"}
+    ) as client:
+        response = await client.get(PRICE_URL)
+        response.raise_for_status()
+    return PriceCatalog.from_response(response.json())
+
+
+async def get_price_catalog() -> PriceCatalog:
+    """キャッシュ済みの料金表を返す（期限切れの場合は取得し直す）"""
+    return await PRICE_CACHE.get_or_fetch("price", fetch_price_catalog)
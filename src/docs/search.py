@@ -0,0 +1,421 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.cache import get_cache_dir
+from core.executor import PARSE_EXECUTOR
+from docs import manual
+from docs.sections import HEADING_PATTERN
+from docs.snapshot import current_snapshot
+
+# 索引のファイル形式のバージョン（形式を変更した場合は上げる）
+INDEX_VERSION = 2
+
+# BM25のパラメータ
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 検索対象のマニュアルの種類と、URLの接頭辞
+MANUAL_SOURCES = {
+    "cloud": "https://manual.sakura.ad.jp/cloud/",
+    "api": "https://manual.sakura.ad.jp/cloud-api/",
+}
+
+# 英数字は単語ごと、ひらがな・カタカナ・漢字は文字の並びごとに切り出す
+TOKEN_PATTERN = re.compile(r"([0-9a-z_]+)|([\u3040-\u30ff\u3400-\u9fff\uf900-\ufaff]+)")
+
+SNIPPET_BEFORE = 40
+SNIPPET_AFTER = 120
+
+
+def normalize_text(text: str) -> str:
+    """検索用に文字列を正規化する（全角英数字を半角にし、小文字にする）"""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """文字列を検索用のトークンに分割する
+
+    日本語は単語の区切りがないため、ひらがな・カタカナ・漢字の並びは2文字ずつ（bigram）に分割する。
+    1文字のみの並びはその1文字をトークンとする。
+    """
+    tokens = []
+    for word, japanese in TOKEN_PATTERN.findall(normalize_text(text)):
+        if word:
+            tokens.append(word)
+        elif len(japanese) == 1:
+            tokens.append(japanese)
+        else:
+            tokens.extend(japanese[index : index + 2] for index in range(len(japanese) - 1))
+    return tokens
+
+
+def split_sections(markdown: str) -> List[Tuple[str, str]]:
+    """markdownを見出しごとの (見出し, 本文) に分割する（最初の見出しより前の本文は見出しを空とする）"""
+    sections = []
+    heading = ""
+    position = 0
+    for match in HEADING_PATTERN.finditer(markdown):
+        sections.append((heading, markdown[position : match.start()]))
+        heading = match.group("atx") or match.group("setext")
+        position = match.end()
+    sections.append((heading, markdown[position:]))
+    return [(heading, text.strip()) for heading, text in sections if heading or text.strip()]
+
+
+def manual_source(url: str) -> Optional[str]:
+    """URLに対応するマニュアルの種類を返す"""
+    for source, prefix in MANUAL_SOURCES.items():
+        if url.startswith(prefix):
+            return source
+    return None
+
+
+def iter_cached_pages() -> Iterable[Tuple[str, str]]:
+    """スナップショットとキャッシュ済みのマニュアルのページを (URL, markdown) として返す
+
+    両方に含まれるページは、取得日時が新しいとは限らないがスナップショットのものを優先する。
+    """
+    seen = set()
+    snapshot = current_snapshot()
+    for url, markdown in snapshot.pages() if snapshot else []:
+        seen.add(url)
+        yield url, markdown
+    for url, entry in manual.MANUAL_CACHE.items():
+        if (
+            url not in seen
+            and isinstance(entry, dict)
+            and entry.get("Markdown")
+            and manual_source(url)
+        ):
+            yield url, entry["Markdown"]
+
+
+class ManualSearchIndex:
+    """マニュアルの見出しごとのセクションを対象とするBM25の転置索引
+
+    トークンごとの出現セクションは、ソート済みのトークンの配列と、CSR形式の
+    (開始位置, セクション番号, 出現回数) の配列で保持する。これらの配列とセクションの本文は
+    ファイルに保存し、読み込み時はメモリマップするため、索引が大きくても起動時の読み込みは一瞬で済む。
+    """
+
+    ARRAY_NAMES = (
+        "terms",
+        "offsets",
+        "postings",
+        "frequencies",
+        "lengths",
+        "sources",
+        "text_offsets",
+    )
+
+    def __init__(self, documents: List[Dict[str, str]], arrays: Dict[str, np.ndarray], texts: Any):
+        """索引の初期化
+
+        Args:
+            documents: セクションごとの情報（Url, Title, Heading）
+            arrays: 索引の配列（ARRAY_NAMESの各配列）
+            texts: セクションの本文をUTF-8で連結したバイト列（またはメモリマップした配列）
+        """
+        self.documents = documents
+        self.texts = texts
+        for name in self.ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        self.average_length = float(self.lengths.mean()) if len(self.lengths) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @classmethod
+    def build(cls, pages: Iterable[Tuple[str, str]]) -> "ManualSearchIndex":
+        """(URL, markdown) のページから索引を作成する"""
+        documents: List[Dict[str, str]] = []
+        section_texts: List[bytes] = []
+        sources: List[int] = []
+        lengths: List[int] = []
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        for url, markdown in pages:
+            sections = split_sections(markdown)
+            title = next((heading for heading, _ in sections if heading), url)
+            for heading, text in sections:
+                index = len(documents)
+                # 見出しも本文と同様に検索対象とする
+                counts = Counter(tokenize(f"{heading}\n{text}"))
+                for term, count in counts.items():
+                    postings.setdefault(term, []).append((index, count))
+                documents.append({"Url": url, "Title": title, "Heading": heading})
+                section_texts.append(text.encode("utf-8"))
+                sources.append(list(MANUAL_SOURCES).index(manual_source(url) or "cloud"))
+                lengths.append(sum(counts.values()))
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(postings[term]) for term in terms])
+        flat = [posting for term in terms for posting in postings[term]]
+        text_offsets = np.zeros(len(section_texts) + 1, dtype=np.int64)
+        text_offsets[1:] = np.cumsum([len(text) for text in section_texts])
+
+        arrays = {
+            "terms": np.array(terms, dtype=str) if terms else np.array([], dtype="<U1"),
+            "offsets": offsets,
+            "postings": np.array([doc for doc, _ in flat], dtype=np.int32),
+            "frequencies": np.array([count for _, count in flat], dtype=np.float32),
+            "lengths": np.array(lengths, dtype=np.float32),
+            "sources": np.array(sources, dtype=np.uint8),
+            "text_offsets": text_offsets,
+        }
+        return cls(documents, arrays, b"".join(section_texts))
+
+    def save(self, directory: Path) -> None:
+        """索引をディレクトリに保存する（作成途中の索引を読まないよう、一時ディレクトリから置き換える）"""
+        directory.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        temp_dir = Path(tempfile.mkdtemp(dir=directory.parent, suffix=".tmp"))
+        try:
+            for name in self.ARRAY_NAMES:
+                np.save(temp_dir / f"{name}.npy", getattr(self, name))
+            (temp_dir / "texts.bin").write_bytes(bytes(self.texts))
+            with open(temp_dir / "meta.json", "w", encoding="utf-8") as file:
+                json.dump(
+                    {"Version": INDEX_VERSION, "Documents": self.documents},
+                    file,
+                    ensure_ascii=False,
+                )
+
+            # ディレクトリは上書きできないため、古い索引を退避してから置き換える
+            old_dir = None
+            if directory.exists():
+                old_dir = directory.with_name(f"{directory.name}.{os.getpid()}.old")
+                os.replace(directory, old_dir)
+            os.replace(temp_dir, directory)
+            if old_dir:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["ManualSearchIndex"]:
+        """保存した索引をメモリマップして読み込む（存在しないか形式が異なる場合はNone）"""
+        try:
+            with open(directory / "meta.json", encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta.get("Version") != INDEX_VERSION:
+                return None
+            arrays = {
+                name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in cls.ARRAY_NAMES
+            }
+            text_path = directory / "texts.bin"
+            # 空のファイルはメモリマップできない
+            texts = (
+                np.memmap(text_path, dtype=np.uint8, mode="r") if text_path.stat().st_size else b""
+            )
+        except (OSError, ValueError):
+            return None
+        return cls(meta["Documents"], arrays, texts)
+
+    def text(self, index: int) -> str:
+        """セクションの本文を返す"""
+        return bytes(self.texts[self.text_offsets[index] : self.text_offsets[index + 1]]).decode(
+            "utf-8"
+        )
+
+    def term_id(self, term: str) -> Optional[int]:
+        """トークンの番号を返す（索引にない場合はNone）"""
+        position = int(np.searchsorted(self.terms, term))
+        if position < len(self.terms) and self.terms[position] == term:
+            return position
+        return None
+
+    def scores(self, query: str) -> np.ndarray:
+        """クエリに対するセクションごとのBM25のスコアを計算する"""
+        scores = np.zeros(len(self), dtype=np.float64)
+        if not self.average_length:
+            return scores
+        for term in set(tokenize(query)):
+            term_id = self.term_id(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs = self.postings[start:end]
+            frequencies = self.frequencies[start:end].astype(np.float64)
+            idf = math.log(1 + (len(self) - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = 1 - BM25_B + BM25_B * self.lengths[docs] / self.average_length
+            scores[docs] += idf * frequencies * (BM25_K1 + 1) / (frequencies + BM25_K1 * norm)
+        return scores
+
+    def search(
+        self, query: str, limit: int = 10, source: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """クエリに一致するセクションをスコアの高い順に返す
+
+        Args:
+            query: 検索する文字列
+            limit: 返すセクションの最大数
+            source: マニュアルの種類（"cloud" または "api"、省略時はすべて）
+
+        Returns:
+            List[Dict[str, Any]]: セクションのリスト（Url, Title, Heading, Score, Snippet）
+        """
+        scores = self.scores(query)
+        if source:
+            scores[self.sources != list(MANUAL_SOURCES).index(source)] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            {
+                **self.documents[index],
+                "Score": round(float(scores[index]), 4),
+                "Snippet": snippet(self.text(index), query),
+            }
+            for index in ranked
+        ]
+
+
+def snippet(text: str, query: str) -> str:
+    """本文のうち、クエリの語が最初に現れる付近を抜き出す"""
+    normalized = normalize_text(text)
+    position = -1
+    for word in normalize_text(query).split():
+        # 語全体が見つからない場合は、語の先頭2文字で探す
+        for needle in (word, word[:2]):
+            position = normalized.find(needle)
+            if position >= 0:
+                break
+        if position >= 0:
+            break
+
+    start = max(position - SNIPPET_BEFORE, 0)
+    excerpt = " ".join(text[start : max(position, 0) + SNIPPET_AFTER].split())
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if max(position, 0) + SNIPPET_AFTER < len(text) else ""
+    return f"{prefix}{excerpt}{suffix}"
+
+
+def get_index_dir() -> Path:
+    """検索用の索引の保存先ディレクトリを返す"""
+    return get_cache_dir() / "search"
+
+
+_SEARCH_INDEX: Optional[ManualSearchIndex] = None
+
+# 読み込んだ索引の作成時点の、マニュアルのキャッシュの更新回数と、作成・読み込みした時刻
+_SEARCH_INDEX_GENERATION = 0
+_SEARCH_INDEX_BUILT_AT = 0.0
+
+# 索引を作成するロック（同時に検索された場合に、索引を重複して作成しない）
+_SEARCH_INDEX_LOCK = asyncio.Lock()
+
+# バックグラウンドで索引を作り直しているタスク
+_SEARCH_INDEX_TASK: Optional["asyncio.Task[ManualSearchIndex]"] = None
+
+# 索引の作成はページ数に比例して時間がかかるため、キャッシュに新しいページが保存されても
+# この件数またはこの時間（秒）に達するまでは作り直さず、これまでの索引で検索する
+SEARCH_INDEX_REBUILD_PAGES = 20
+SEARCH_INDEX_REBUILD_INTERVAL_SECONDS = 300
+
+logger = logging.getLogger(__name__)
+
+
+def build_search_index(pages: Optional[Iterable[Tuple[str, str]]] = None) -> ManualSearchIndex:
+    """ページから索引を作成して保存する（省略時はキャッシュ済みのページから作成する）"""
+    global _SEARCH_INDEX
+    save_search_index(pages)
+    _SEARCH_INDEX = ManualSearchIndex.load(get_index_dir())
+    return _SEARCH_INDEX
+
+
+def save_search_index(pages: Optional[Iterable[Tuple[str, str]]] = None) -> int:
+    """ページから索引を作成して保存し、セクション数を返す（ワーカーで実行する）"""
+    index = ManualSearchIndex.build(iter_cached_pages() if pages is None else pages)
+    index.save(get_index_dir())
+    return len(index)
+
+
+def search_index_is_stale() -> bool:
+    """索引を作り直すほど、作成後にキャッシュに新しいページが保存されたかどうかを返す"""
+    changes = manual.get_manual_cache_generation() - _SEARCH_INDEX_GENERATION
+    if changes <= 0:
+        return False
+    return (
+        changes >= SEARCH_INDEX_REBUILD_PAGES
+        or time.monotonic() - _SEARCH_INDEX_BUILT_AT >= SEARCH_INDEX_REBUILD_INTERVAL_SECONDS
+    )
+
+
+async def _rebuild_search_index() -> ManualSearchIndex:
+    """キャッシュ済みのページから索引をワーカーで作り直して読み込む（ロックを取得して呼び出す）"""
+    global _SEARCH_INDEX, _SEARCH_INDEX_GENERATION, _SEARCH_INDEX_BUILT_AT
+    generation = manual.get_manual_cache_generation()
+    await PARSE_EXECUTOR.run(save_search_index)
+    _SEARCH_INDEX = ManualSearchIndex.load(get_index_dir())
+    _SEARCH_INDEX_GENERATION = generation
+    _SEARCH_INDEX_BUILT_AT = time.monotonic()
+    return _SEARCH_INDEX
+
+
+async def _rebuild_search_index_in_background() -> ManualSearchIndex:
+    """バックグラウンドで索引を作り直す"""
+    async with _SEARCH_INDEX_LOCK:
+        return await _rebuild_search_index()
+
+
+def _log_rebuild_error(task: "asyncio.Task[ManualSearchIndex]") -> None:
+    """バックグラウンドでの作り直しに失敗した場合は記録する（これまでの索引を使い続ける）"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("検索用の索引の作り直しに失敗しました: %s", task.exception())
+
+
+async def get_search_index(rebuild: bool = False) -> ManualSearchIndex:
+    """保存した索引を返す
+
+    未作成の場合とrebuildを指定した場合は、キャッシュ済みのページから索引を作り直してから返す。
+    読み込んだ後にマニュアルのキャッシュに新しいページが保存された場合は、一定の件数・時間に達したら
+    バックグラウンドで作り直し、作り直している間はこれまでの索引を返す。
+    索引の作成はCPU負荷が高いため、イベントループを止めないようワーカーで行う。
+    """
+    global _SEARCH_INDEX, _SEARCH_INDEX_BUILT_AT, _SEARCH_INDEX_TASK
+    if rebuild or _SEARCH_INDEX is None:
+        async with _SEARCH_INDEX_LOCK:
+            if rebuild:
+                return await _rebuild_search_index()
+            if _SEARCH_INDEX is None:
+                _SEARCH_INDEX = ManualSearchIndex.load(get_index_dir())
+                _SEARCH_INDEX_BUILT_AT = time.monotonic()
+            if _SEARCH_INDEX is None:
+                return await _rebuild_search_index()
+
+    if search_index_is_stale() and (_SEARCH_INDEX_TASK is None or _SEARCH_INDEX_TASK.done()):
+        _SEARCH_INDEX_TASK = asyncio.create_task(_rebuild_search_index_in_background())
+        _SEARCH_INDEX_TASK.add_done_callback(_log_rebuild_error)
+    return _SEARCH_INDEX
+
+
+def main() -> None:
+    """キャッシュ済みのページから検索用の索引を作成する（ネットワークにはアクセスしない）"""
+    parser = argparse.ArgumentParser(
+        description="さくらのクラウドのマニュアルの検索用の索引を作成する"
+    )
+    parser.parse_args()
+    index = build_search_index()
+    print(f"{len(index)}件のセクションの索引を作成しました: {get_index_dir()}")
+
+
+if __name__ == "__main__":
+    main()
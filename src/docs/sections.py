@@ -0,0 +1,188 @@
+import re
+from typing import Any, Dict, List, Optional, Union
+
+# 見出しは「# 見出し」の形式と、次の行に「===」「---」を付ける形式（html_to_markdownのh1・h2の既定）がある
+HEADING_PATTERN = re.compile(
+    r"^(?:(?P<marks>#{1,6})\s+(?P<atx>.+?)\s*#*|(?P<setext>[^\s|].*?)\s*\n(?P<underline>=+|-+))\s*$",
+    re.MULTILINE,
+)
+
+# 1回で返す本文の最大文字数
+MAX_PAGE_CHARS = 20000
+
+
+def heading_level(match: re.Match) -> int:
+    """見出しのレベル（1-6）を返す"""
+    if match.group("marks"):
+        return len(match.group("marks"))
+    return 1 if match.group("underline").startswith("=") else 2
+
+
+def section_tree(markdown: str) -> List[Dict[str, Any]]:
+    """markdownを見出しの階層に沿ったセクションに分割する
+
+    各セクションの範囲は見出しから次の同じかより上位の見出しの直前までとし、下位のセクションを含む。
+    Idは見出しの階層ごとの番号を "." でつないだもの（例: "2.1"）とし、
+    最初の見出しより前に本文がある場合はその部分を Id "0" のセクションとする。
+
+    Returns:
+        List[Dict[str, Any]]: セクションのリスト（Id, Level, Heading, Start, End）
+    """
+    sections: List[Dict[str, Any]] = []
+    matches = list(HEADING_PATTERN.finditer(markdown))
+    first = matches[0].start() if matches else len(markdown)
+    if markdown[:first].strip():
+        sections.append({"Id": "0", "Level": 0, "Heading": "", "Start": 0, "End": first})
+
+    numbers: List[List[int]] = []  # [レベル, 番号] のスタック
+    open_sections: List[Dict[str, Any]] = []
+    for match in matches:
+        level = heading_level(match)
+        while numbers and numbers[-1][0] > level:
+            numbers.pop()
+        if numbers and numbers[-1][0] == level:
+            numbers[-1][1] += 1
+        else:
+            numbers.append([level, 1])
+
+        # 同じかより上位の見出しで、開いているセクションを閉じる
+        while open_sections and open_sections[-1]["Level"] >= level:
+            open_sections.pop()["End"] = match.start()
+
+        section = {
+            "Id": ".".join(str(number) for _, number in numbers),
+            "Level": level,
+            "Heading": match.group("atx") or match.group("setext"),
+            "Start": match.start(),
+            "End": len(markdown),
+        }
+        sections.append(section)
+        open_sections.append(section)
+    return sections
+
+
+def page_offsets(text: str, boundaries: List[int], size: Optional[int] = None) -> List[int]:
+    """本文を最大文字数ごとのページに分割する位置を返す
+
+    ページの区切りは、なるべくセクションの先頭、なければ行の先頭とする。
+
+    Args:
+        text: 本文
+        boundaries: 区切りの候補とするセクションの先頭位置（昇順）
+        size: 1ページの最大文字数（デフォルトは MAX_PAGE_CHARS）
+
+    Returns:
+        List[int]: 各ページの開始位置と、末尾（本文の文字数）
+    """
+    size = size or MAX_PAGE_CHARS
+    offsets = [0]
+    position = 0
+    while len(text) - position > size:
+        limit = position + size
+        candidates = [boundary for boundary in boundaries if position < boundary <= limit]
+        if candidates:
+            cut = candidates[-1]
+        else:
+            newline = text.rfind("\n", position + 1, limit)
+            cut = newline + 1 if newline > position else limit
+        offsets.append(cut)
+        position = cut
+    offsets.append(len(text))
+    return offsets
+
+
+def build_chunks(markdown: str) -> Dict[str, Any]:
+    """ページのセクションとページ区切りを計算する（キャッシュにページとともに保存する）"""
+    sections = section_tree(markdown)
+    return {
+        "Sections": sections,
+        "Pages": page_offsets(markdown, [section["Start"] for section in sections]),
+    }
+
+
+def table_of_contents(sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """セクションの目次を返す（各セクションの文字数は下位のセクションを含む）"""
+    return [
+        {
+            "Id": section["Id"],
+            "Level": section["Level"],
+            "Heading": section["Heading"],
+            "Chars": section["End"] - section["Start"],
+        }
+        for section in sections
+    ]
+
+
+def find_section(sections: List[Dict[str, Any]], section: str) -> Optional[Dict[str, Any]]:
+    """Idまたは見出しが一致するセクションを返す（見出しで一致するものが複数ある場合は最初のもの）"""
+    for candidate in sections:
+        if candidate["Id"] == section:
+            return candidate
+    for candidate in sections:
+        if candidate["Heading"] == section:
+            return candidate
+    return None
+
+
+def select_chunk(
+    url: str,
+    markdown: str,
+    chunks: Dict[str, Any],
+    section: Optional[str] = None,
+    page: Optional[int] = None,
+) -> Union[str, Dict[str, Any]]:
+    """ページから、指定したセクション・ページの本文を取り出す
+
+    セクション・ページを指定せず、ページ全体が1ページに収まる場合は本文をそのまま返す。
+    ページ全体が1ページに収まらない場合は、目次と最初のページを返す。
+
+    Args:
+        url: ページのURL
+        markdown: ページ全体の本文
+        chunks: build_chunks()の結果
+        section: セクションのIdまたは見出し
+        page: ページ番号（1から始まる）
+
+    Returns:
+        Union[str, Dict[str, Any]]: 本文、またはページ番号などを含む辞書（エラーの場合はエラーメッセージ）
+    """
+    if page is not None and page < 1:
+        return "pageは1以上を指定してください"
+
+    result: Dict[str, Any] = {"Url": url}
+    if section:
+        target = find_section(chunks["Sections"], section)
+        if not target:
+            return (
+                f"セクション「{section}」が見つかりません。目次のIdまたは見出しを指定してください"
+            )
+        text = markdown[target["Start"] : target["End"]]
+        sections = [
+            candidate
+            for candidate in chunks["Sections"]
+            if target["Start"] <= candidate["Start"] < target["End"]
+        ]
+        offsets = page_offsets(
+            text, [candidate["Start"] - target["Start"] for candidate in sections]
+        )
+        result.update({"Section": target["Id"], "Heading": target["Heading"]})
+    else:
+        text = markdown
+        offsets = chunks["Pages"]
+        if page is None and len(offsets) <= 2:
+            return markdown
+        if page is None:
+            result["TableOfContents"] = table_of_contents(chunks["Sections"])
+
+    total_pages = len(offsets) - 1
+    page = page or 1
+    if page > total_pages:
+        return f"pageは1-{total_pages}の範囲で指定してください"
+    result.update(
+        {
+            "Page": page,
+            "TotalPages": total_pages,
+            "Content": text[offsets[page - 1] : offsets[page]],
+        }
+    )
+    return result
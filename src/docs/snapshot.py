@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.cache import get_cache_dir
+from core.consts import JST
+
+# 現在のスナップショットのバージョンを記録するファイル名
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+
+def get_snapshot_root() -> Path:
+    """マニュアルのスナップショットの保存先ディレクトリを返す"""
+    return get_cache_dir() / "snapshots"
+
+
+def content_hash(markdown: str) -> str:
+    """ページの内容のハッシュ値を返す"""
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+def is_offline() -> bool:
+    """オフラインモードかどうかを返す（環境変数 SACLOUD_MCP_MANUAL_OFFLINE で有効にする）"""
+    return os.getenv("SACLOUD_MCP_MANUAL_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+class ManualSnapshot:
+    """マニュアルのページをmarkdownで保存したスナップショット
+
+    ページはURLのハッシュ値をファイル名として保存し、manifest.jsonにURLとファイル名、
+    内容のハッシュ値を記録する。スナップショットはバージョンごとのディレクトリに作成し、
+    完成後にCURRENTファイルを置き換えるため、作成途中のスナップショットを読むことはない。
+    """
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]):
+        """スナップショットの初期化
+
+        Args:
+            directory: スナップショットのディレクトリ
+            manifest: manifest.jsonの内容
+        """
+        self.directory = directory
+        self.manifest = manifest
+
+    @property
+    def version(self) -> str:
+        return self.manifest["Version"]
+
+    def __len__(self) -> int:
+        return len(self.manifest["Pages"])
+
+    @classmethod
+    def create(
+        cls,
+        pages: Iterable[Tuple[str, str]],
+        api_outline: Optional[Dict[str, str]] = None,
+        errors: Optional[List[Dict[str, str]]] = None,
+        root: Optional[Path] = None,
+    ) -> "ManualSnapshot":
+        """(URL, markdown) のページから新しいバージョンのスナップショットを作成し、現在のスナップショットとする
+
+        Args:
+            pages: (URL, markdown) のページ
+            api_outline: APIマニュアルの目次（オフラインモードで目次を返すために保存する）
+            errors: 取得できなかったページのURLとエラーメッセージのリスト
+            root: 保存先ディレクトリ（デフォルトは get_snapshot_root() の値）
+        """
+        root = root or get_snapshot_root()
+        root.mkdir(mode=0o700, parents=True, exist_ok=True)
+        version = datetime.now(JST).strftime("%Y%m%dT%H%M%S%f")
+        temp_dir = Path(tempfile.mkdtemp(dir=root, suffix=".tmp"))
+        try:
+            (temp_dir / "pages").mkdir()
+            entries = {}
+            for url, markdown in pages:
+                name = f"pages/{hashlib.sha256(url.encode('utf-8')).hexdigest()}.md"
+                (temp_dir / name).write_text(markdown, encoding="utf-8")
+                entries[url] = {"Path": name, "Hash": content_hash(markdown)}
+
+            manifest = {
+                "Version": version,
+                "CreatedAt": datetime.now(JST).isoformat(timespec="seconds"),
+                "Pages": entries,
+                "ApiOutline": api_outline or {},
+                "Errors": errors or [],
+            }
+            with open(temp_dir / MANIFEST_FILE, "w", encoding="utf-8") as file:
+                json.dump(manifest, file, ensure_ascii=False, indent=1)
+            os.replace(temp_dir, root / version)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        _write_atomic(root / CURRENT_FILE, version)
+        return cls(root / version, manifest)
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["ManualSnapshot"]:
+        """スナップショットを読み込む（存在しないか読み込めない場合はNone）"""
+        try:
+            with open(directory / MANIFEST_FILE, encoding="utf-8") as file:
+                return cls(directory, json.load(file))
+        except (OSError, ValueError):
+            return None
+
+    def read(self, url: str) -> Optional[str]:
+        """ページのmarkdownを返す（含まれないか、内容がmanifestのハッシュ値と一致しない場合はNone）"""
+        entry = self.manifest["Pages"].get(url)
+        if not entry:
+            return None
+        try:
+            markdown = (self.directory / entry["Path"]).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        return markdown if content_hash(markdown) == entry["Hash"] else None
+
+    def pages(self) -> Iterable[Tuple[str, str]]:
+        """スナップショットのすべてのページを (URL, markdown) として返す"""
+        for url in self.manifest["Pages"]:
+            markdown = self.read(url)
+            if markdown is not None:
+                yield url, markdown
+
+    def verify(self) -> List[str]:
+        """内容がmanifestのハッシュ値と一致しないページのURLを返す"""
+        return [url for url in self.manifest["Pages"] if self.read(url) is None]
+
+
+_CURRENT: Optional[ManualSnapshot] = None
+
+
+def current_snapshot(root: Optional[Path] = None) -> Optional[ManualSnapshot]:
+    """現在のスナップショットを返す（作成されていない場合はNone）
+
+    CURRENTファイルのバージョンが変わった場合のみmanifest.jsonを読み直す。
+    """
+    global _CURRENT
+    root = root or get_snapshot_root()
+    try:
+        version = (root / CURRENT_FILE).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if _CURRENT is None or _CURRENT.directory != root / version:
+        _CURRENT = ManualSnapshot.load(root / version)
+    return _CURRENT
+
+
+def prune_snapshots(keep: int, root: Optional[Path] = None) -> List[str]:
+    """現在のスナップショットを除き、新しいものから指定数を残して古いスナップショットを削除する
+
+    Returns:
+        List[str]: 削除したスナップショットのバージョン
+    """
+    root = root or get_snapshot_root()
+    snapshot = current_snapshot(root)
+    current = snapshot.version if snapshot else None
+    versions = sorted(
+        (
+            path.name
+            for path in root.iterdir()
+            if (path / MANIFEST_FILE).exists() and path.name != current
+        ),
+        reverse=True,
+    )
+    removed = versions[max(keep - 1, 0) :] if current else versions[keep:]
+    for version in removed:
+        shutil.rmtree(root / version, ignore_errors=True)
+    return removed
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """ファイルを一時ファイルから置き換えて書き込む"""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -8,6 +8,7 @@ from networking.handlers.factory import initialize_networking
 from objectstorage.handlers.factory import initialize_objectstorage
 from objectstorage.consts import OBJDCTSTORAGE_ZONE_URLS
 from core.mcp import create_mcp
+from monitoring.handlers.factory import initialize_monitoring
 from storage.handlers.factory import initialize_storage
 
 
@@ -23,6 +24,7 @@ def main():
     initialize_storage(mcp, ZONE_URLS)
     initialize_networking(mcp, ZONE_URLS)
     initialize_appliance(mcp, ZONE_URLS)
+    initialize_monitoring(mcp, ZONE_URLS)
     initialize_objectstorage(mcp, OBJDCTSTORAGE_ZONE_URLS)
     initialize_bill(mcp, ZONE_URLS)
     initialize_controlpanel(mcp, ZONE_URLS)
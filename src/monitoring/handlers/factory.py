@@ -0,0 +1,20 @@
+from core.auth import get_api_key
+from monitoring.handlers.fleet import FleetMonitorHandler
+
+
+def initialize_monitoring(mcp, zone_urls):
+    """全てのハンドラーを初期化する
+
+    Args:
+        mcp: MCPクライアント
+        zone_urls: ゾーンURLの辞書
+
+    Returns:
+        dict: 初期化されたハンドラーの辞書
+    """
+
+    api_key = get_api_key()
+
+    return {
+        "fleet": FleetMonitorHandler(mcp, zone_urls, api_key),
+    }
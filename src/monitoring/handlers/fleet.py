@@ -0,0 +1,465 @@
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import numpy as np
+from mcp.server.fastmcp import Context
+
+from core.auth import SacloudApiKey, check_auth
+from core.concurrency import DEFAULT_CONCURRENCY, gather_with_concurrency, validate_concurrency
+from core.handlers.base import BaseHandler, HttpMethod
+from core.monitor import (
+    MONITOR_STORE,
+    align_series,
+    flagged_intervals,
+    format_time,
+    parse_monitor_data,
+    rolling_scores,
+)
+from core.zone import validate_zone
+
+# リソース種別ごとの、受信・送信の項目名の候補（ルータは In/Out、アプライアンスのNICは Receive/Send）
+METRIC_NAMES = {
+    "in": ("In", "Receive"),
+    "out": ("Out", "Send"),
+}
+
+# ランキングに使用できる統計値
+STATISTICS = ("Latest", "Mean", "Max", "P95")
+
+
+def select_metric(metrics: Dict[str, np.ndarray], metric: str) -> Optional[np.ndarray]:
+    """モニタ情報から受信・送信・合計のいずれかの系列を取り出す
+
+    Args:
+        metrics: 項目名ごとの値の配列
+        metric: "in", "out" または "total"
+
+    Returns:
+        Optional[np.ndarray]: 値の配列（該当する項目がない場合はNone）
+    """
+    if metric == "total":
+        series = [select_metric(metrics, name) for name in ("in", "out")]
+        series = [values for values in series if values is not None]
+        if not series:
+            return None
+        stacked = np.vstack(series)
+        # 両方が欠損している時刻のみ欠損値とする
+        return np.where(np.isnan(stacked).all(axis=0), np.nan, np.nansum(stacked, axis=0))
+
+    for name in METRIC_NAMES[metric]:
+        if name in metrics:
+            return metrics[name]
+    return None
+
+
+def series_statistic(values: Optional[np.ndarray], stat: str) -> float:
+    """系列の統計値を計算する（値がない場合はNaN）"""
+    if values is None:
+        return np.nan
+    valid = values[~np.isnan(values)]
+    if not valid.size:
+        return np.nan
+    if stat == "Latest":
+        return float(valid[-1])
+    if stat == "Mean":
+        return float(valid.mean())
+    if stat == "Max":
+        return float(valid.max())
+    return float(np.percentile(valid, 95))
+
+
+def rank_top_k(values: np.ndarray, top_k: int) -> np.ndarray:
+    """値の大きい順に上位k件の位置を返す（NaNは除外する）"""
+    candidates = np.flatnonzero(~np.isnan(values))
+    if candidates.size > top_k:
+        # 上位k件のみを部分ソートで取り出してから並べ替える
+        candidates = candidates[np.argpartition(-values[candidates], top_k - 1)[:top_k]]
+    return candidates[np.argsort(-values[candidates], kind="stable")]
+
+
+class FleetMonitorHandler(BaseHandler):
+    """複数ゾーン・複数リソースのモニタ情報を一括で集計するハンドラークラス"""
+
+    # 対象のリソース種別
+    RESOURCE_TYPES = ("router", "vpcrouter", "database")
+    MAX_TOP_K = 100
+    DEFAULT_WINDOW_MINUTES = 60
+    DEFAULT_ANOMALY_WINDOW_MINUTES = 1440
+    # 1リソースあたり5分間隔で2016サンプル（7日分）まで
+    MAX_WINDOW_MINUTES = 7 * 24 * 60
+    # 5分間隔のサンプルで15分から1日分
+    MIN_BASELINE_POINTS = 3
+    MAX_BASELINE_POINTS = 288
+
+    def __init__(self, mcp, zone_urls, api_key: SacloudApiKey):
+        """フリートモニタハンドラーの初期化
+        MCPサーバのインスタンスを受け取り、モニタ情報の一括集計用のツールを登録
+
+        Args:
+            mcp: MCPサーバーインスタンス
+            zone_urls: ゾーンとAPIベースURLのマッピング辞書
+            api_key: さくらのクラウドAPIキー
+        """
+        super().__init__(mcp, zone_urls, api_key)
+
+        self.mcp.tool(name="get_fleet_monitor_top")(self.get_fleet_monitor_top)
+        self.mcp.tool(name="detect_traffic_anomalies")(self.detect_traffic_anomalies)
+
+    ### MCPツールメソッド
+
+    async def get_fleet_monitor_top(
+        self,
+        ctx: Context,
+        metric: str = "total",
+        stat: str = "Mean",
+        top_k: int = 10,
+        zones: Optional[List[str]] = None,
+        resource_types: Optional[List[str]] = None,
+        window_minutes: int = DEFAULT_WINDOW_MINUTES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIから全ゾーンのルータ・VPCルータ・データベースのネットワーク流量を並列に取得し、
+            指定した項目の上位のリソースを返します
+            「今最も流量の多いルータはどれか」のような質問に1回の呼び出しで回答できます
+
+        Args:
+            metric (str, optional): ランキングの項目（"in": 受信, "out": 送信, "total": 合計、デフォルト: "total"）
+            stat (str, optional): ランキングに使う統計値（"Latest", "Mean", "Max", "P95"、デフォルト: "Mean"）
+            top_k (int, optional): 返すリソース数（1-100、デフォルト: 10）
+            zones (list[str], optional): 対象ゾーンのリスト（デフォルトは全ゾーン）
+            resource_types (list[str], optional): 対象のリソース種別（"router", "vpcrouter", "database"、デフォルトは全種別）
+            window_minutes (int, optional): 集計する期間（現在から遡る分数、1-10080、デフォルト: 60）
+            concurrency (int, optional): モニタ情報取得の同時実行数（デフォルト: 10）
+
+        Returns:
+            dict: 上位のリソースの一覧
+                - Metric: ランキングの項目
+                - Stat: ランキングに使った統計値
+                - Columns: 列名のリスト（Rank, Zone, Type, ID, Name, Value）
+                - Rows: リソースごとの値のリスト（値の大きい順）
+                - Evaluated: 集計したリソース数
+                - Errors: 取得に失敗したゾーン・リソースとエラーメッセージ（失敗時のみ）
+        """
+        # パラメータの検証
+        if metric not in ("in", "out", "total"):
+            return "項目は in, out または total を指定する必要があります。"
+
+        if stat not in STATISTICS:
+            return f"統計値は{', '.join(STATISTICS)} のいずれかを指定する必要があります。"
+
+        if not 1 <= top_k <= self.MAX_TOP_K:
+            return f"取得件数は1-{self.MAX_TOP_K}の範囲で指定する必要があります。"
+
+        resource_types = resource_types or list(self.RESOURCE_TYPES)
+        error = self._validate_targets(zones, resource_types, window_minutes, concurrency)
+        if error:
+            return error
+
+        # 1. 全ゾーンの対象リソースを列挙し、2. モニタ情報を並列に取得する
+        resources, responses, errors = await self._collect_monitors(
+            ctx,
+            zones or list(self.zone_urls.keys()),
+            resource_types,
+            None,
+            window_minutes,
+            concurrency,
+        )
+
+        # 3. リソースごとの統計値を計算し、上位k件を選ぶ
+        values = np.full(len(resources), np.nan)
+        for index, (resource, response) in enumerate(zip(resources, responses)):
+            if isinstance(response, str):
+                errors.append({"Zone": resource["Zone"], "ID": resource["ID"], "Message": response})
+                continue
+            _, _, metrics = parse_monitor_data(response.get("Data"))
+            values[index] = series_statistic(select_metric(metrics, metric), stat)
+
+        rows = []
+        for rank, index in enumerate(rank_top_k(values, top_k), start=1):
+            resource = resources[index]
+            rows.append(
+                [
+                    rank,
+                    resource["Zone"],
+                    resource["Type"],
+                    resource["ID"],
+                    resource["Name"],
+                    float(values[index]),
+                ]
+            )
+
+        result = {
+            "Metric": metric,
+            "Stat": stat,
+            "Columns": ["Rank", "Zone", "Type", "ID", "Name", "Value"],
+            "Rows": rows,
+            "Evaluated": int((~np.isnan(values)).sum()),
+        }
+        if errors:
+            result["Errors"] = errors
+        return result
+
+    async def detect_traffic_anomalies(
+        self,
+        ctx: Context,
+        zones: Optional[List[str]] = None,
+        resource_types: Optional[List[str]] = None,
+        resource_ids: Optional[List[str]] = None,
+        method: str = "zscore",
+        threshold: float = 3.0,
+        baseline_points: int = 12,
+        window_minutes: int = DEFAULT_ANOMALY_WINDOW_MINUTES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIからルータ・VPCルータのネットワーク流量を一括で取得し、
+            直前の一定期間を基準として大きく外れた区間のみを返します
+            全リソースの受信・送信の系列をまとめて計算するため、多数のリソースを一度に調べられます
+
+        Args:
+            zones (list[str], optional): 対象ゾーンのリスト（デフォルトは全ゾーン）
+            resource_types (list[str], optional): 対象のリソース種別（"router", "vpcrouter", "database"、デフォルト: ルータとVPCルータ）
+            resource_ids (list[str], optional): 対象のリソースIDのリスト（デフォルトは対象種別の全リソース）
+            method (str, optional): 基準の計算方法（"zscore": 平均と標準偏差, "mad": 中央値と中央絶対偏差、デフォルト: "zscore"）
+            threshold (float, optional): 異常とみなすスコアの絶対値（デフォルト: 3.0）
+            baseline_points (int, optional): 基準に使う直前のサンプル数（3-288、デフォルト: 12）
+            window_minutes (int, optional): 調べる期間（現在から遡る分数、1-10080、デフォルト: 1440）
+            concurrency (int, optional): モニタ情報取得の同時実行数（デフォルト: 10）
+
+        Returns:
+            dict: 異常と判定された区間の一覧
+                - Columns: 列名のリスト（Zone, Type, ID, Name, Metric, Start, End, Points, Direction, PeakValue, PeakScore, Baseline）
+                - Rows: 区間ごとの値のリスト（スコアの絶対値の大きい順）
+                - Evaluated: 調べた系列数（リソース数 × 受信・送信）
+                - Errors: 取得に失敗したゾーン・リソースとエラーメッセージ（失敗時のみ）
+        """
+        # パラメータの検証
+        if method not in ("zscore", "mad"):
+            return "計算方法は zscore または mad を指定する必要があります。"
+
+        if threshold <= 0:
+            return "しきい値は0より大きい値を指定する必要があります。"
+
+        if not self.MIN_BASELINE_POINTS <= baseline_points <= self.MAX_BASELINE_POINTS:
+            return f"基準のサンプル数は{self.MIN_BASELINE_POINTS}-{self.MAX_BASELINE_POINTS}の範囲で指定する必要があります。"
+
+        resource_types = resource_types or ["router", "vpcrouter"]
+        error = self._validate_targets(zones, resource_types, window_minutes, concurrency)
+        if error:
+            return error
+
+        resources, responses, errors = await self._collect_monitors(
+            ctx,
+            zones or list(self.zone_urls.keys()),
+            resource_types,
+            resource_ids,
+            window_minutes,
+            concurrency,
+        )
+
+        # 受信・送信の系列を全リソース分集めて、共通の時刻軸の行列にする
+        series = []
+        labels = []
+        for resource, response in zip(resources, responses):
+            if isinstance(response, str):
+                errors.append({"Zone": resource["Zone"], "ID": resource["ID"], "Message": response})
+                continue
+            timestamps, _, metrics = parse_monitor_data(response.get("Data"))
+            for metric in ("in", "out"):
+                values = select_metric(metrics, metric)
+                if values is not None:
+                    series.append((timestamps, values))
+                    labels.append((resource, metric))
+
+        grid, matrix = align_series(series)
+        scores = rolling_scores(matrix, baseline_points, method)
+        with np.errstate(invalid="ignore"):
+            flags = np.abs(scores) >= threshold
+        rows_index, starts, ends = flagged_intervals(flags)
+
+        # 区間ごとにスコアの絶対値が最大の時刻を代表値とする
+        rows = []
+        for row, start, end in zip(rows_index, starts, ends):
+            resource, metric = labels[row]
+            peak = start + int(np.argmax(np.abs(scores[row, start : end + 1])))
+            peak_score = float(scores[row, peak])
+            baseline = matrix[row, max(0, peak - baseline_points) : peak]
+            rows.append(
+                [
+                    resource["Zone"],
+                    resource["Type"],
+                    resource["ID"],
+                    resource["Name"],
+                    metric,
+                    format_time(grid[start]),
+                    format_time(grid[end]),
+                    int(end - start + 1),
+                    "high" if peak_score > 0 else "low",
+                    float(matrix[row, peak]),
+                    peak_score if np.isfinite(peak_score) else None,
+                    float(np.nanmedian(baseline) if method == "mad" else np.nanmean(baseline)),
+                ]
+            )
+        # スコアが無限大（基準が一定）の区間を先頭にする
+        rows.sort(key=lambda item: -abs(item[10]) if item[10] is not None else -np.inf)
+
+        result = {
+            "Columns": [
+                "Zone",
+                "Type",
+                "ID",
+                "Name",
+                "Metric",
+                "Start",
+                "End",
+                "Points",
+                "Direction",
+                "PeakValue",
+                "PeakScore",
+                "Baseline",
+            ],
+            "Rows": rows,
+            "Evaluated": len(series),
+        }
+        if errors:
+            result["Errors"] = errors
+        return result
+
+    ### 内部メソッド
+
+    def _validate_targets(
+        self,
+        zones: Optional[List[str]],
+        resource_types: List[str],
+        window_minutes: int,
+        concurrency: int,
+    ) -> Optional[str]:
+        """認証情報と集計対象のパラメータを検証し、不正であればエラーメッセージを返す"""
+        # 認証情報チェック
+        auth_error = check_auth(self.api_key)
+        if auth_error:
+            return auth_error
+
+        for zone in zones or []:
+            zone_error = validate_zone(zone)
+            if zone_error:
+                return zone_error
+
+        for resource_type in resource_types:
+            if resource_type not in self.RESOURCE_TYPES:
+                return f"リソース種別は{', '.join(self.RESOURCE_TYPES)} のいずれかを指定する必要があります。"
+
+        if not 1 <= window_minutes <= self.MAX_WINDOW_MINUTES:
+            return f"集計期間は1-{self.MAX_WINDOW_MINUTES}分の範囲で指定する必要があります。"
+
+        return validate_concurrency(concurrency)
+
+    async def _collect_monitors(
+        self,
+        ctx: Context,
+        zones: List[str],
+        resource_types: List[str],
+        resource_ids: Optional[List[str]],
+        window_minutes: int,
+        concurrency: int,
+    ) -> Tuple[List[Dict[str, Any]], List[Union[Dict[str, Any], str]], List[Dict[str, str]]]:
+        """全ゾーンの対象リソースを列挙し、直近の期間のモニタ情報を並列に取得する
+
+        Returns:
+            Tuple: 対象リソースのリスト、リソースごとのモニタ情報（またはエラーメッセージ）、
+                列挙に失敗したゾーンのエラーのリスト
+        """
+        listed = await gather_with_concurrency(
+            len(zones),
+            [lambda zone=zone: self._list_resources(ctx, zone, resource_types) for zone in zones],
+        )
+        resources: List[Dict[str, Any]] = []
+        errors: List[Dict[str, str]] = []
+        for zone, result in zip(zones, listed):
+            # 一部のゾーンで失敗しても、取得できたゾーンの結果は返す
+            if isinstance(result, str):
+                errors.append({"Zone": zone, "Message": result})
+            else:
+                resources.extend(result)
+        if resource_ids:
+            wanted = {str(resource_id) for resource_id in resource_ids}
+            resources = [resource for resource in resources if str(resource["ID"]) in wanted]
+
+        # リクエスト間隔は共有のレートリミッタで制御される
+        end_ts = int(time.time())
+        start = format_time(end_ts - window_minutes * 60)
+        end = format_time(end_ts)
+        responses = await gather_with_concurrency(
+            concurrency,
+            [
+                lambda resource=resource: self._fetch_monitor(ctx, resource, start, end)
+                for resource in resources
+            ],
+        )
+        return resources, responses, errors
+
+    async def _list_resources(
+        self, ctx: Context, zone: str, resource_types: List[str]
+    ) -> Union[List[Dict[str, Any]], str]:
+        """ゾーン内の対象リソース（ルータ・アプライアンス）を列挙する"""
+        requests = []
+        if "router" in resource_types:
+            requests.append(("internet", ["ID", "Name"]))
+        if "vpcrouter" in resource_types or "database" in resource_types:
+            requests.append(("appliance", ["ID", "Name", "Class"]))
+
+        resources = []
+        for path, include in requests:
+            # 検索条件はJSONをクエリ文字列として渡す
+            query = quote(json.dumps({"Include": include}, separators=(",", ":")))
+            response = await self.handle_api_request(
+                ctx, HttpMethod.GET, f"{self.zone_urls[zone]}{path}?{query}"
+            )
+            if isinstance(response, str):
+                return response
+
+            if path == "internet":
+                for router in response.get("Internet", []):
+                    resources.append(self._resource(zone, "router", router))
+                continue
+            for appliance in response.get("Appliances", []):
+                resource_type = self._appliance_type(appliance.get("Class"))
+                if resource_type in resource_types:
+                    resources.append(self._resource(zone, resource_type, appliance))
+        return resources
+
+    async def _fetch_monitor(
+        self, ctx: Context, resource: Dict[str, Any], start: str, end: str
+    ) -> Union[Dict[str, Any], str]:
+        """リソースのネットワーク流量のモニタ情報を取得する（ルータ・VPNルータのツールとキャッシュを共有する）"""
+        path, key = self._monitor_target(resource)
+        url = f"{self.zone_urls[resource['Zone']]}{path}"
+
+        async def fetch(fetch_start: str, fetch_end: str) -> Union[Dict[str, Any], str]:
+            params = {"Start": fetch_start, "End": fetch_end}
+            return await self.handle_api_request(ctx, HttpMethod.GET, url, params=params)
+
+        return await MONITOR_STORE.get(key, fetch, start, end)
+
+    @staticmethod
+    def _monitor_target(resource: Dict[str, Any]) -> Tuple[str, Tuple[Any, ...]]:
+        """リソースのモニタ情報のパスとキャッシュキーを返す"""
+        zone, resource_id = resource["Zone"], resource["ID"]
+        if resource["Type"] == "router":
+            return f"internet/{resource_id}/monitor", (zone, "internet", resource_id, None)
+        return f"appliance/{resource_id}/interface/monitor", (zone, "appliance", resource_id, None)
+
+    @staticmethod
+    def _appliance_type(appliance_class: Optional[str]) -> Optional[str]:
+        """アプライアンスのClassをリソース種別に変換する"""
+        if appliance_class in ("vpcrouter", "vpnrouter"):
+            return "vpcrouter"
+        if appliance_class == "database":
+            return "database"
+        return None
+
+    @staticmethod
+    def _resource(zone: str, resource_type: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """列挙したリソースを共通の形式に変換する"""
+        return {"Zone": zone, "Type": resource_type, "ID": item.get("ID"), "Name": item.get("Name")}
@@ -2,6 +2,7 @@ from core.auth import get_api_key
 from networking.handlers.bridge import BridgeHandler
 from networking.handlers.router import RouterHandler
 from networking.handlers.switch import SwitchHandler
+from networking.handlers.teardown import TeardownHandler
 
 
 def initialize_networking(mcp, zone_urls):
@@ -21,4 +22,5 @@ def initialize_networking(mcp, zone_urls):
         "bridge": BridgeHandler(mcp, zone_urls, api_key),
         "switch": SwitchHandler(mcp, zone_urls, api_key),
         "router": RouterHandler(mcp, zone_urls, api_key),
+        "teardown": TeardownHandler(mcp, zone_urls, api_key),
     }
@@ -3,6 +3,7 @@ from mcp.server.fastmcp import Context
 
 from core.auth import SacloudApiKey
 from core.handlers.base import BaseHandler, HttpMethod
+from core.monitor import MONITOR_STORE, summarize_monitor
 
 
 class RouterHandler(BaseHandler):
@@ -137,18 +138,25 @@ class RouterHandler(BaseHandler):
         internet_id: str,
         start: Optional[str] = None,
         end: Optional[str] = None,
+        summarize: bool = False,
+        bucket_minutes: Optional[int] = None,
     ) -> Union[Dict[str, Any], str]:
         """さくらのクラウドAPIからルータのネットワーク流量のリソースモニタ情報を取得します
+            期間が長い場合は、summarizeまたはbucket_minutesを指定して要約を取得してください
 
         Args:
             zone (str): 取得対象のゾーン
             internet_id (str): ルータID
             start (str, optional): 開始時刻（ISO形式、デフォルトは終了時刻の24時間前）
             end (str, optional): 終了時刻（ISO形式、デフォルトは開始時刻の24時間後）
+            summarize (bool, optional): 全サンプルの代わりに統計値の要約を返すか（デフォルト: False）
+            bucket_minutes (int, optional): 要約に含めるバケットの間隔（分）
 
         Returns:
             dict: ルータの監視データのJSONレスポンス
                 - 監視データの詳細構造はAPIから返される形式に依存
+                - 要約時はPoints, Start, End, Metrics（項目ごとのMin, Max, Mean, P95, Sum, PeakAt）,
+                  Buckets（バケットごとの平均値と最大値）を返す
         """
         # 前処理（ゾーン検証 + 認証チェック）
         error = self.validate_request_context(zone)
@@ -159,16 +167,21 @@ class RouterHandler(BaseHandler):
         if not internet_id:
             return "ルータIDは必須です。"
 
+        # バケット間隔の検証
+        if bucket_minutes is not None and bucket_minutes < 1:
+            return "バケットの間隔は1分以上で指定する必要があります。"
+
         url = f"{self.zone_urls[zone]}internet/{internet_id}/monitor"
 
-        # クエリパラメータを構築
-        params = {}
-        if start:
-            params["Start"] = start
-        if end:
-            params["End"] = end
+        async def fetch(fetch_start: str, fetch_end: str) -> Union[Dict[str, Any], str]:
+            params = {"Start": fetch_start, "End": fetch_end}
+            return await self.handle_api_request(ctx, HttpMethod.GET, url, params=params)
 
-        return await self.handle_api_request(ctx, HttpMethod.GET, url, params=params)
+        # キャッシュ済みの期間はローカルから返し、未取得の期間のみAPIから取得する
+        response = await MONITOR_STORE.get((zone, "internet", internet_id, None), fetch, start, end)
+        if isinstance(response, str) or not (summarize or bucket_minutes):
+            return response
+        return summarize_monitor(response, bucket_minutes)
 
     async def delete_router(
         self, ctx: Context, zone: str, internet_id: str
@@ -0,0 +1,398 @@
+import asyncio
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple, Union
+from mcp.server.fastmcp import Context
+
+from core.auth import SacloudApiKey
+from core.concurrency import (
+    DEFAULT_CONCURRENCY,
+    gather_with_concurrency,
+    validate_concurrency,
+)
+from core.handlers.base import BaseHandler, HttpMethod
+
+# 削除処理の単位（アクション, リソースID）
+Node = Tuple[str, str]
+
+STOP_SERVER = "stop_server"
+DELETE_SERVER = "delete_server"
+DISCONNECT_INTERFACE = "disconnect_interface"
+DISCONNECT_BRIDGE = "disconnect_bridge"
+DELETE_SWITCH = "delete_switch"
+DELETE_ROUTER = "delete_router"
+DELETE_BRIDGE = "delete_bridge"
+
+
+def _ref_id(resource: Dict[str, Any], key: str) -> Optional[str]:
+    """{"Switch": {"ID": ...}} のような参照からIDを取り出す"""
+    ref = resource.get(key)
+    return ref.get("ID") if isinstance(ref, dict) else None
+
+
+def _is_running(server: Optional[Dict[str, Any]]) -> bool:
+    """サーバーが起動中か判定する"""
+    return ((server or {}).get("Instance") or {}).get("Status") == "up"
+
+
+def _is_selected(resource: Dict[str, Any], ids: Set[str], tag: Optional[str]) -> bool:
+    """リソースがIDまたはタグで選択されているか判定する"""
+    return resource.get("ID") in ids or bool(tag and tag in (resource.get("Tags") or []))
+
+
+def build_teardown_graph(
+    resources: Dict[str, List[Dict[str, Any]]],
+    resource_ids: Iterable[str],
+    tag: Optional[str],
+    with_disks: bool = False,
+) -> Tuple[Dict[Node, Dict[str, Any]], Dict[Node, Set[Node]], List[str], List[Dict[str, Any]]]:
+    """選択されたリソースを削除するための依存グラフを構築する
+
+    Args:
+        resources: ゾーン内のリソース一覧（Servers, Interfaces, Switches, Internet, Bridges）
+        resource_ids: 削除対象のリソースIDのリスト
+        tag: 削除対象のリソースのタグ
+        with_disks: サーバーの削除時に接続されたディスクも削除するか
+
+    Returns:
+        Tuple: 以下の4つ
+            - 各ノードの情報（Name, Path, Body）
+            - 各ノードから、そのノードの完了後に実行すべきノードへの辺
+            - 見つからなかったリソースID
+            - 削除の妨げとなるNIC（削除するスイッチに接続された、起動中の対象外サーバーのNIC）
+    """
+    ids = set(resource_ids)
+    servers = {s["ID"]: s for s in resources.get("Servers", [])}
+    switches = {s["ID"]: s for s in resources.get("Switches", [])}
+    routers = {r["ID"]: r for r in resources.get("Internet", [])}
+    bridges = {b["ID"]: b for b in resources.get("Bridges", [])}
+    router_by_switch = {
+        _ref_id(r, "Switch"): r["ID"] for r in routers.values() if _ref_id(r, "Switch")
+    }
+
+    selected_servers = {i for i, s in servers.items() if _is_selected(s, ids, tag)}
+    selected_routers = {i for i, r in routers.items() if _is_selected(r, ids, tag)}
+    selected_switches = set()
+    for switch_id, switch in switches.items():
+        if not _is_selected(switch, ids, tag):
+            continue
+        # ルータのスイッチはルータの削除で一緒に削除される
+        if switch_id in router_by_switch:
+            selected_routers.add(router_by_switch[switch_id])
+        else:
+            selected_switches.add(switch_id)
+    selected_bridges = {i for i, b in bridges.items() if _is_selected(b, ids, tag)}
+    known_ids = set(servers) | set(switches) | set(routers) | set(bridges)
+    not_found = sorted(ids - known_ids)
+
+    nodes: Dict[Node, Dict[str, Any]] = {}
+    edges: Dict[Node, Set[Node]] = {}
+    blockers: List[Dict[str, Any]] = []
+
+    def add_node(node: Node, name: Optional[str], path: str, body=None) -> Node:
+        nodes.setdefault(node, {"Name": name, "Path": path, "Body": body})
+        edges.setdefault(node, set())
+        return node
+
+    def add_edge(before: Node, after: Node) -> None:
+        edges[before].add(after)
+
+    # スイッチIDから、そのスイッチを削除するノードへの対応
+    switch_deletes: Dict[str, Node] = {}
+    for switch_id in selected_switches:
+        switch_deletes[switch_id] = add_node(
+            (DELETE_SWITCH, switch_id), switches[switch_id].get("Name"), f"switch/{switch_id}"
+        )
+    for router_id in selected_routers:
+        node = add_node(
+            (DELETE_ROUTER, router_id), routers[router_id].get("Name"), f"internet/{router_id}"
+        )
+        switch_id = _ref_id(routers[router_id], "Switch")
+        if switch_id:
+            switch_deletes[switch_id] = node
+
+    for server_id in selected_servers:
+        server = servers[server_id]
+        body = None
+        if with_disks and server.get("Disks"):
+            body = {"WithDisk": [disk["ID"] for disk in server["Disks"]]}
+        delete = add_node(
+            (DELETE_SERVER, server_id), server.get("Name"), f"server/{server_id}", body
+        )
+        # 起動中のサーバーは強制停止してから削除する
+        if _is_running(server):
+            stop = add_node(
+                (STOP_SERVER, server_id),
+                server.get("Name"),
+                f"server/{server_id}/power",
+                {"Force": True},
+            )
+            add_edge(stop, delete)
+
+    # 削除するスイッチに接続されたNICは、サーバーの削除または切断の後にスイッチを削除する
+    for interface in resources.get("Interfaces", []):
+        switch_id = _ref_id(interface, "Switch")
+        if switch_id not in switch_deletes:
+            continue
+        server_id = _ref_id(interface, "Server")
+        if server_id in selected_servers:
+            add_edge((DELETE_SERVER, server_id), switch_deletes[switch_id])
+        elif _is_running(servers.get(server_id)):
+            # 起動中のサーバーのNICは切断できないため、実行せずに利用者へ報告する
+            blockers.append(
+                {
+                    "InterfaceID": interface["ID"],
+                    "ServerID": server_id,
+                    "ServerName": (interface.get("Server") or {}).get("Name"),
+                    "SwitchID": switch_id,
+                }
+            )
+        else:
+            disconnect = add_node(
+                (DISCONNECT_INTERFACE, interface["ID"]),
+                (interface.get("Server") or {}).get("Name"),
+                f"interface/{interface['ID']}/to/switch",
+            )
+            add_edge(disconnect, switch_deletes[switch_id])
+
+    # ブリッジに接続されたスイッチは、スイッチ・ブリッジの削除の前にブリッジから切断する
+    bridge_deletes = {
+        bridge_id: add_node(
+            (DELETE_BRIDGE, bridge_id), bridges[bridge_id].get("Name"), f"bridge/{bridge_id}"
+        )
+        for bridge_id in selected_bridges
+    }
+    for switch_id, switch in switches.items():
+        bridge_id = _ref_id(switch, "Bridge")
+        if not bridge_id:
+            continue
+        if switch_id not in switch_deletes and bridge_id not in bridge_deletes:
+            continue
+        disconnect = add_node(
+            (DISCONNECT_BRIDGE, switch_id), switch.get("Name"), f"switch/{switch_id}/to/bridge"
+        )
+        if switch_id in switch_deletes:
+            add_edge(disconnect, switch_deletes[switch_id])
+        if bridge_id in bridge_deletes:
+            add_edge(disconnect, bridge_deletes[bridge_id])
+
+    return nodes, edges, not_found, blockers
+
+
+def plan_levels(edges: Dict[Node, Set[Node]]) -> List[List[Node]]:
+    """依存グラフを、同じレベル内で並列に実行できるノードのリストに分割する
+
+    Args:
+        edges: 各ノードから、そのノードの完了後に実行すべきノードへの辺
+
+    Returns:
+        List[List[Node]]: 実行順のレベルごとのノードのリスト
+
+    Raises:
+        ValueError: 依存関係が循環している場合
+    """
+    in_degree = {node: 0 for node in edges}
+    for afters in edges.values():
+        for after in afters:
+            in_degree[after] += 1
+
+    levels = []
+    current = sorted(node for node, degree in in_degree.items() if degree == 0)
+    while current:
+        levels.append(current)
+        following = set()
+        for node in current:
+            for after in edges[node]:
+                in_degree[after] -= 1
+                if in_degree[after] == 0:
+                    following.add(after)
+        current = sorted(following)
+
+    if sum(len(level) for level in levels) != len(edges):
+        raise ValueError("リソースの依存関係が循環しています。")
+    return levels
+
+
+class TeardownHandler(BaseHandler):
+    """ネットワークリソースを依存関係の順に一括削除するハンドラークラス"""
+
+    DEFAULT_RETRIES = 5
+    RETRY_BACKOFF_SECONDS = 2.0
+
+    def __init__(self, mcp, zone_urls, api_key: SacloudApiKey):
+        """一括削除ハンドラーの初期化
+        MCPサーバーのインスタンスを受け取り、一括削除用のツールを登録。
+
+        Args:
+            mcp: MCPサーバーインスタンス
+            zone_urls: ゾーンとAPIベースURLのマッピング辞書
+            api_key: さくらのクラウドAPIキー
+        """
+        super().__init__(mcp, zone_urls, api_key)
+
+        # ツールを登録
+        self.mcp.tool(name="teardown_resources")(self.teardown_resources)
+
+    ### MCPツールメソッド
+
+    async def teardown_resources(
+        self,
+        ctx: Context,
+        zone: str,
+        resource_ids: Optional[List[str]] = None,
+        tag: Optional[str] = None,
+        with_disks: bool = False,
+        dry_run: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> Union[Dict[str, Any], str]:
+        """さくらのクラウドAPIでサーバー・スイッチ・ルータ・ブリッジを依存関係の順に一括削除します
+            NICの接続関係から依存グラフを構築し、同じレベルのリソースは並列に削除します
+            起動中のサーバーは強制停止してから削除し、削除するスイッチに接続された対象外のサーバーのNICは切断します
+            ただし対象外のサーバーが起動中の場合はNICを切断できないため、Blockersとして返し削除を実行しません
+            実行前に必ずdry_run=Trueで削除計画をユーザに提示し、確認を得てからdry_run=Falseで実行してください
+
+        Args:
+            zone (str): 対象ゾーン
+            resource_ids (list[str], optional): 削除対象のリソースID（サーバー・スイッチ・ルータ・ブリッジ）
+            tag (str, optional): 削除対象のリソースのタグ
+            with_disks (bool, optional): サーバーに接続されたディスクも削除するか（デフォルト: False）
+            dry_run (bool, optional): 削除計画のみを返し、実行しないか（デフォルト: True）
+            concurrency (int, optional): 同じレベル内の同時実行数（デフォルト: 10）
+            retries (int, optional): 一時的なエラー時の再試行回数（デフォルト: 5）
+
+        Returns:
+            dict: 削除計画と実行結果
+                - Plan: レベルごとの処理のリスト
+                    - Action: 処理内容
+                    - ID: リソースID
+                    - Name: リソース名
+                - NotFound: 見つからなかったリソースID
+                - Blockers: 削除の妨げとなる、起動中の対象外サーバーのNIC
+                    - InterfaceID: NICのリソースID
+                    - ServerID: サーバーのリソースID
+                    - ServerName: サーバー名
+                    - SwitchID: 接続先のスイッチのリソースID
+                - Error: 削除を実行できなかった理由（Blockersがある場合のみ）
+                - Results: 処理ごとの結果（dry_run=Falseの場合のみ）
+                    - Result: "ok"、"error" または "skipped"（依存する処理が失敗した場合）
+                    - Message: エラーメッセージ（エラー時のみ）
+                - Summary: 処理結果の集計（dry_run=Falseの場合のみ）
+        """
+        # 前処理（ゾーン検証 + 認証チェック）
+        error = self.validate_request_context(zone)
+        if error:
+            return error
+
+        if not resource_ids and not tag:
+            return "削除対象のリソースID(resource_ids)またはタグ(tag)のいずれかを指定してください。"
+
+        concurrency_error = validate_concurrency(concurrency)
+        if concurrency_error:
+            return concurrency_error
+
+        resources = await self._fetch_resources(ctx, zone)
+        if isinstance(resources, str):
+            return resources
+
+        nodes, edges, not_found, blockers = build_teardown_graph(
+            resources, resource_ids or [], tag, with_disks
+        )
+        try:
+            levels = plan_levels(edges)
+        except ValueError as e:
+            return str(e)
+
+        result: Dict[str, Any] = {
+            "Plan": [
+                [
+                    {
+                        "Action": action,
+                        "ID": resource_id,
+                        "Name": nodes[(action, resource_id)]["Name"],
+                    }
+                    for action, resource_id in level
+                ]
+                for level in levels
+            ],
+            "NotFound": not_found,
+            "Blockers": blockers,
+        }
+        if dry_run:
+            return result
+
+        if blockers:
+            result["Error"] = (
+                "削除するスイッチに起動中の対象外サーバーのNICが接続されているため、削除を実行できません。"
+                "サーバーを停止するか、削除対象に含めてください。"
+            )
+            return result
+
+        predecessors: Dict[Node, Set[Node]] = {node: set() for node in nodes}
+        for before, afters in edges.items():
+            for after in afters:
+                predecessors[after].add(before)
+
+        failed: Set[Node] = set()
+        results = []
+        for index, level in enumerate(levels):
+            await ctx.report_progress(index, len(levels), f"レベル{index + 1}を削除しています")
+
+            async def run(node: Node) -> Dict[str, Any]:
+                action, resource_id = node
+                row = {"Action": action, "ID": resource_id, "Name": nodes[node]["Name"]}
+                # 依存する処理が失敗している場合は実行しない
+                if predecessors[node] & failed:
+                    return {**row, "Result": "skipped"}
+                response = await self.handle_api_request(
+                    ctx,
+                    HttpMethod.DELETE,
+                    f"{self.zone_urls[zone]}{nodes[node]['Path']}",
+                    nodes[node]["Body"],
+                    retries=retries,
+                    backoff_seconds=self.RETRY_BACKOFF_SECONDS,
+                )
+                if isinstance(response, str):
+                    return {**row, "Result": "error", "Message": response}
+                return {**row, "Result": "ok"}
+
+            level_results = await gather_with_concurrency(
+                concurrency, [lambda node=node: run(node) for node in level]
+            )
+            for node, row in zip(level, level_results):
+                if row["Result"] != "ok":
+                    failed.add(node)
+                results.append({"Level": index + 1, **row})
+
+        await ctx.report_progress(len(levels), len(levels), "完了しました")
+        result["Results"] = results
+        result["Summary"] = {
+            status: sum(1 for row in results if row["Result"] == status)
+            for status in ("ok", "error", "skipped")
+        }
+        return result
+
+    ### 内部メソッド
+
+    async def _fetch_resources(
+        self, ctx: Context, zone: str
+    ) -> Union[Dict[str, List[Dict[str, Any]]], str]:
+        """依存グラフの構築に必要なリソース一覧を並列に取得する"""
+        paths = {
+            "Servers": "server",
+            "Interfaces": "interface",
+            "Switches": "switch",
+            "Internet": "internet",
+            "Bridges": "bridge",
+        }
+        responses = await asyncio.gather(
+            *(
+                self.handle_api_request(ctx, HttpMethod.GET, f"{self.zone_urls[zone]}{path}")
+                for path in paths.values()
+            )
+        )
+
+        resources = {}
+        for key, response in zip(paths, responses):
+            if isinstance(response, str):
+                return response
+            resources[key] = response.get(key) or []
+        return resources
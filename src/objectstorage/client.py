@@ -0,0 +1,90 @@
+import functools
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+import boto3
+from botocore.config import Config
+
+from core.auth import ObjectStorageApiKey
+from core.executor import BoundedExecutor
+
+T = TypeVar("T")
+
+# さくらのオブジェクトストレージのS3互換APIのリージョン
+S3_REGION = "jp-north-1"
+
+# 1つのクライアントで保持するHTTPコネクション数の上限
+S3_MAX_POOL_CONNECTIONS = 20
+
+# S3互換APIのクライアントの設定
+# コネクションはTCPキープアライブで維持し、スロットリング・一時的なエラーは再試行する
+S3_CLIENT_CONFIG = Config(
+    signature_version="s3v4",
+    s3={"addressing_style": "path"},
+    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60,
+    retries={"max_attempts": 3, "mode": "standard"},
+)
+
+# boto3の呼び出しは同期的なため、イベントループを止めないようスレッドで実行する
+# スレッド数はコネクションプールの上限と揃え、待機中を含む投入数はその4倍までとする
+S3_EXECUTOR = BoundedExecutor(
+    "thread", S3_MAX_POOL_CONNECTIONS, S3_MAX_POOL_CONNECTIONS * 4, name="s3"
+)
+
+_CLIENTS: Dict[Tuple[str, str, str], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_s3_client(endpoint: str, objectstorage_api_key: ObjectStorageApiKey) -> Any:
+    """エンドポイントと認証情報の組ごとに1つ作成したS3クライアントを返す
+
+    クライアントの作成（セッション・認証情報・エンドポイントの解決）は1回あたり数ミリ秒から数十ミリ秒かかるため、
+    一度作成したクライアントを使い回し、コネクションプールも共有する。
+    botocoreのクライアントはスレッドセーフなため、複数のスレッドから同時に使える。
+
+    Args:
+        endpoint: S3互換APIのエンドポイントのURL
+        objectstorage_api_key: アクセスキーIDとシークレットアクセスキー
+
+    Returns:
+        S3クライアント
+    """
+    access_key, secret_key = objectstorage_api_key
+    # シークレットアクセスキーそのものはキーに含めない
+    key = (endpoint, access_key, hashlib.sha256(secret_key.encode("utf-8")).hexdigest())
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            # boto3の既定のセッションはスレッドセーフでないため、クライアントごとにセッションを作成する
+            client = boto3.session.Session().client(
+                "s3",
+                endpoint_url=endpoint,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                config=S3_CLIENT_CONFIG,
+                region_name=S3_REGION,
+            )
+            _CLIENTS[key] = client
+        return client
+
+
+def clear_s3_clients() -> None:
+    """作成したクライアントをすべて破棄する（コネクションも閉じる）"""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+async def run_s3(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """S3クライアントの呼び出しをスレッドで実行し、結果を返す
+
+    呼び出し元がキャンセルされた場合、開始前の呼び出しは取り消される。
+    実行中の呼び出しは中断できないため、結果を破棄する（クライアントのタイムアウトで終了する）。
+    """
+    return await S3_EXECUTOR.run(functools.partial(func, *args, **kwargs))
@@ -2,8 +2,10 @@ import httpx
 from core.auth import SacloudApiKey,ObjectStorageApiKey,check_auth,check_objectstorage_auth
 from mcp.server.fastmcp import Context
 import os
-import boto3
-from botocore.config import Config
+from typing import Optional
+from core.concurrency import DEFAULT_CONCURRENCY, validate_concurrency
+from objectstorage.client import get_s3_client, run_s3
+from objectstorage.listing import MAX_LIST_KEYS, S3_LIST_PAGE_SIZE, list_objects, list_objects_parallel
 
 class ObjectStorageHandler:
         """オブジェクトストレージ操作用のハンドラークラス"""
@@ -31,6 +33,7 @@ class ObjectStorageHandler:
             self.mcp.tool(name='get_objectstorage_site_list')(self.get_objectstorage_site_list)
             self.mcp.tool(name='get_objectstorage_accesskey_list')(self.get_objectstorage_accesskey_list)
             self.mcp.tool(name='get_objectstorage_bucket_list')(self.get_objectstorage_bucket_list)
+            self.mcp.tool(name='get_objectstorage_object_list')(self.get_objectstorage_object_list)
 
         async def get_objectstorage_site_list(self,ctx:Context):
             """さくらのクラウドAPIからオブジェクトストレージのサイト一覧を取得します。
@@ -127,23 +130,83 @@ class ObjectStorageHandler:
                 return auth_error
             
             endpoint = f"{self.objectstorage_zone_urls[zone]}"
-            config = Config(
-                signature_version='s3v4',
-                s3={'addressing_style': 'path'}
-            )
-            
-            s3 = boto3.client(
-                's3',
-                endpoint_url=endpoint,
-                aws_access_key_id=self.objectstorage_api_key[0],
-                aws_secret_access_key=self.objectstorage_api_key[1],
-                config=config,
-                region_name='jp-north-1'
-            )
             try:
-                resp = s3.list_buckets()
+                # クライアントはエンドポイントと認証情報ごとに使い回し、呼び出しはスレッドで実行する
+                s3 = await run_s3(get_s3_client, endpoint, self.objectstorage_api_key)
+                resp = await run_s3(s3.list_buckets)
                 return resp
 
             except Exception as e:
                 await ctx.error(f"get objectstorage failed:{e}")
-                return f"オブジェクトストレージのバケット一覧取得に失敗しました。{e}"
\ No newline at end of file
+                return f"オブジェクトストレージのバケット一覧取得に失敗しました。{e}"
+
+        async def get_objectstorage_object_list(
+            self,
+            ctx:Context,
+            bucket:str,
+            prefix:str="",
+            delimiter:Optional[str]=None,
+            max_keys:int=S3_LIST_PAGE_SIZE,
+            cursor:Optional[str]=None,
+            parallel:bool=False,
+            concurrency:int=DEFAULT_CONCURRENCY,
+        ):
+            """オブジェクトストレージのバケットのオブジェクト一覧を取得します。
+
+            1回の呼び出しで返すオブジェクトはmax_keys件までとし、続きがある場合はNextCursorを返します。
+            続きはNextCursorをcursorに指定し、同じbucket・parallelで呼び出して取得してください。
+
+            Args:
+                bucket (str): バケット名
+                prefix (str, optional): 取得するオブジェクトのキーのプレフィックス（例: "logs/2024/"）
+                delimiter (str, optional): キーをまとめる区切り文字（例: "/"）。
+                    parallelがFalseの場合、区切り文字までが同じキーはCommonPrefixesにまとめて返す。
+                    parallelがTrueの場合、prefix直下をこの区切り文字（省略時は "/"）で分割して並列に取得する。
+                max_keys (int, optional): 1回で返すオブジェクトの最大数（1-10000、デフォルト: 1000）
+                cursor (str, optional): 前回の結果のNextCursor
+                parallel (bool, optional): prefix直下の共通のプレフィックスごとに並列に取得する（大きなバケット向け、キーの順序は整列しない）
+                concurrency (int, optional): 並列に取得するプレフィックス数（1-50、デフォルト: 10）
+
+            Returns:
+                dict: オブジェクト一覧
+                    - Bucket (str): バケット名
+                    - Prefix (str): プレフィックス
+                    - KeyCount (int): 返したオブジェクトの数
+                    - Contents (list): オブジェクトのリスト
+                        - Key (str): キー
+                        - Size (int): サイズ（バイト）
+                        - LastModified (str): 更新日時（ISO 8601 形式）
+                    - CommonPrefixes (list): 共通のプレフィックスのリスト（parallelがFalseでdelimiterを指定した場合）
+                    - NextCursor (str): 続きを取得するカーソル（最後まで取得した場合はnull）
+            """
+            zone = "s3is1a"
+            auth_error = check_objectstorage_auth(self.objectstorage_api_key)
+            if auth_error:
+                return auth_error
+            if not bucket:
+                return "bucketを指定してください"
+            if not 1 <= max_keys <= MAX_LIST_KEYS:
+                return f"max_keysは1-{MAX_LIST_KEYS}の範囲で指定してください"
+            concurrency_error = validate_concurrency(concurrency)
+            if concurrency_error:
+                return concurrency_error
+
+            endpoint = f"{self.objectstorage_zone_urls[zone]}"
+            try:
+                s3 = await run_s3(get_s3_client, endpoint, self.objectstorage_api_key)
+                if parallel:
+                    result = await list_objects_parallel(s3, bucket, prefix, delimiter, max_keys, cursor, concurrency)
+                else:
+                    result = await list_objects(s3, bucket, prefix, delimiter, max_keys, cursor)
+            except ValueError as e:
+                return str(e)
+            except Exception as e:
+                await ctx.error(f"get objectstorage objects failed:{e}")
+                return f"オブジェクトストレージのオブジェクト一覧取得に失敗しました。{e}"
+
+            return {
+                "Bucket": bucket,
+                "Prefix": prefix,
+                "KeyCount": len(result["Contents"]),
+                **result,
+            }
@@ -0,0 +1,209 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional
+
+from core.concurrency import gather_with_concurrency
+from objectstorage.client import run_s3
+
+# ListObjectsV2の1回のリクエストで取得する件数の上限（S3の上限）
+S3_LIST_PAGE_SIZE = 1000
+
+# 1回の呼び出しで返すオブジェクト数の上限
+MAX_LIST_KEYS = 10000
+
+# 並列に取得する場合に、共通のプレフィックスで分割する区切り文字のデフォルト
+DEFAULT_FANOUT_DELIMITER = "/"
+
+
+def object_summary(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """オブジェクトの情報をキー・サイズ・更新日時に絞る"""
+    last_modified = obj.get("LastModified")
+    return {
+        "Key": obj["Key"],
+        "Size": obj.get("Size"),
+        "LastModified": last_modified.isoformat()
+        if hasattr(last_modified, "isoformat")
+        else last_modified,
+    }
+
+
+def list_objects_page(
+    s3: Any,
+    bucket: str,
+    prefix: str,
+    delimiter: Optional[str],
+    max_keys: int,
+    token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """ListObjectsV2のページネータで、最大max_keys件（オブジェクトと共通のプレフィックスの合計）を取得する
+
+    ページネータのページの件数は固定のため、次のページを含めると上限を超える場合はそこで止め、
+    続きのContinuationTokenを返す。スレッドで実行する。
+
+    Returns:
+        Dict[str, Any]: 取得結果
+            - Contents: オブジェクトのリスト（Key, Size, LastModified）
+            - CommonPrefixes: 共通のプレフィックスのリスト
+            - Token: 続きのContinuationToken（最後まで取得した場合はNone）
+    """
+    page_size = min(S3_LIST_PAGE_SIZE, max_keys)
+    params: Dict[str, Any] = {"Bucket": bucket, "Prefix": prefix}
+    if delimiter:
+        params["Delimiter"] = delimiter
+    if token:
+        params["ContinuationToken"] = token
+
+    contents: List[Dict[str, Any]] = []
+    prefixes: List[str] = []
+    next_token = None
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(**params, PaginationConfig={"PageSize": page_size}):
+        contents.extend(object_summary(obj) for obj in page.get("Contents", []))
+        prefixes.extend(common["Prefix"] for common in page.get("CommonPrefixes", []))
+        next_token = page.get("NextContinuationToken") if page.get("IsTruncated") else None
+        if not next_token or len(contents) + len(prefixes) + page_size > max_keys:
+            break
+    return {"Contents": contents, "CommonPrefixes": prefixes, "Token": next_token}
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """続きを取得するための状態をカーソルの文字列にする"""
+    return base64.urlsafe_b64encode(
+        json.dumps(state, separators=(",", ":")).encode("utf-8")
+    ).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """カーソルの文字列から状態を復元する（不正な場合はValueError）"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError("cursorが不正です。前回の結果のNextCursorを指定してください") from e
+    if not isinstance(state, dict) or not isinstance(state.get("Shards"), list):
+        raise ValueError("cursorが不正です。前回の結果のNextCursorを指定してください")
+    return state
+
+
+async def list_objects(
+    s3: Any,
+    bucket: str,
+    prefix: str = "",
+    delimiter: Optional[str] = None,
+    max_keys: int = S3_LIST_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """バケットのオブジェクトを1つのページネータで順に取得する
+
+    Returns:
+        Dict[str, Any]: 取得結果
+            - Contents: オブジェクトのリスト（Key, Size, LastModified）
+            - CommonPrefixes: 共通のプレフィックスのリスト（delimiterを指定した場合）
+            - NextCursor: 続きを取得するカーソル（最後まで取得した場合はNone）
+    """
+    token = None
+    if cursor:
+        state = decode_cursor(cursor)
+        if state.get("Bucket") != bucket or state.get("Parallel") or len(state["Shards"]) != 1:
+            raise ValueError(
+                "cursorが別の条件の取得結果のものです。同じbucket・parallelで指定してください"
+            )
+        prefix, delimiter, token = state["Shards"][0]
+
+    result = await run_s3(list_objects_page, s3, bucket, prefix, delimiter, max_keys, token)
+    next_cursor = None
+    if result["Token"]:
+        next_cursor = encode_cursor(
+            {"Bucket": bucket, "Parallel": False, "Shards": [[prefix, delimiter, result["Token"]]]}
+        )
+    return {
+        "Contents": result["Contents"],
+        "CommonPrefixes": result["CommonPrefixes"],
+        "NextCursor": next_cursor,
+    }
+
+
+async def list_objects_parallel(
+    s3: Any,
+    bucket: str,
+    prefix: str = "",
+    delimiter: Optional[str] = None,
+    max_keys: int = S3_LIST_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    concurrency: int = 10,
+) -> Dict[str, Any]:
+    """バケットのオブジェクトを、共通のプレフィックスごとに並列に取得する
+
+    prefix直下を区切り文字（デフォルトは "/"）で取得して共通のプレフィックスを見つけ、
+    各プレフィックス配下を別々のページネータで並列に取得する。
+    1回の呼び出しで返すオブジェクトは合計max_keys件までとし、件数に達するまでプレフィックスの発見と
+    並列の取得を繰り返す。残りのプレフィックスとそれぞれの続きのContinuationTokenをカーソルに保存する。
+    prefix直下は1回に並列数程度ずつ取得するため、カーソルに保存するプレフィックスは並列数の2倍程度までとなる。
+    結果はプレフィックスごとにまとめて返すため、キーの順序は呼び出しをまたいで整列しない。
+
+    Returns:
+        Dict[str, Any]: 取得結果
+            - Contents: オブジェクトのリスト（Key, Size, LastModified）
+            - NextCursor: 続きを取得するカーソル（最後まで取得した場合はNone）
+    """
+    if cursor:
+        state = decode_cursor(cursor)
+        if state.get("Bucket") != bucket or not state.get("Parallel"):
+            raise ValueError(
+                "cursorが別の条件の取得結果のものです。同じbucket・parallelで指定してください"
+            )
+        root = state.get("Root")
+        shards = state["Shards"]
+    else:
+        # prefix直下（Tokenが空文字列の場合は未取得）
+        root = [prefix, delimiter or DEFAULT_FANOUT_DELIMITER, ""]
+        shards = []
+
+    contents: List[Dict[str, Any]] = []
+    remaining = max_keys
+    while remaining > 0 and (root or shards):
+        # 並列に取得するプレフィックスが足りない場合のみ、prefix直下の続きを取得して見つける
+        # 1回に見つけるプレフィックスを並列数程度に抑え、カーソルに保存する未取得のプレフィックスを増やしすぎない
+        if root and len(shards) < concurrency:
+            root_prefix, root_delimiter, token = root
+            result = await run_s3(
+                list_objects_page,
+                s3,
+                bucket,
+                root_prefix,
+                root_delimiter,
+                min(remaining, concurrency),
+                token or None,
+            )
+            contents.extend(result["Contents"])
+            shards.extend([common, None] for common in result["CommonPrefixes"])
+            root = [root_prefix, root_delimiter, result["Token"]] if result["Token"] else None
+            remaining = max_keys - len(contents)
+
+        active = shards[: min(concurrency, remaining)] if remaining > 0 else []
+        if not active:
+            continue
+        budget = remaining // len(active)
+        results = await gather_with_concurrency(
+            concurrency,
+            [
+                lambda shard=shard: run_s3(
+                    list_objects_page, s3, bucket, shard[0], None, budget, shard[1]
+                )
+                for shard in active
+            ],
+        )
+        pending = []
+        for shard, result in zip(active, results):
+            contents.extend(result["Contents"])
+            if result["Token"]:
+                pending.append([shard[0], result["Token"]])
+        shards = pending + shards[len(active) :]
+        remaining = max_keys - len(contents)
+
+    next_cursor = None
+    if root or shards:
+        next_cursor = encode_cursor(
+            {"Bucket": bucket, "Parallel": True, "Root": root, "Shards": shards}
+        )
+    return {"Contents": contents, "NextCursor": next_cursor}
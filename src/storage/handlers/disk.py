@@ -1,4 +1,4 @@
-from typing import Dict, Any, Union
+from typing import Dict, Any, List, Optional, Union
 from mcp.server.fastmcp import Context
 
 from core.auth import SacloudApiKey
@@ -71,7 +71,7 @@ class DiskHandler(BaseHandler):
             zone (str): 作成対象のゾーン
             name (str): ディスク名（1-64文字）
             description (str, optional): ルータの説明（最大512文字）
-            plan (int): 標準プランは4、SSDプランは2
+            plan (int): SSDプランは4、標準プランは2
             size_mb (int): ディスクに割り当てる容量(例:20480(20GB))
             source_archive_id (str): アーカイブのID
             server_id (str): 紐付けるサーバ
@@ -90,7 +90,47 @@ class DiskHandler(BaseHandler):
         if error:
             return error
 
-        params = {
+        params = self.build_create_request(
+            name, description, plan, size_mb, source_archive_id, server_id
+        )
+        return await self.handle_api_request(ctx, HttpMethod.POST, url, params)
+
+    @staticmethod
+    def find_plan_size(
+        catalog: Dict[str, Any], plan_id: int, size_mb: int
+    ) -> Optional[Dict[str, Any]]:
+        """ディスクプランのカタログ（product/disk）から、指定したプラン・容量の利用可能なサイズを探す"""
+        for plan in catalog.get("DiskPlans", []):
+            if int(plan.get("ID", 0)) != plan_id:
+                continue
+            for size in plan.get("Size", []):
+                if size.get("SizeMB") == size_mb and size.get("Availability", "available") == "available":
+                    return size
+        return None
+
+    @staticmethod
+    def available_plan_sizes(catalog: Dict[str, Any], plan_id: int) -> Optional[List[int]]:
+        """ディスクプランのカタログ（product/disk）から、指定したプランで利用可能な容量(MB)を返す（プランがない場合はNone）"""
+        for plan in catalog.get("DiskPlans", []):
+            if int(plan.get("ID", 0)) == plan_id:
+                return sorted(
+                    size["SizeMB"]
+                    for size in plan.get("Size", [])
+                    if size.get("Availability", "available") == "available"
+                )
+        return None
+
+    @staticmethod
+    def build_create_request(
+        name: str,
+        description: str,
+        plan: Union[str, int],
+        size_mb: int,
+        source_archive_id: Union[str, int],
+        server_id: str,
+    ) -> Dict[str, Any]:
+        """ディスク作成APIのリクエストボディを構築する（作成と同時にサーバーへ接続する）"""
+        return {
             "Disk": {
                 "Name": name,
                 "Description": description,
@@ -101,4 +141,3 @@ class DiskHandler(BaseHandler):
                 "Server": {"ID": server_id},
             }
         }
-        return await self.handle_api_request(ctx, HttpMethod.POST, url, params)
@@ -0,0 +1,40 @@
+import pytest
+from appliance.handlers.vpn_router import VpnRouterHandler
+from core.handlers.base import HttpMethod
+from fastmcp import FastMCP
+
+
+class TestVpnRouterHandler:
+    """VpnRouterHandlerのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_get_vpn_monitor_uses_api_request(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], test_zone: str, monkeypatch
+    ):
+        """モニタ情報の取得が共通のAPIリクエスト処理を経由し、そのエラーを返すことのテスト"""
+        handler = VpnRouterHandler(mock_mcp, zone_urls, ("token", "secret"))
+        requests = []
+
+        async def handle_api_request(ctx, method, url, json_data=None, params=None, **kwargs):
+            requests.append((method, url, params))
+            return "さくらのクラウドAPIからエラーが返されました: 404"
+
+        monkeypatch.setattr(handler, "handle_api_request", handle_api_request)
+
+        result = await handler.get_vpn_monitor(
+            test_zone,
+            "113600000001",
+            None,
+            start="2025-01-01T00:00:00+09:00",
+            end="2025-01-01T01:00:00+09:00",
+            interface_index=1,
+        )
+
+        assert result == "さくらのクラウドAPIからエラーが返されました: 404"
+        assert requests == [
+            (
+                HttpMethod.GET,
+                f"{zone_urls[test_zone]}appliance/113600000001/interface/1/monitor",
+                {"Start": "2025-01-01T00:00:00+09:00", "End": "2025-01-01T01:00:00+09:00"},
+            )
+        ]
@@ -0,0 +1,157 @@
+import pytest
+from src.core.auth import SacloudApiKey
+from bill.handlers.bill import BILL_CACHE, BillHandler, month_range
+from fastmcp import FastMCP, Client
+from tests.error import INVALID_AUTH_ERROR
+
+
+class TestBillHandler:
+    """BillHandlerのテスト"""
+
+    def test_month_range(self):
+        """年をまたぐ期間の年月が列挙されることのテスト"""
+        assert month_range("2024-11", "2025-02") == [(2024, 11), (2024, 12), (2025, 1), (2025, 2)]
+        assert month_range("2025-01", "2025-01") == [(2025, 1)]
+
+    @pytest.mark.asyncio
+    async def test_get_bill_list_by_range_invalid_month(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], api_key: SacloudApiKey
+    ):
+        """
+        複数月の請求一覧取得の無効な年月指定時のエラーテスト
+        """
+
+        _bill_handler = BillHandler(mock_mcp, zone_urls, api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "get_bill_list_by_range",
+                {"account_id": "123456789012", "from_month": "2025-13", "to_month": "2025-12"},
+            )
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert result == "年月はYYYY-MM形式（例: 2025-01）で指定してください。"
+
+    @pytest.mark.asyncio
+    async def test_get_bill_list_by_range_too_long(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], api_key: SacloudApiKey
+    ):
+        """
+        複数月の請求一覧取得の期間が長すぎる場合のエラーテスト
+        """
+
+        _bill_handler = BillHandler(mock_mcp, zone_urls, api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "get_bill_list_by_range",
+                {"account_id": "123456789012", "from_month": "2020-01", "to_month": "2025-12"},
+            )
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert result == f"期間は最大{BillHandler.MAX_RANGE_MONTHS}か月まで指定できます。"
+
+    @pytest.mark.asyncio
+    async def test_get_bill_list_by_range_invalid_api_key(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str]
+    ):
+        """
+        複数月の請求一覧取得の無効なAPIキーのエラーテスト
+        """
+
+        invalid_api_key = ("", "")
+        _bill_handler = BillHandler(mock_mcp, zone_urls, invalid_api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "get_bill_list_by_range",
+                {"account_id": "123456789012", "from_month": "2025-01", "to_month": "2025-03"},
+            )
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert INVALID_AUTH_ERROR == result
+
+    @pytest.mark.asyncio
+    async def test_get_bill_list_by_range_from_cache(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], tmp_path, monkeypatch
+    ):
+        """
+        締め済みの月はキャッシュから返され、APIを呼ばないことのテスト
+        """
+
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        for month, amount in (("2024-12", 1000), ("2025-01", 2500)):
+            BILL_CACHE.set(
+                f"123456789012/{month}",
+                {"Bills": [{"BillID": month, "Amount": amount}], "is_ok": True},
+            )
+
+        bill_handler = BillHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async def fail(*args):
+            raise AssertionError("APIが呼ばれました")
+
+        monkeypatch.setattr(bill_handler, "get_bill_list_by_month", fail)
+
+        result = await bill_handler.get_bill_list_by_range(
+            None, "123456789012", "2024-12", "2025-01"
+        )
+
+        assert [month["Month"] for month in result["Months"]] == ["2024-12", "2025-01"]
+        assert all(month["Cached"] for month in result["Months"])
+        assert result["TotalAmount"] == 3500
+
+    @pytest.mark.asyncio
+    async def test_get_bill_list_by_range_empty_month_not_cached(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], tmp_path, monkeypatch
+    ):
+        """
+        請求書のない締め済みの月はキャッシュせず、次回もAPIから取得することのテスト
+        """
+
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        bill_handler = BillHandler(mock_mcp, zone_urls, ("token", "secret"))
+        responses = {
+            "2024-11": {"Bills": [], "is_ok": True},
+            "2024-12": {"Bills": [{"BillID": "1", "Amount": 100}], "is_ok": True},
+        }
+
+        async def fetch(ctx, account_id, year, month):
+            return responses[f"{year}-{month}"]
+
+        monkeypatch.setattr(bill_handler, "get_bill_list_by_month", fetch)
+        await bill_handler.get_bill_list_by_range(None, "123456789012", "2024-11", "2024-12")
+
+        assert BILL_CACHE.get("123456789012/2024-11") is None
+        assert BILL_CACHE.get("123456789012/2024-12") == responses["2024-12"]
+
+    @pytest.mark.asyncio
+    async def test_analyze_bill_details_invalid_group_by(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], api_key: SacloudApiKey
+    ):
+        """
+        請求明細の集計の無効な集計キー指定時のエラーテスト
+        """
+
+        _bill_handler = BillHandler(mock_mcp, zone_urls, api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "analyze_bill_details",
+                {
+                    "account_id": "123456789012",
+                    "from_month": "2025-01",
+                    "to_month": "2025-03",
+                    "group_by": ["plan"],
+                },
+            )
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert (
+                result
+                == "集計キーはservice_class, zone, resource, month のいずれかを指定する必要があります。"
+            )
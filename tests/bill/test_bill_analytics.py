@@ -0,0 +1,95 @@
+import numpy as np
+from bill.analytics import BillDetailTable, month_over_month, to_optional
+
+
+def make_table() -> BillDetailTable:
+    """3か月分の請求明細のテーブルを生成する"""
+    details = [
+        (
+            "2025-01",
+            {
+                "ServiceClassPath": "cloud/server",
+                "Zone": "is1a",
+                "ContractID": "100",
+                "Amount": 1000,
+            },
+        ),
+        (
+            "2025-01",
+            {"ServiceClassPath": "cloud/disk", "Zone": "is1a", "ContractID": "101", "Amount": 500},
+        ),
+        (
+            "2025-02",
+            {
+                "ServiceClassPath": "cloud/server",
+                "Zone": "is1a",
+                "ContractID": "100",
+                "Amount": 1500,
+            },
+        ),
+        (
+            "2025-02",
+            {
+                "ServiceClassPath": "cloud/server",
+                "Zone": "tk1a",
+                "ContractID": "103",
+                "Amount": 200,
+            },
+        ),
+        (
+            "2025-03",
+            {"ServiceClassPath": "cloud/router", "Zone": None, "ContractID": "102", "Amount": 300},
+        ),
+    ]
+    return BillDetailTable.from_details(details)
+
+
+class TestBillDetailTable:
+    """請求明細の集計のテスト"""
+
+    def test_group_totals(self):
+        """複数の集計キーの組み合わせごとに合計されることのテスト"""
+        labels, totals = make_table().group_totals(["service_class", "zone"])
+
+        groups = {
+            (service_class, zone): total
+            for service_class, zone, total in zip(
+                labels[0].tolist(), labels[1].tolist(), totals.tolist()
+            )
+        }
+        assert groups == {
+            ("cloud/disk", "is1a"): 500.0,
+            ("cloud/router", ""): 300.0,
+            ("cloud/server", "is1a"): 2500.0,
+            ("cloud/server", "tk1a"): 200.0,
+        }
+
+    def test_monthly_totals(self):
+        """明細のない月は0として、グループ × 月の行列が計算されることのテスト"""
+        months = ["2025-01", "2025-02", "2025-03"]
+        labels, matrix = make_table().monthly_totals(["service_class"], months)
+
+        assert labels[0].tolist() == ["cloud/disk", "cloud/router", "cloud/server"]
+        assert matrix.tolist() == [
+            [500.0, 0.0, 0.0],
+            [0.0, 0.0, 300.0],
+            [1000.0, 1700.0, 0.0],
+        ]
+
+    def test_month_over_month(self):
+        """前月からの増減額と増減率のテスト"""
+        delta, rate = month_over_month(np.array([[1000.0, 1500.0, 0.0], [0.0, 300.0, 300.0]]))
+
+        assert np.isnan(delta[:, 0]).all()
+        assert delta[:, 1:].tolist() == [[500.0, -1500.0], [300.0, 0.0]]
+        assert rate[0, 1:].tolist() == [0.5, -1.0]
+        # 前月が0の場合は増減率を計算しない
+        assert np.isnan(rate[1, 1])
+        assert rate[1, 2] == 0.0
+
+    def test_to_optional(self):
+        """空文字列とNaNがNoneに変換されることのテスト"""
+        assert to_optional(np.str_("")) is None
+        assert to_optional(np.float64(np.nan)) is None
+        assert to_optional(np.str_("is1a")) == "is1a"
+        assert to_optional(np.float64(0.0)) == 0.0
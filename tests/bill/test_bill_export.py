@@ -0,0 +1,214 @@
+import csv
+import pytest
+from bill.export import EXPORT_COLUMNS, DetailWriter
+from bill.handlers.bill import BillHandler
+from fastmcp import FastMCP
+
+
+def make_handler(
+    mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch, details: dict, fail_bill: str = ""
+) -> BillHandler:
+    """請求一覧と明細のAPIを差し替えたBillHandlerを生成する"""
+    bill_handler = BillHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+    async def get_bill_list_by_range(ctx, account_id, from_month, to_month):
+        return {
+            "Months": [
+                {"Month": "2025-01", "Bills": [{"BillID": "1"}]},
+                {"Month": "2025-02", "Bills": [{"BillID": "2"}]},
+            ],
+            "TotalAmount": 0,
+        }
+
+    async def get_bill_detail_page(ctx, bill_id, offset, count):
+        if bill_id == fail_bill:
+            return "エラー"
+        lines = details[bill_id]
+        return {"BillDetails": lines[offset : offset + count], "Total": len(lines), "is_ok": True}
+
+    monkeypatch.setattr(bill_handler, "get_bill_list_by_range", get_bill_list_by_range)
+    monkeypatch.setattr(bill_handler, "_get_bill_detail_page", get_bill_detail_page)
+    return bill_handler
+
+
+class Ctx:
+    """進捗通知を受け取るだけのコンテキスト"""
+
+    async def info(self, message: str):
+        pass
+
+
+DETAILS = {
+    "1": [
+        {
+            "ContractID": str(100 + i),
+            "ServiceClassPath": "cloud/server",
+            "Zone": "is1a",
+            "Amount": 100,
+        }
+        for i in range(5)
+    ],
+    "2": [{"ContractID": "200", "ServiceClassPath": "cloud/disk", "Zone": None, "Amount": 50}],
+}
+
+
+class TestBillExport:
+    """請求明細の出力のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_export_csv(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch, tmp_path
+    ):
+        """ページ単位で取得した明細がすべてCSVに出力されることのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        bill_handler = make_handler(mock_mcp, zone_urls, monkeypatch, DETAILS)
+        path = tmp_path / "exports" / "details.csv"
+
+        result = await bill_handler.export_bill_details(
+            Ctx(), "123456789012", "2025-01", "2025-02", file_name="details.csv", page_size=2
+        )
+
+        assert result["Path"] == str(path)
+        assert result["Rows"] == 6
+        assert result["TotalAmount"] == 550
+        assert result["Months"] == {"2025-01": 500, "2025-02": 50}
+        with open(path, encoding="utf-8-sig", newline="") as file:
+            rows = list(csv.reader(file))
+        assert rows[0] == EXPORT_COLUMNS
+        assert len(rows) == 7
+        assert rows[-1][:3] == ["2025-02", "2", "200"]
+
+    @pytest.mark.asyncio
+    async def test_export_parquet(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch, tmp_path
+    ):
+        """Parquetに出力されることのテスト"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        bill_handler = make_handler(mock_mcp, zone_urls, monkeypatch, DETAILS)
+        path = tmp_path / "exports" / "details.parquet"
+
+        result = await bill_handler.export_bill_details(
+            Ctx(),
+            "123456789012",
+            "2025-01",
+            "2025-02",
+            export_format="parquet",
+            file_name="details.parquet",
+            page_size=2,
+        )
+
+        table = pq.read_table(path)
+        assert result["Rows"] == table.num_rows == 6
+        assert table.column("Amount").to_pylist() == [100] * 5 + [50]
+
+    @pytest.mark.asyncio
+    async def test_export_failure_removes_file(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch, tmp_path
+    ):
+        """明細の取得に失敗した場合は、不完全なファイルを残さないことのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        bill_handler = make_handler(mock_mcp, zone_urls, monkeypatch, DETAILS, fail_bill="2")
+
+        result = await bill_handler.export_bill_details(
+            Ctx(), "123456789012", "2025-01", "2025-02", file_name="details.csv"
+        )
+
+        assert result == "請求書2の明細の取得に失敗しました: エラー"
+        assert list((tmp_path / "exports").iterdir()) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "file_name", ["../details.csv", "/tmp/details.csv", "a/b.csv", "a\\b.csv", ".."]
+    )
+    async def test_export_invalid_file_name(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch, tmp_path, file_name
+    ):
+        """ディレクトリを含むファイル名は、出力先のディレクトリの外に書き込まないようエラーとなることのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        bill_handler = make_handler(mock_mcp, zone_urls, monkeypatch, DETAILS)
+
+        result = await bill_handler.export_bill_details(
+            Ctx(), "123456789012", "2025-01", "2025-02", file_name=file_name
+        )
+
+        assert (
+            result
+            == "ファイル名はディレクトリを含まない名前（例: bill-details.csv）で指定する必要があります。"
+        )
+        assert not (tmp_path / "details.csv").exists()
+
+    @pytest.mark.asyncio
+    async def test_export_existing_file(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch, tmp_path
+    ):
+        """既存のファイルは、overwriteを指定した場合のみ上書きされることのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        bill_handler = make_handler(mock_mcp, zone_urls, monkeypatch, DETAILS)
+        path = tmp_path / "exports" / "details.csv"
+        path.parent.mkdir()
+        path.write_text("existing")
+
+        result = await bill_handler.export_bill_details(
+            Ctx(), "123456789012", "2025-01", "2025-02", file_name="details.csv"
+        )
+        assert result == (
+            "出力先のファイルdetails.csvは既に存在します。上書きする場合はoverwriteにTrueを指定してください。"
+        )
+        assert path.read_text() == "existing"
+
+        result = await bill_handler.export_bill_details(
+            Ctx(), "123456789012", "2025-01", "2025-02", file_name="details.csv", overwrite=True
+        )
+        assert result["Rows"] == 6
+        assert path.read_text(encoding="utf-8-sig").startswith(",".join(EXPORT_COLUMNS))
+        assert [item.name for item in path.parent.iterdir()] == ["details.csv"]
+
+    @pytest.mark.asyncio
+    async def test_export_invalid_format(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch
+    ):
+        """無効な出力形式指定時のエラーテスト"""
+        bill_handler = make_handler(mock_mcp, zone_urls, monkeypatch, DETAILS)
+
+        result = await bill_handler.export_bill_details(
+            Ctx(), "123456789012", "2025-01", "2025-02", export_format="xlsx"
+        )
+
+        assert result == "出力形式はcsv または parquet を指定する必要があります。"
+
+    @pytest.mark.asyncio
+    async def test_analyze_uses_paged_details(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch, tmp_path
+    ):
+        """明細の集計も出力と同じくすべてのページを取得し、合計金額が一致することのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        bill_handler = make_handler(mock_mcp, zone_urls, monkeypatch, DETAILS)
+        monkeypatch.setattr(bill_handler, "MAX_PAGE_SIZE", 2)
+
+        analysis = await bill_handler.analyze_bill_details(
+            Ctx(), "123456789012", "2025-01", "2025-02"
+        )
+        exported = await bill_handler.export_bill_details(
+            Ctx(),
+            "123456789012",
+            "2025-01",
+            "2025-02",
+            page_size=2,
+        )
+
+        assert analysis["Lines"] == exported["Rows"] == 6
+        assert analysis["TotalAmount"] == exported["TotalAmount"] == 550
+
+    def test_writer_does_not_replace_existing_file(self, tmp_path):
+        """出力中に作成されたファイルも上書きせず、一時ファイルを残さないことのテスト"""
+        path = tmp_path / "details.csv"
+        writer = DetailWriter(path, "csv")
+        writer.write([["2025-01", "1", "100", "", "", "", "", "", "", "", 100]])
+        path.write_text("existing")
+
+        with pytest.raises(FileExistsError):
+            writer.commit()
+
+        assert path.read_text() == "existing"
+        assert [item.name for item in tmp_path.iterdir()] == ["details.csv"]
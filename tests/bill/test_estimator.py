@@ -0,0 +1,221 @@
+import json
+
+import numpy as np
+import pytest
+from bill.handlers import estimator
+from bill.handlers.estimator import EstimatorHandler, total_costs
+from docs.price import PriceCatalog
+from fastmcp import FastMCP, Client
+
+DUMMY_API_KEY = ("token", "secret")
+
+SERVER_CATALOG = {
+    "ServerPlans": [
+        {
+            "CPU": 1,
+            "MemoryMB": 1024,
+            "Generation": 200,
+            "Availability": "available",
+            "ServiceClass": "cloud/plan/fixed/1core-1gb",
+        },
+        {
+            "CPU": 2,
+            "MemoryMB": 4096,
+            "Generation": 200,
+            "Availability": "available",
+            "ServiceClass": "cloud/plan/fixed/2core-4gb",
+        },
+        {
+            "CPU": 2,
+            "MemoryMB": 4096,
+            "Generation": 200,
+            "Availability": "available",
+            "Commitment": "dedicatedcpu",
+            "ServiceClass": "cloud/plan/dedicatedcpu/2core-4gb",
+        },
+    ]
+}
+DISK_CATALOG = {
+    "DiskPlans": [
+        {
+            "ID": 4,
+            "Size": [
+                {"SizeMB": 20480, "Availability": "available", "ServiceClass": "cloud/disk/ssd/20g"}
+            ],
+        },
+        {
+            "ID": 2,
+            "Size": [
+                {"SizeMB": 40960, "Availability": "available", "ServiceClass": "cloud/disk/hdd/40g"}
+            ],
+        },
+    ]
+}
+PRICE_CATALOG = PriceCatalog.from_response(
+    {
+        "ServiceClasses": [
+            {
+                "ServiceClassPath": "cloud/plan/fixed/1core-1gb",
+                "Price": [
+                    {"Zone": "is1a", "Hourly": 10, "Daily": 100, "Monthly": 2000},
+                    {"Zone": "tk1a", "Hourly": 11, "Daily": 110, "Monthly": 2200},
+                ],
+            },
+            {
+                "ServiceClassPath": "cloud/plan/fixed/2core-4gb",
+                "Price": [{"Zone": "is1a", "Hourly": 30, "Daily": 300, "Monthly": 6000}],
+            },
+            {
+                "ServiceClassPath": "cloud/disk/ssd/20g",
+                "Price": [{"Hourly": 5, "Daily": 50, "Monthly": 1000}],
+            },
+            {
+                "ServiceClassPath": "cloud/disk/hdd/40g",
+                "Price": [{"Hourly": 4, "Daily": 40, "Monthly": 800}],
+            },
+        ]
+    }
+)
+
+
+@pytest.fixture
+def handler(mock_mcp: FastMCP, zone_urls: dict[str, str], monkeypatch) -> EstimatorHandler:
+    """カタログと料金表を固定した見積もりハンドラー"""
+    _handler = EstimatorHandler(mock_mcp, zone_urls, DUMMY_API_KEY)
+
+    async def get_cached_catalog(ctx, zone, resource):
+        return SERVER_CATALOG if resource == "product/server" else DISK_CATALOG
+
+    async def get_price_catalog():
+        return PRICE_CATALOG
+
+    monkeypatch.setattr(_handler, "get_cached_catalog", get_cached_catalog)
+    monkeypatch.setattr(estimator, "get_price_catalog", get_price_catalog)
+    return _handler
+
+
+class TestEstimatorHandler:
+    """EstimatorHandlerのテスト"""
+
+    def test_total_costs(self):
+        """台数・ディスク数を掛けた合計が計算され、ディスクのない構成はディスク料金を含まないことのテスト"""
+        server = np.array([[10.0, 100.0, 2000.0], [30.0, 300.0, 6000.0]])
+        disk = np.array([[5.0, 50.0, 1000.0], [np.nan, np.nan, np.nan]])
+        totals = total_costs(server, disk, np.array([3.0, 1.0]), np.array([2.0, 0.0]))
+
+        np.testing.assert_allclose(totals, [[60.0, 600.0, 12000.0], [30.0, 300.0, 6000.0]])
+
+    @pytest.mark.asyncio
+    async def test_estimate_server_costs(self, mock_mcp: FastMCP, handler: EstimatorHandler):
+        """構成ごとの料金が月額の安い順に返され、見積もれない構成は理由とともに返されることのテスト"""
+        configurations = [
+            {
+                "label": "web",
+                "cpu": 2,
+                "mem": 4096,
+                "count": 2,
+                "disk_plan": "ssd",
+                "disk_size_mb": 20480,
+            },
+            {"label": "small", "cpu": 1, "mem": 1024},
+            {"label": "hdd", "cpu": 1, "mem": 1024, "disk_plan": "hdd", "disk_size_mb": 40960},
+            {"label": "large", "cpu": 8, "mem": 32768},
+        ]
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "estimate_server_costs",
+                {"configurations": configurations, "zones": ["is1a", "tk1a"]},
+            )
+            result = json.loads(res[0].text)
+
+        assert result["Columns"] == [
+            "Rank",
+            "Label",
+            "Zone",
+            "Count",
+            "ServerPlan",
+            "DiskPlan",
+            "Hourly",
+            "Daily",
+            "Monthly",
+        ]
+        assert result["Rows"] == [
+            [1, "small", "is1a", 1, "cloud/plan/fixed/1core-1gb", None, 10.0, 100.0, 2000.0],
+            [2, "small", "tk1a", 1, "cloud/plan/fixed/1core-1gb", None, 11.0, 110.0, 2200.0],
+            [
+                3,
+                "hdd",
+                "is1a",
+                1,
+                "cloud/plan/fixed/1core-1gb",
+                "cloud/disk/hdd/40g",
+                14.0,
+                140.0,
+                2800.0,
+            ],
+            [
+                4,
+                "hdd",
+                "tk1a",
+                1,
+                "cloud/plan/fixed/1core-1gb",
+                "cloud/disk/hdd/40g",
+                15.0,
+                150.0,
+                3000.0,
+            ],
+            [
+                5,
+                "web",
+                "is1a",
+                2,
+                "cloud/plan/fixed/2core-4gb",
+                "cloud/disk/ssd/20g",
+                70.0,
+                700.0,
+                14000.0,
+            ],
+        ]
+        unavailable = {(item["Label"], item["Zone"]) for item in result["Unavailable"]}
+        # tk1aの2コア/4GBは料金表になく、8コア/32GBはプランがないため見積もれない
+        assert unavailable == {
+            ("web", "tk1a"),
+            ("large", "is1a"),
+            ("large", "tk1a"),
+        }
+
+    @pytest.mark.asyncio
+    async def test_estimate_server_costs_invalid_configuration(
+        self, mock_mcp: FastMCP, handler: EstimatorHandler
+    ):
+        """構成の必須項目・ディスクプランが不正な場合のエラーテスト"""
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "estimate_server_costs", {"configurations": [{"zone": "is1a", "cpu": 1}]}
+            )
+            assert res[0].text == "構成1: mem は必須です。"
+
+            res = await client.call_tool(
+                "estimate_server_costs",
+                {"configurations": [{"zone": "is1a", "cpu": 1, "mem": 1024, "disk_plan": "nvme"}]},
+            )
+            assert res[0].text == "構成1: ディスクプランはssd または hdd を指定する必要があります。"
+
+            res = await client.call_tool("estimate_server_costs", {"configurations": []})
+            assert res[0].text == "構成を1つ以上指定する必要があります。"
+
+    @pytest.mark.asyncio
+    async def test_estimate_server_costs_invalid_api_key(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str]
+    ):
+        """料金見積もりの無効なAPIキーのエラーテスト"""
+        _handler = EstimatorHandler(mock_mcp, zone_urls, ("", ""))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "estimate_server_costs",
+                {"configurations": [{"zone": "is1a", "cpu": 1, "mem": 1024}]},
+            )
+
+        assert res[0].text.startswith("認証情報が設定されていません。")
@@ -0,0 +1,195 @@
+import pytest
+from src.core.auth import SacloudApiKey
+from compute.handlers.provisioning import ProvisioningHandler
+from fastmcp import FastMCP, Client
+from core.consts import ZONE_URLS
+from tests.error import INVALID_AUTH_ERROR, get_invalid_zone_message
+
+
+class TestProvisioningHandler:
+    """ProvisioningHandlerのテスト"""
+
+    @pytest.fixture
+    def provision_args(self, test_zone: str) -> dict:
+        """provision_serverの引数"""
+        return {
+            "zone": test_zone,
+            "name": "test-server",
+            "cpu": 1,
+            "mem": 1024,
+            "gen": 200,
+            "archive": "Ubuntu Server",
+            "disk_size_mb": 20480,
+        }
+
+    @pytest.mark.asyncio
+    async def test_init(self, mock_mcp: FastMCP, zone_urls: dict[str, str], api_key: SacloudApiKey):
+        """ProvisioningHandlerの初期化テスト"""
+        handler = ProvisioningHandler(mock_mcp, zone_urls, api_key)
+
+        # ハンドラの各要素が正しいか検証
+        assert handler.mcp == mock_mcp
+        assert handler.zone_urls == ZONE_URLS
+
+        # ツールの配列取得
+        tool_list = await mock_mcp.list_tools()
+
+        # ツールの要素数が正しいか検証
+        assert len(tool_list) == 1
+
+        tool_names = [tool.name for tool in tool_list]
+
+        # ツールが正しく設定されているか検証
+        assert "provision_server" in tool_names
+
+    @pytest.mark.asyncio
+    async def test_provision_server_invalid_zone(
+        self,
+        mock_mcp: FastMCP,
+        zone_urls: dict[str, str],
+        api_key: SacloudApiKey,
+        provision_args: dict,
+    ):
+        """
+        サーバプロビジョニングの無効なゾーン指定時のエラーテスト
+        """
+
+        _provisioning_handler = ProvisioningHandler(mock_mcp, zone_urls, api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("provision_server", {**provision_args, "zone": ""})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert get_invalid_zone_message(zone_urls) == result
+
+    @pytest.mark.asyncio
+    async def test_provision_server_invalid_api_key(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], provision_args: dict
+    ):
+        """
+        サーバプロビジョニングの無効なAPIキーのエラーテスト
+        """
+
+        invalid_api_key = ("", "")
+        _provisioning_handler = ProvisioningHandler(mock_mcp, zone_urls, invalid_api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("provision_server", provision_args)
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert INVALID_AUTH_ERROR == result
+
+    @pytest.mark.asyncio
+    async def test_provision_server_invalid_disk_plan(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], provision_args: dict
+    ):
+        """
+        サーバプロビジョニングの無効なディスクプラン指定時のエラーテスト
+        """
+
+        _provisioning_handler = ProvisioningHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "provision_server", {**provision_args, "disk_plan": "nvme"}
+            )
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert result == "ディスクプランはssd または hdd を指定する必要があります。"
+
+    @pytest.mark.asyncio
+    async def test_validate_disk_plan(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], test_zone: str, monkeypatch
+    ):
+        """
+        ディスクプランのカタログから、利用可能な容量かどうかを判定することのテスト
+        """
+
+        handler = ProvisioningHandler(mock_mcp, zone_urls, ("token", "secret"))
+        catalog = {
+            "DiskPlans": [
+                {
+                    "ID": 4,
+                    "Size": [
+                        {"SizeMB": 40960, "Availability": "available"},
+                        {"SizeMB": 20480, "Availability": "available"},
+                        {"SizeMB": 10240, "Availability": "discontinued"},
+                    ],
+                }
+            ]
+        }
+
+        async def get_cached_catalog(ctx, zone, path):
+            return catalog
+
+        monkeypatch.setattr(handler, "get_cached_catalog", get_cached_catalog)
+
+        assert await handler._validate_disk_plan(None, test_zone, 4, 20480) is None
+        assert (
+            await handler._validate_disk_plan(None, test_zone, 4, 10240)
+            == "ディスク容量は20480, 40960(MB)のいずれかを指定する必要があります。"
+        )
+        assert (
+            await handler._validate_disk_plan(None, test_zone, 2, 20480)
+            == "指定したディスクプランはこのゾーンで利用できません。"
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("disk_plan, plan_id", [("ssd", 4), ("hdd", 2)])
+    async def test_provision_server_disk_plan_id(
+        self,
+        mock_mcp: FastMCP,
+        zone_urls: dict[str, str],
+        provision_args: dict,
+        monkeypatch,
+        disk_plan: str,
+        plan_id: int,
+    ):
+        """
+        ディスク作成のリクエストに、ディスクプランに対応するプランIDが指定されることのテスト
+        """
+
+        handler = ProvisioningHandler(mock_mcp, zone_urls, ("token", "secret"))
+        catalogs = {
+            "product/server": {
+                "ServerPlans": [
+                    {"CPU": 1, "MemoryMB": 1024, "Generation": 200, "Availability": "available"}
+                ]
+            },
+            "archive": {"Archives": [{"ID": "1", "Name": "Ubuntu Server", "SizeMB": 20480}]},
+            "product/disk": {
+                "DiskPlans": [
+                    {"ID": plan, "Size": [{"SizeMB": 20480, "Availability": "available"}]}
+                    for plan in (2, 4)
+                ]
+            },
+        }
+        requests = []
+
+        async def get_cached_catalog(ctx, zone, path):
+            return catalogs[path]
+
+        async def handle_api_request(ctx, method, url, params=None):
+            requests.append((url, params))
+            if url.endswith("/server"):
+                return {"Server": {"ID": "100"}}
+            return {"Disk": {"ID": "200"}}
+
+        async def wait_disk_available(ctx, zone, disk_id, timeout_seconds):
+            return None
+
+        monkeypatch.setattr(handler, "get_cached_catalog", get_cached_catalog)
+        monkeypatch.setattr(handler, "handle_api_request", handle_api_request)
+        monkeypatch.setattr(handler, "_wait_disk_available", wait_disk_available)
+
+        async with Client(mock_mcp) as client:
+            await client.call_tool(
+                "provision_server", {**provision_args, "disk_plan": disk_plan, "boot": False}
+            )
+
+        disk_requests = [params for url, params in requests if url.endswith("/disk")]
+        assert len(disk_requests) == 1
+        assert disk_requests[0]["Disk"]["Plan"]["ID"] == plan_id
@@ -22,12 +22,15 @@ class TestServerHandler:
         tool_list = await mock_mcp.list_tools()
 
         # ツールの要素数が正しいか検証
-        assert len(tool_list) == 6
+        assert len(tool_list) == 9
 
         tool_names = [tool.name for tool in tool_list]        
         
         # ツールが正しく設定されているか検証
         assert 'get_server_list' in tool_names
+        assert 'bulk_stop_servers' in tool_names
+        assert 'bulk_start_servers' in tool_names
+        assert 'get_server_status_summary' in tool_names
 
     @pytest.mark.asyncio
     async def test_get_server_list_success(self, mock_mcp: FastMCP, zone_urls: dict[str, str], api_key: SacloudApiKey, test_zone: str):
@@ -78,3 +81,73 @@ class TestServerHandler:
 
             assert isinstance(result, str)
             assert INVALID_AUTH_ERROR == result
+
+    @pytest.mark.asyncio
+    async def test_bulk_stop_servers_no_target(self, mock_mcp: FastMCP, zone_urls: dict[str, str]):
+        """
+        サーバ一括停止の対象未指定時のエラーテスト
+        """
+
+        _server_handler = ServerHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("bulk_stop_servers", {})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert result == "対象サーバーのリスト(servers)またはタグ(tag)のいずれかを指定してください。"
+
+    @pytest.mark.asyncio
+    async def test_bulk_start_servers_invalid_zone(self, mock_mcp: FastMCP, zone_urls: dict[str, str]):
+        """
+        サーバ一括起動の無効なゾーン指定時に、対象サーバーごとにエラーが返されることのテスト
+        """
+
+        _server_handler = ServerHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("bulk_start_servers", {
+                "servers": [
+                    {"zone": "", "server_id": "100000000001"},
+                    {"zone": "invalid", "server_id": "100000000002"},
+                ]
+            })
+            data = json.loads(res[0].text)
+
+            assert data["Summary"] == {"Total": 2, "Succeeded": 0, "Failed": 2}
+            for row in data["Results"]:
+                assert row["Result"] == "error"
+                assert row["Message"] == get_invalid_zone_message(zone_urls)
+
+    @pytest.mark.asyncio
+    async def test_bulk_start_servers_invalid_api_key(self, mock_mcp: FastMCP, zone_urls: dict[str, str], test_zone: str):
+        """
+        サーバ一括起動の無効なAPIキーのエラーテスト
+        """
+
+        invalid_api_key = ("", "")
+        _server_handler = ServerHandler(mock_mcp, zone_urls, invalid_api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("bulk_start_servers", {
+                "servers": [{"zone": test_zone, "server_id": "100000000001"}]
+            })
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert INVALID_AUTH_ERROR == result
+
+    @pytest.mark.asyncio
+    async def test_get_server_status_summary_invalid_zone(self, mock_mcp: FastMCP, zone_urls: dict[str, str]):
+        """
+        サーバ電源状態一括取得の無効なゾーン取得時のエラーテスト
+        """
+
+        _server_handler = ServerHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("get_server_status_summary", {"zones": [""]})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert get_invalid_zone_message(zone_urls) == result
@@ -0,0 +1,72 @@
+import json
+import pytest
+from core.cache import DiskCache, TTLCache, get_cache_dir
+
+
+class TestTTLCache:
+    """TTLCacheのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch(self):
+        """2回目以降はキャッシュから返され、エラーメッセージはキャッシュされないことのテスト"""
+        cache = TTLCache(60)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        async def fail():
+            return "エラー"
+
+        assert await cache.get_or_fetch("key", fetch) == {"value": 1}
+        assert await cache.get_or_fetch("key", fetch) == {"value": 1}
+        assert await cache.get_or_fetch("error", fail) == "エラー"
+        assert len(calls) == 1
+        assert "error" not in cache._entries
+
+
+class TestDiskCache:
+    """DiskCacheのテスト"""
+
+    def test_set_and_get(self, tmp_path):
+        """保存した値が取得でき、削除後は取得できないことのテスト"""
+        cache = DiskCache("test", tmp_path)
+
+        assert cache.get("account/2025-01") is None
+
+        cache.set("account/2025-01", {"Bills": [{"Amount": 100}]})
+        assert cache.get("account/2025-01") == {"Bills": [{"Amount": 100}]}
+        assert cache.path("account/2025-01").parent == tmp_path / "test"
+
+        cache.delete("account/2025-01")
+        assert cache.get("account/2025-01") is None
+
+    def test_broken_file(self, tmp_path):
+        """壊れたファイルや別のキーのファイルは無視されることのテスト"""
+        cache = DiskCache("test", tmp_path)
+        cache.set("key", 1)
+
+        cache.path("key").write_text(json.dumps({"key": "other", "value": 2}))
+        assert cache.get("key") is None
+
+        cache.path("key").write_text("{broken")
+        assert cache.get("key") is None
+
+    def test_items(self, tmp_path):
+        """保存したすべてのキーと値が列挙され、壊れたファイルは無視されることのテスト"""
+        cache = DiskCache("test", tmp_path)
+        assert list(cache.items()) == []
+
+        cache.set("a", 1)
+        cache.set("b", {"value": 2})
+        (cache.directory / "broken.json").write_text("{broken")
+
+        assert dict(cache.items()) == {"a": 1, "b": {"value": 2}}
+
+    def test_cache_dir_from_env(self, tmp_path, monkeypatch):
+        """環境変数で保存先ディレクトリを変更できることのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+
+        assert get_cache_dir() == tmp_path
+        assert DiskCache("bill").directory == tmp_path / "bill"
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import pytest
+from core.executor import BoundedExecutor, create_parse_executor
+from docs.converter import manual_to_markdown
+
+HTML = '<html><body><div role="main"><h1>サーバ</h1><p>本文</p></div></body></html>'
+
+
+def blocking(event: threading.Event, active: list, peak: list) -> int:
+    """同時実行数を記録しながら、イベントが設定されるまで待つ"""
+    active.append(1)
+    peak.append(len(active))
+    event.wait(5)
+    active.pop()
+    return threading.get_ident()
+
+
+class TestBoundedExecutor:
+    """BoundedExecutorのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_event_loop(self):
+        """処理がイベントループ以外のスレッドで実行され、その間もイベントループが動くことのテスト"""
+        executor = BoundedExecutor("thread", 2, 4)
+        event = threading.Event()
+        try:
+            task = asyncio.create_task(executor.run(blocking, event, [], []))
+            # ワーカーの処理中もイベントループ上の処理は進む
+            await asyncio.sleep(0.01)
+            assert not task.done()
+            event.set()
+            assert await task != threading.get_ident()
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_bounded(self):
+        """投入数が上限を超える場合は空きができるまで待たされることのテスト"""
+        executor = BoundedExecutor("thread", 4, 2)
+        event = threading.Event()
+        active, peak = [], []
+        try:
+            tasks = [
+                asyncio.create_task(executor.run(blocking, event, active, peak)) for _ in range(5)
+            ]
+            await asyncio.sleep(0.05)
+            assert len(active) == 2
+            event.set()
+            await asyncio.gather(*tasks)
+            assert max(peak) == 2
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancel_pending(self):
+        """開始前にキャンセルされた処理は実行されないことのテスト"""
+        executor = BoundedExecutor("thread", 1, 1)
+        event = threading.Event()
+        calls = []
+        try:
+            first = asyncio.create_task(executor.run(blocking, event, [], []))
+            second = asyncio.create_task(executor.run(calls.append, 1))
+            await asyncio.sleep(0.01)
+            second.cancel()
+            event.set()
+            await first
+            with pytest.raises(asyncio.CancelledError):
+                await second
+            await asyncio.sleep(0.01)
+            assert calls == []
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process(self):
+        """プロセスのワーカーでマニュアルのページを変換できることのテスト"""
+        executor = BoundedExecutor("process", 1, 2)
+        try:
+            markdown = await executor.run(manual_to_markdown, HTML)
+        finally:
+            executor.shutdown()
+        assert "サーバ" in markdown
+
+    def test_config_from_env(self, monkeypatch):
+        """環境変数からワーカーの種類・数・投入数の上限を設定でき、不正な値はデフォルトとなることのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_PARSE_EXECUTOR", "process")
+        monkeypatch.setenv("SACLOUD_MCP_PARSE_WORKERS", "3")
+        monkeypatch.setenv("SACLOUD_MCP_PARSE_QUEUE", "7")
+        executor = create_parse_executor()
+        assert (executor.kind, executor.max_workers, executor.max_pending) == ("process", 3, 7)
+
+        monkeypatch.setenv("SACLOUD_MCP_PARSE_EXECUTOR", "fiber")
+        monkeypatch.setenv("SACLOUD_MCP_PARSE_QUEUE", "-1")
+        executor = create_parse_executor()
+        assert (executor.kind, executor.max_pending) == ("thread", 12)
+
+        with pytest.raises(ValueError):
+            BoundedExecutor("fiber", 1, 1)
@@ -0,0 +1,295 @@
+import math
+import warnings
+import pytest
+import numpy as np
+from core.monitor import (
+    MonitorStore,
+    align_series,
+    flagged_intervals,
+    parse_monitor_data,
+    parse_time,
+    rolling_scores,
+    summarize_monitor,
+)
+
+
+def make_response(values: list) -> dict:
+    """5分間隔のモニタ情報のAPIレスポンスを生成する"""
+    data = {}
+    for index, (in_value, out_value) in enumerate(values):
+        hour, minute = divmod(index * 5, 60)
+        data[f"2025-07-01T{hour:02d}:{minute:02d}:00+09:00"] = {"In": in_value, "Out": out_value}
+    return {"Data": data, "is_ok": True}
+
+
+class TestMonitor:
+    """モニタ情報の集計のテスト"""
+
+    def test_parse_monitor_data(self):
+        """時刻順に並べ替えられ、欠損値がNaNになることのテスト"""
+        response = make_response([(1.0, 2.0), (None, 4.0)])
+        data = dict(reversed(list(response["Data"].items())))
+
+        timestamps, keys, metrics = parse_monitor_data(data)
+
+        assert keys == ["2025-07-01T00:00:00+09:00", "2025-07-01T00:05:00+09:00"]
+        assert list(timestamps) == [1751295600, 1751295900]
+        assert metrics["In"][0] == 1.0
+        assert math.isnan(metrics["In"][1])
+
+    def test_summarize_monitor(self):
+        """統計値とピーク時刻が計算されることのテスト"""
+        response = make_response([(float(i), 100.0 - i) for i in range(24)])
+
+        summary = summarize_monitor(response)
+
+        assert summary["Points"] == 24
+        assert summary["Start"] == "2025-07-01T00:00:00+09:00"
+        assert summary["End"] == "2025-07-01T01:55:00+09:00"
+        assert summary["Metrics"]["In"]["Min"] == 0.0
+        assert summary["Metrics"]["In"]["Max"] == 23.0
+        assert summary["Metrics"]["In"]["Mean"] == 11.5
+        assert summary["Metrics"]["In"]["Sum"] == 276.0
+        assert summary["Metrics"]["In"]["PeakAt"] == "2025-07-01T01:55:00+09:00"
+        assert summary["Metrics"]["Out"]["PeakAt"] == "2025-07-01T00:00:00+09:00"
+        assert "Buckets" not in summary
+
+    def test_summarize_monitor_buckets(self):
+        """バケットごとの平均値と最大値が欠損値を除いて計算されることのテスト"""
+        values = [(float(i), None) for i in range(24)]
+        values[13] = (None, None)
+        response = make_response(values)
+
+        summary = summarize_monitor(response, bucket_minutes=60)
+        buckets = summary["Buckets"]
+
+        assert buckets["Columns"] == ["Start", "In.Mean", "In.Max"]
+        assert buckets["Rows"] == [
+            ["2025-07-01T00:00:00+09:00", 5.5, 11.0],
+            ["2025-07-01T01:00:00+09:00", (12 + sum(range(14, 24))) / 11, 23.0],
+        ]
+
+    def test_summarize_monitor_empty(self):
+        """データが空の場合のテスト"""
+        summary = summarize_monitor({"Data": {}}, bucket_minutes=60)
+
+        assert summary["Points"] == 0
+        assert summary["Metrics"] == {}
+        assert summary["Buckets"]["Rows"] == []
+
+
+class FakeMonitorApi:
+    """指定期間のサンプルのみを返すモニタ情報APIの代わり"""
+
+    def __init__(self, response: dict):
+        self.data = response["Data"]
+        self.calls = []
+
+    async def fetch(self, start: str, end: str) -> dict:
+        self.calls.append((start, end))
+        start_ts, end_ts = parse_time(start), parse_time(end)
+        data = {
+            key: value for key, value in self.data.items() if start_ts <= parse_time(key) <= end_ts
+        }
+        return {"Data": data, "is_ok": True}
+
+
+class TestMonitorStore:
+    """モニタ情報のストアのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_only_missing_range(self):
+        """2回目以降は最新のサンプル以降のみを取得することのテスト"""
+        api = FakeMonitorApi(make_response([(float(i), 0.0) for i in range(24)]))
+        store = MonitorStore()
+        key = ("is1a", "internet", "123", None)
+
+        first = await store.get(
+            key, api.fetch, "2025-07-01T00:00:00+09:00", "2025-07-01T01:00:00+09:00"
+        )
+        second = await store.get(
+            key, api.fetch, "2025-07-01T00:30:00+09:00", "2025-07-01T01:55:00+09:00"
+        )
+
+        assert len(first["Data"]) == 13
+        assert api.calls[1] == ("2025-07-01T01:00:00+09:00", "2025-07-01T01:55:00+09:00")
+        assert list(second["Data"]) == [
+            key for key in api.data if parse_time(key) >= parse_time("2025-07-01T00:30:00+09:00")
+        ]
+        assert second["Data"]["2025-07-01T01:55:00+09:00"] == {"In": 23.0, "Out": 0.0}
+
+    @pytest.mark.asyncio
+    async def test_query_from_cache(self):
+        """キャッシュ済みの期間はAPIを呼ばずに返すことのテスト"""
+        api = FakeMonitorApi(make_response([(float(i), None if i % 2 else 1.0) for i in range(24)]))
+        store = MonitorStore()
+        key = ("is1a", "internet", "123", None)
+
+        await store.get(key, api.fetch, "2025-07-01T00:00:00+09:00", "2025-07-01T01:55:00+09:00")
+        response = await store.get(
+            key, api.fetch, "2025-07-01T00:10:00+09:00", "2025-07-01T00:20:00+09:00"
+        )
+
+        assert len(api.calls) == 1
+        assert response["Data"] == {
+            "2025-07-01T00:10:00+09:00": {"In": 2.0, "Out": 1.0},
+            "2025-07-01T00:15:00+09:00": {"In": 3.0, "Out": None},
+            "2025-07-01T00:20:00+09:00": {"In": 4.0, "Out": 1.0},
+        }
+
+    @pytest.mark.asyncio
+    async def test_keep_response_envelope(self):
+        """キャッシュから返す場合も、APIレスポンスのData以外の項目はそのまま返すことのテスト"""
+        api = FakeMonitorApi(make_response([(float(i), 0.0) for i in range(24)]))
+        store = MonitorStore()
+        key = ("is1a", "internet", "123", None)
+
+        async def fetch(start: str, end: str) -> dict:
+            return {**await api.fetch(start, end), "Success": True, "Interval": 300}
+
+        first = await store.get(
+            key, fetch, "2025-07-01T00:00:00+09:00", "2025-07-01T01:55:00+09:00"
+        )
+        second = await store.get(
+            key, fetch, "2025-07-01T00:10:00+09:00", "2025-07-01T00:20:00+09:00"
+        )
+
+        assert len(api.calls) == 1
+        for response in (first, second):
+            assert {name: value for name, value in response.items() if name != "Data"} == {
+                "is_ok": True,
+                "Success": True,
+                "Interval": 300,
+            }
+        assert len(second["Data"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_refetch_before_cached_range(self):
+        """キャッシュより前の期間を含む場合は取得し直すことのテスト"""
+        api = FakeMonitorApi(make_response([(float(i), 0.0) for i in range(24)]))
+        store = MonitorStore()
+        key = ("is1a", "internet", "123", None)
+
+        await store.get(key, api.fetch, "2025-07-01T01:00:00+09:00", "2025-07-01T01:55:00+09:00")
+        response = await store.get(
+            key, api.fetch, "2025-07-01T00:00:00+09:00", "2025-07-01T01:55:00+09:00"
+        )
+
+        assert api.calls[1] == ("2025-07-01T00:00:00+09:00", "2025-07-01T01:55:00+09:00")
+        assert len(response["Data"]) == 24
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_overwrites_oldest(self):
+        """容量を超えた場合は古いサンプルから上書きされ、その期間は取得し直すことのテスト"""
+        api = FakeMonitorApi(make_response([(float(i), 0.0) for i in range(24)]))
+        store = MonitorStore(capacity=12)
+        key = ("is1a", "internet", "123", None)
+
+        await store.get(key, api.fetch, "2025-07-01T00:00:00+09:00", "2025-07-01T00:55:00+09:00")
+        latest = await store.get(
+            key, api.fetch, "2025-07-01T01:00:00+09:00", "2025-07-01T01:55:00+09:00"
+        )
+        oldest = await store.get(
+            key, api.fetch, "2025-07-01T00:00:00+09:00", "2025-07-01T00:55:00+09:00"
+        )
+
+        assert len(latest["Data"]) == 12
+        assert api.calls[2] == ("2025-07-01T00:00:00+09:00", "2025-07-01T00:55:00+09:00")
+        assert len(oldest["Data"]) == 12
+
+    @pytest.mark.asyncio
+    async def test_invalid_time(self):
+        """時刻の形式が不正な場合のテスト"""
+        api = FakeMonitorApi(make_response([]))
+        response = await MonitorStore().get(
+            ("is1a", "internet", "123", None), api.fetch, "yesterday"
+        )
+
+        assert "ISO形式" in response
+        assert api.calls == []
+
+
+class TestAnomalyScores:
+    """異常検知のスコア計算のテスト"""
+
+    def test_align_series(self):
+        """時刻の異なる系列が共通の時刻軸に揃えられることのテスト"""
+        grid, matrix = align_series(
+            [
+                (np.array([0, 300]), np.array([1.0, 2.0])),
+                (np.array([300, 600]), np.array([3.0, 4.0])),
+            ]
+        )
+
+        assert grid.tolist() == [0, 300, 600]
+        assert np.array_equal(
+            matrix, np.array([[1.0, 2.0, np.nan], [np.nan, 3.0, 4.0]]), equal_nan=True
+        )
+
+    def test_rolling_scores(self):
+        """直前のサンプルを基準にスコアが計算され、外れ値のみが大きくなることのテスト"""
+        matrix = np.array([[1.0, 2.0, 1.0, 2.0, 1.0, 2.0, 10.0, 2.0]])
+
+        zscores = rolling_scores(matrix, 4)
+        mad = rolling_scores(matrix, 4, method="mad")
+
+        assert np.isnan(zscores[0, :4]).all()
+        assert zscores[0, 6] == 17.0
+        assert np.abs(zscores[0, [4, 5, 7]]).max() < 3
+        assert mad[0, 6] > 3
+        assert np.abs(mad[0, [4, 5, 7]]).max() < 3
+
+    def test_rolling_scores_constant_baseline(self):
+        """基準が一定の場合は、変化した値のみ無限大になることのテスト"""
+        matrix = np.array([[5.0, 5.0, 5.0, 5.0, 9.0], [5.0, np.nan, np.nan, np.nan, 5.0]])
+
+        scores = rolling_scores(matrix, 3)
+
+        assert scores[0, 3] == 0.0
+        assert scores[0, 4] == np.inf
+        # 基準のサンプルが半数未満の場合は計算しない
+        assert np.isnan(scores[1, 4])
+
+    def test_rolling_scores_chunked(self, monkeypatch):
+        """ブロックに分けて計算しても、ウィンドウごとに計算した場合と同じスコアになることのテスト"""
+        rng = np.random.default_rng(0)
+        matrix = rng.normal(1e8, 1e6, (5, 200))
+        matrix[rng.random(matrix.shape) < 0.2] = np.nan
+        matrix[2, 50:100] = 5e7
+        window = 12
+        windows = np.lib.stride_tricks.sliding_window_view(matrix[:, :-1], window, axis=1)
+        valid = (~np.isnan(windows)).sum(axis=2) * 2 >= window
+        monkeypatch.setattr("core.monitor.ROLLING_CHUNK_ELEMENTS", 100)
+
+        with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean, std = np.nanmean(windows, axis=2), np.nanstd(windows, axis=2)
+            median = np.nanmedian(windows, axis=2)
+            mad = 1.4826 * np.nanmedian(np.abs(windows - median[..., None]), axis=2)
+            zscores = rolling_scores(matrix, window)[:, window:]
+            mad_scores = rolling_scores(matrix, window, method="mad")[:, window:]
+            expected_zscores = (matrix[:, window:] - mean) / std
+            expected_mad = (matrix[:, window:] - median) / mad
+
+        finite = valid & (std > 0)
+        np.testing.assert_allclose(zscores[finite], expected_zscores[finite], rtol=1e-6)
+        spread = valid & (mad > 0)
+        np.testing.assert_allclose(mad_scores[spread], expected_mad[spread])
+        # 一定の区間は丸め誤差によらず変化なし（0）となる
+        assert (zscores[2, 50:87] == 0).all()
+
+    def test_flagged_intervals(self):
+        """行ごとの連続した区間が取り出されることのテスト"""
+        flags = np.array(
+            [
+                [True, True, False, True],
+                [False, False, False, False],
+                [False, True, True, True],
+            ]
+        )
+
+        rows, starts, ends = flagged_intervals(flags)
+
+        assert rows.tolist() == [0, 0, 2]
+        assert starts.tolist() == [0, 3, 1]
+        assert ends.tolist() == [1, 3, 3]
@@ -0,0 +1,72 @@
+import pytest
+from bs4 import BeautifulSoup
+from docs import converter
+from html_to_markdown import convert_to_markdown
+
+MANUAL_HTML = """<!DOCTYPE html>
+<html><head><title>サーバ</title><script>var x = "<div role='main'>";</script></head>
+<body>
+<nav><ul><li><a href="/cloud/">トップ</a></li></ul></nav>
+<div class="wrapper"><div role="main">
+<h1>サーバの作成</h1>
+<p>サーバは<strong>コントロールパネル</strong>から作成します。</p>
+<h2>プラン</h2>
+<table><tr><th>CPU</th><th>メモリ</th></tr><tr><td>1</td><td>1GB</td></tr></table>
+<ul><li>手順1</li><li>手順2 <a href="disk.html">ディスク</a></li></ul>
+<pre><code>usacloud server create</code></pre>
+</div></div>
+<footer>footer</footer>
+</body></html>
+"""
+
+
+def legacy_markdown(html: str, attrs: dict) -> str:
+    """ページ全体を解析する従来の変換"""
+    soup = BeautifulSoup(html, "html.parser")
+    return convert_to_markdown(soup.find(attrs=attrs))
+
+
+class TestConverter:
+    """HTMLからmarkdownへの変換のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def clear(self):
+        converter.clear_converted()
+        yield
+        converter.clear_converted()
+
+    @pytest.mark.parametrize("parser", ["html.parser", converter.HTML_PARSER])
+    def test_same_as_full_parse(self, parser):
+        """本文の部分木のみを解析しても、ページ全体を解析した場合と同じ結果となることのテスト"""
+        expected = legacy_markdown(MANUAL_HTML, converter.MANUAL_MAIN_ATTRS)
+
+        assert (
+            converter.extract_markdown(MANUAL_HTML, converter.MANUAL_MAIN_ATTRS, parser) == expected
+        )
+        assert "サーバの作成" in expected
+        assert "footer" not in expected
+
+    def test_missing_content(self):
+        """本文の要素がない場合はNoneとなることのテスト"""
+        assert converter.api_manual_to_markdown(MANUAL_HTML) is None
+
+    def test_memoised(self, monkeypatch):
+        """同じ内容のHTMLは再変換されず、件数の上限を超えると古いものから削除されることのテスト"""
+        calls = []
+        original = converter.convert_to_markdown
+
+        def convert(source):
+            calls.append(1)
+            return original(source)
+
+        monkeypatch.setattr(converter, "convert_to_markdown", convert)
+        monkeypatch.setattr(converter, "CONVERT_CACHE_SIZE", 2)
+
+        first = converter.manual_to_markdown(MANUAL_HTML)
+        assert converter.manual_to_markdown(MANUAL_HTML) == first
+        assert len(calls) == 1
+
+        converter.manual_to_markdown(MANUAL_HTML + " ")
+        converter.manual_to_markdown(MANUAL_HTML + "  ")
+        converter.manual_to_markdown(MANUAL_HTML)
+        assert len(calls) == 4
@@ -0,0 +1,150 @@
+import json
+
+import pytest
+from core.cache import DiskCache
+from docs import endpoints
+from docs.handlers.api_documents import APIDocumentsHandler
+from fastmcp import Client, FastMCP
+
+URL = "https://manual.sakura.ad.jp/cloud-api/1.1/server/index.html"
+
+MARKDOWN = """サーバ
+===
+
+| メソッド | パス | 説明 |
+| --- | --- | --- |
+| GET | /server | サーバ一覧を取得 |
+| POST | /server | サーバを作成 |
+
+サーバ一覧を取得
+---
+
+GET /server
+
+### パラメータ
+
+| パラメータ | 型 | 説明 |
+| --- | --- | --- |
+| From | int | 取得開始位置 |
+| Count | int | 取得件数 |
+
+### レスポンス
+
+```
+{"Servers": []}
+```
+
+サーバを作成
+---
+
+`POST` `https://secure.sakura.ad.jp/cloud/zone/is1a/api/cloud/1.1/server`
+
+### リクエスト
+
+| パラメータ | 型 | 説明 |
+| --- | --- | --- |
+| Server.Name | string | 名前 |
+
+```json
+{
+  "Server": {"Name": "web", "ServerPlan": {"ID": 100001001}}
+}
+```
+
+### レスポンス
+
+```json
+{"Server": {"ID": "113000000000"}}
+```
+
+電源を操作
+---
+
+PUT /server/:id/power
+"""
+
+
+@pytest.fixture
+def handler(mock_mcp: FastMCP, tmp_path, monkeypatch) -> APIDocumentsHandler:
+    """一時ディレクトリのキャッシュと、目次・ページを返すハンドラを用意する"""
+    monkeypatch.delenv("SACLOUD_MCP_MANUAL_OFFLINE", raising=False)
+    monkeypatch.setattr(endpoints, "ENDPOINT_CACHE", DiskCache("api_endpoints", tmp_path))
+    _handler = APIDocumentsHandler(mock_mcp)
+    _handler.pages = []
+
+    async def get_api_manual_outline(ctx):
+        return {"サーバ": URL, "ディスク": URL.replace("server", "disk")}
+
+    async def get_manual_document(url, reformat):
+        _handler.pages.append(url)
+        if "disk" in url:
+            raise RuntimeError("not found")
+        return {"Markdown": MARKDOWN, "Chunks": {}}
+
+    monkeypatch.setattr(_handler, "get_api_manual_outline", get_api_manual_outline)
+    monkeypatch.setattr(endpoints, "get_manual_document", get_manual_document)
+    return _handler
+
+
+class TestEndpoints:
+    """APIマニュアルのエンドポイントの抽出・検索のテスト"""
+
+    def test_extract_endpoints(self):
+        """メソッド・パス・パラメータ・リクエストボディの例がAPIの名前ごとに抽出されることのテスト"""
+        extracted = {
+            (endpoint["Method"], endpoint["Path"]): endpoint
+            for endpoint in endpoints.extract_endpoints(URL, "サーバ", MARKDOWN)
+        }
+
+        assert list(extracted) == [
+            ("GET", "/server"),
+            ("POST", "/server"),
+            ("PUT", "/server/:id/power"),
+        ]
+        listing = extracted[("GET", "/server")]
+        assert (listing["Title"], listing["Section"]) == ("サーバ一覧を取得", "1.1")
+        assert listing["Parameters"] == ["From", "Count"]
+        # レスポンスの例はリクエストボディの例としない
+        assert listing["ExampleBody"] == ""
+
+        create = extracted[("POST", "/server")]
+        assert create["Title"] == "サーバを作成"
+        assert create["Parameters"] == ["Server.Name"]
+        assert (
+            create["ExampleBody"]
+            == '{ "Server": {"Name": "web", "ServerPlan": {"ID": 100001001}} }'
+        )
+        assert extracted[("PUT", "/server/:id/power")]["Parameters"] == []
+
+    def test_search_endpoints(self):
+        """キーワード・パスの前方一致・メソッドで検索できることのテスト"""
+        table = endpoints.extract_endpoints(URL, "サーバ", MARKDOWN)
+
+        assert (
+            endpoints.search_endpoints(table, keyword="サーバを作成", limit=1)[0]["Method"]
+            == "POST"
+        )
+        assert [
+            hit["Path"] for hit in endpoints.search_endpoints(table, path_prefix="server/:id")
+        ] == ["/server/:id/power"]
+        assert [hit["Method"] for hit in endpoints.search_endpoints(table, method="get")] == ["GET"]
+        assert endpoints.search_endpoints(table, keyword="ロードバランサ") == []
+
+    @pytest.mark.asyncio
+    async def test_find_api_endpoint(self, mock_mcp: FastMCP, handler: APIDocumentsHandler):
+        """一覧が作成・キャッシュされ、取得できないページを除いて検索されることのテスト"""
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "find_api_endpoint", {"keyword": "電源", "path_prefix": "/server"}
+            )
+            result = json.loads(res[0].text)
+            assert result["Count"] == 1
+            assert result["Endpoints"][0]["Path"] == "/server/:id/power"
+            assert len(res[0].text.encode("utf-8")) < 1000
+
+            # 2回目はキャッシュした一覧から検索する
+            await client.call_tool("find_api_endpoint", {"method": "POST"})
+            assert len(handler.pages) == 2
+
+            res = await client.call_tool("find_api_endpoint", {"limit": 0})
+            assert res[0].text == "limitは1-50の範囲で指定してください"
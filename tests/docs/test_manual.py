@@ -0,0 +1,128 @@
+import time
+
+import httpx
+import pytest
+from core.cache import DiskCache
+from docs import manual
+from docs.snapshot import ManualSnapshot
+
+URL = "https://manual.sakura.ad.jp/cloud/server/about.html"
+
+
+class FakeManualSite:
+    """マニュアルのサイトを模したテスト用のリクエスト関数"""
+
+    def __init__(self, html: str = "<p>v1</p>", etag: str = '"v1"'):
+        self.html = html
+        self.etag = etag
+        self.requests = []
+        self.offline = False
+
+    async def request(self, url: str, headers: dict) -> httpx.Response:
+        self.requests.append(headers)
+        if self.offline:
+            raise httpx.ConnectError("offline")
+        request = httpx.Request("GET", url)
+        if headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, request=request)
+        return httpx.Response(200, text=self.html, headers={"ETag": self.etag}, request=request)
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch) -> FakeManualSite:
+    """一時ディレクトリのキャッシュと、模擬サイトを用意する"""
+    fake = FakeManualSite()
+    monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SACLOUD_MCP_MANUAL_OFFLINE", raising=False)
+    monkeypatch.setattr(manual, "MANUAL_CACHE", DiskCache("manual", tmp_path))
+    monkeypatch.setattr(manual, "request_manual_page", fake.request)
+    return fake
+
+
+def reformat(html: str) -> str:
+    return f"# {html}"
+
+
+class TestManualCache:
+    """マニュアルのページのキャッシュのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_cached_within_max_age(self, site: FakeManualSite):
+        """期間内のページは取得元にアクセスせずキャッシュから返されることのテスト"""
+        assert await manual.get_manual_page(URL, reformat) == "# <p>v1</p>"
+        assert await manual.get_manual_page(URL, reformat) == "# <p>v1</p>"
+
+        assert len(site.requests) == 1
+        entry = manual.MANUAL_CACHE.get(URL)
+        assert entry["Html"] == "<p>v1</p>"
+        assert entry["ETag"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_revalidate_after_max_age(self, site: FakeManualSite, monkeypatch):
+        """期間を過ぎたページは条件付きリクエストで再検証され、更新があれば取得し直すことのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_MANUAL_MAX_AGE", "60")
+        await manual.get_manual_page(URL, reformat)
+
+        # 期間を過ぎたことにする
+        entry = manual.MANUAL_CACHE.get(URL)
+        manual.MANUAL_CACHE.set(URL, {**entry, "FetchedAt": time.time() - 120})
+
+        # 更新されていなければ304となり、キャッシュした内容を返す
+        assert await manual.get_manual_page(URL, reformat) == "# <p>v1</p>"
+        assert site.requests[-1] == {"If-None-Match": '"v1"'}
+        assert time.time() - manual.MANUAL_CACHE.get(URL)["FetchedAt"] < 60
+
+        # 更新されていれば新しい内容に置き換える
+        entry = manual.MANUAL_CACHE.get(URL)
+        manual.MANUAL_CACHE.set(URL, {**entry, "FetchedAt": time.time() - 120})
+        site.html, site.etag = "<p>v2</p>", '"v2"'
+        assert await manual.get_manual_page(URL, reformat) == "# <p>v2</p>"
+        assert manual.MANUAL_CACHE.get(URL)["ETag"] == '"v2"'
+
+    @pytest.mark.asyncio
+    async def test_stale_when_offline(self, site: FakeManualSite, monkeypatch):
+        """取得元にアクセスできない場合は期間を過ぎたキャッシュを返し、キャッシュがなければ例外となることのテスト"""
+        monkeypatch.setenv("SACLOUD_MCP_MANUAL_MAX_AGE", "0")
+        await manual.get_manual_page(URL, reformat)
+
+        site.offline = True
+        assert await manual.get_manual_page(URL, reformat) == "# <p>v1</p>"
+        with pytest.raises(httpx.RequestError):
+            await manual.get_manual_page(URL + "?other", reformat)
+
+    @pytest.mark.asyncio
+    async def test_not_cached_when_reformat_failed(self, site: FakeManualSite):
+        """markdownに変換できなかったページはキャッシュされないことのテスト"""
+        assert await manual.get_manual_page(URL, lambda html: None) is None
+        assert manual.MANUAL_CACHE.get(URL) is None
+
+    @pytest.mark.asyncio
+    async def test_offline_from_snapshot(self, site: FakeManualSite, monkeypatch):
+        """オフラインモードでは取得元にアクセスせず、スナップショットから返されることのテスト"""
+        ManualSnapshot.create([(URL, "# snapshot")])
+        monkeypatch.setenv("SACLOUD_MCP_MANUAL_OFFLINE", "1")
+
+        assert await manual.get_manual_page(URL, reformat) == "# snapshot"
+        with pytest.raises(httpx.RequestError):
+            await manual.get_manual_page(URL + "?other", reformat)
+        assert site.requests == []
+
+    @pytest.mark.asyncio
+    async def test_snapshot_when_unreachable(self, site: FakeManualSite):
+        """キャッシュがなく取得元にアクセスできない場合は、スナップショットから返されることのテスト"""
+        ManualSnapshot.create([(URL, "# snapshot")])
+        site.offline = True
+
+        assert await manual.get_manual_page(URL, reformat) == "# snapshot"
+
+    @pytest.mark.asyncio
+    async def test_chunks_cached_with_page(self, site: FakeManualSite):
+        """セクション・ページの区切りがページとともにキャッシュされることのテスト"""
+        site.html = "<h1>title</h1>"
+        document = await manual.get_manual_document(URL, reformat)
+
+        assert document["Markdown"] == "# <h1>title</h1>"
+        assert [section["Heading"] for section in document["Chunks"]["Sections"]] == [
+            "<h1>title</h1>"
+        ]
+        assert manual.MANUAL_CACHE.get(URL)["Chunks"] == document["Chunks"]
@@ -0,0 +1,208 @@
+import json
+
+import httpx
+import pytest
+from core.cache import DiskCache
+from docs import manual, object_storage_api
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "オブジェクトストレージ API"},
+    "servers": [{"url": "https://secure.sakura.ad.jp/cloud/zone/is1a/api/objectstorage/1.0"}],
+    "paths": {
+        "/fed/v1/buckets/{name}": {
+            "parameters": [{"$ref": "#/components/parameters/BucketName"}],
+            "put": {
+                "summary": "バケットの作成",
+                "tags": ["bucket"],
+                "requestBody": {
+                    "content": {
+                        "application/json": {"schema": {"$ref": "#/components/schemas/Bucket"}}
+                    }
+                },
+                "responses": {
+                    "201": {
+                        "description": "作成したバケット",
+                        "content": {
+                            "application/json": {"schema": {"$ref": "#/components/schemas/Bucket"}}
+                        },
+                    },
+                    "409": {"description": "既に存在する"},
+                },
+            },
+            "delete": {
+                "summary": "バケットの削除",
+                "responses": {"204": {"description": "削除した"}},
+            },
+        },
+        "/fed/v1/clusters": {
+            "get": {
+                "summary": "クラスターの一覧",
+                "parameters": [
+                    {
+                        "name": "limit",
+                        "in": "query",
+                        "schema": {"type": "integer", "format": "int32"},
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "array",
+                                    "items": {"$ref": "#/components/schemas/Cluster"},
+                                }
+                            }
+                        },
+                    }
+                },
+            }
+        },
+    },
+    "components": {
+        "parameters": {
+            "BucketName": {
+                "name": "name",
+                "in": "path",
+                "required": True,
+                "description": "バケット名",
+                "schema": {"type": "string"},
+            }
+        },
+        "schemas": {
+            "Bucket": {
+                "type": "object",
+                "required": ["cluster_id"],
+                "properties": {
+                    "cluster_id": {"type": "string"},
+                    "parent": {"$ref": "#/components/schemas/Bucket"},
+                },
+            },
+            "Cluster": {
+                "type": "object",
+                "properties": {"id": {"type": "string"}, "kind": {"enum": ["a", "b"]}},
+            },
+        },
+    },
+}
+
+REDOC_HTML = (
+    '<html><body><div class="api-content"><h2>バケットの作成</h2></div>'
+    "<script>const __redoc_state = "
+    + json.dumps(
+        {"menu": {"activeItemIdx": -1}, "spec": {"data": SPEC}}, ensure_ascii=False
+    ).replace("<", "\\u003c")
+    + ";</script></body></html>"
+)
+
+RENDERED_HTML = """<html><body><div class="api-content">
+<div id="tag/bucket/operation/createBucket" data-section-id="tag/bucket/operation/createBucket">
+<h2>バケットの作成</h2><p>バケットを作成します。</p>
+<div><button><span type="put" class="http-verb put">put</span><span>/fed/v1/buckets/{name}</span></button></div>
+</div></div></body></html>"""
+
+
+class FakeApiSite:
+    """オブジェクトストレージのAPIマニュアルのサイトを模したテスト用のリクエスト関数"""
+
+    def __init__(self, html: str):
+        self.html = html
+        self.requests = 0
+        self.offline = False
+
+    async def request(self, url: str, headers: dict) -> httpx.Response:
+        self.requests += 1
+        if self.offline:
+            raise httpx.ConnectError("offline")
+        return httpx.Response(
+            200, text=self.html, headers={"ETag": '"v1"'}, request=httpx.Request("GET", url)
+        )
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch) -> FakeApiSite:
+    """一時ディレクトリのキャッシュと、模擬サイトを用意する"""
+    fake = FakeApiSite(REDOC_HTML)
+    monkeypatch.delenv("SACLOUD_MCP_MANUAL_OFFLINE", raising=False)
+    monkeypatch.setattr(
+        object_storage_api, "OBJECT_STORAGE_API_CACHE", DiskCache("objectstorage_api", tmp_path)
+    )
+    monkeypatch.setattr(manual, "request_manual_page", fake.request)
+    return fake
+
+
+class TestObjectStorageApi:
+    """オブジェクトストレージのAPIマニュアルの解析のテスト"""
+
+    def test_parse_spec(self):
+        """埋め込まれたOpenAPIの定義から、操作ごとのパラメータ・リクエスト・レスポンスを取り出すことのテスト"""
+        index = object_storage_api.parse_object_storage_api(REDOC_HTML)
+
+        assert index["Title"] == "オブジェクトストレージ API"
+        assert list(index["Operations"]) == [
+            "PUT /fed/v1/buckets/{name}",
+            "DELETE /fed/v1/buckets/{name}",
+            "GET /fed/v1/clusters",
+        ]
+        create = index["Operations"]["PUT /fed/v1/buckets/{name}"]
+        assert create["Parameters"] == [
+            {
+                "Name": "name",
+                "In": "path",
+                "Required": True,
+                "Type": "string",
+                "Description": "バケット名",
+            }
+        ]
+        # 再帰的なスキーマも深さの上限で展開を止める
+        schema = create["RequestBody"]["Schema"]
+        assert schema["cluster_id"] == "string"
+        assert "cluster_id" in schema["parent?"]
+        assert create["Responses"][1] == {"Status": "409", "Description": "既に存在する"}
+
+        clusters = index["Operations"]["GET /fed/v1/clusters"]
+        assert clusters["Parameters"][0]["Type"] == "integer(int32)"
+        assert clusters["Responses"][0]["Schema"] == [{"id?": "string", "kind?": "any [a, b]"}]
+
+    def test_parse_rendered_html(self):
+        """定義が埋め込まれていないページは、表示されたHTMLから操作を取り出すことのテスト"""
+        operations = object_storage_api.parse_object_storage_api(RENDERED_HTML)["Operations"]
+
+        operation = operations["PUT /fed/v1/buckets/{name}"]
+        assert operation["Summary"] == "バケットの作成"
+        assert "バケットを作成します。" in operation["Description"]
+
+    def test_operation_markdown(self):
+        """1つの操作のみがmarkdownになることのテスト"""
+        operations = object_storage_api.parse_object_storage_api(REDOC_HTML)["Operations"]
+        operation = object_storage_api.find_operation(operations, "put", "/fed/v1/buckets/{name}/")
+
+        markdown = object_storage_api.operation_markdown(operation)
+        assert markdown.startswith("## PUT /fed/v1/buckets/{name}\n")
+        assert "| name | path | string | ○ | バケット名 |" in markdown
+        assert "### リクエストボディ（application/json）" in markdown
+        assert "#### 409 既に存在する" in markdown
+        assert "クラスター" not in markdown
+        assert (
+            object_storage_api.find_operation(operations, "POST", "/fed/v1/buckets/{name}") is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_index_cached(self, site: FakeApiSite):
+        """解析結果がキャッシュされ、取得元にアクセスできない場合もキャッシュから返されることのテスト"""
+        index = await object_storage_api.get_object_storage_api_index()
+        assert await object_storage_api.get_object_storage_api_index() == index
+        assert site.requests == 1
+
+        entry = object_storage_api.OBJECT_STORAGE_API_CACHE.get(
+            object_storage_api.OBJECT_STORAGE_API_URL
+        )
+        entry["FetchedAt"] = 0
+        object_storage_api.OBJECT_STORAGE_API_CACHE.set(
+            object_storage_api.OBJECT_STORAGE_API_URL, entry
+        )
+        site.offline = True
+        assert await object_storage_api.get_object_storage_api_index() == index
+        assert site.requests == 2
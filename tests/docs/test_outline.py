@@ -0,0 +1,111 @@
+import json
+import os
+
+import pytest
+from docs import outline
+from docs.handlers.api_documents import APIDocumentsHandler
+from docs.handlers.documents import DocumentsHandler
+from docs.outline import ManualOutline, load_manual_outline
+from fastmcp import Client, FastMCP
+
+TREE = {
+    "サーバ": [
+        "server/index.html",
+        {
+            "サーバの作成": ["server/create.html", {"ＳＳＤプラン": ["server/ssd.html", {}]}],
+            "サーバの削除": ["server/delete.html", {}],
+        },
+    ],
+    "ディスク": ["disk/index.html", {"ディスクの作成": ["disk/create.html", {}]}],
+}
+
+
+class TestManualOutline:
+    """マニュアルの目次の検索のテスト"""
+
+    def test_lookup(self):
+        """項目名の途中に含まれる文字列で検索でき、配下の項目が指定した階層まで返されることのテスト"""
+        manual_outline = ManualOutline(TREE)
+
+        assert [manual_outline.titles[index] for index in manual_outline.find("作成")] == [
+            "サーバの作成",
+            "ディスクの作成",
+        ]
+        # 全角英字も半角・小文字で一致する
+        assert manual_outline.lookup("ssd") == [
+            {
+                "Title": "ＳＳＤプラン",
+                "Url": "server/ssd.html",
+                "Path": ["サーバ", "サーバの作成"],
+                "Children": {},
+            }
+        ]
+
+        items = manual_outline.lookup("サーバ", depth=1)
+        # 上位の項目が一致した場合は、配下の項目を個別に返さない
+        assert [item["Title"] for item in items] == ["サーバ"]
+        assert items[0]["Children"] == {
+            "サーバの作成": ["server/create.html", {}],
+            "サーバの削除": ["server/delete.html", {}],
+        }
+        assert [item["Title"] for item in manual_outline.lookup("ディスク 作成")] == [
+            "ディスクの作成"
+        ]
+        assert manual_outline.lookup("ロードバランサ") == []
+
+    def test_outline_depth(self):
+        """階層を指定しない場合は元の目次を、指定した場合はその階層までを返すことのテスト"""
+        manual_outline = ManualOutline(TREE)
+
+        assert manual_outline.outline() is TREE
+        assert manual_outline.outline(2) == {
+            "サーバ": [
+                "server/index.html",
+                {
+                    "サーバの作成": ["server/create.html", {}],
+                    "サーバの削除": ["server/delete.html", {}],
+                },
+            ],
+            "ディスク": ["disk/index.html", {"ディスクの作成": ["disk/create.html", {}]}],
+        }
+
+    def test_load_independent_of_cwd(self, tmp_path, monkeypatch):
+        """カレントディレクトリによらず同梱した目次を読み込み、読み込みは1回のみであることのテスト"""
+        monkeypatch.chdir(tmp_path)
+        load_manual_outline.cache_clear()
+
+        manual_outline = load_manual_outline()
+        with open(outline.OUTLINE_PATH, encoding="utf-8") as file:
+            assert manual_outline.tree == json.load(file)
+        assert load_manual_outline() is manual_outline
+        assert os.getcwd() == str(tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_lookup_manual_outline(self, mock_mcp: FastMCP):
+        """目次の検索ツールのテスト"""
+        DocumentsHandler(mock_mcp)
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "lookup_manual_outline", {"keyword": "チュートリアル", "depth": 0}
+            )
+            result = json.loads(res[0].text)
+            assert result["Count"] >= 1
+            assert result["Items"][0]["Url"].startswith("https://manual.sakura.ad.jp/cloud/")
+
+            res = await client.call_tool("lookup_manual_outline", {"keyword": " "})
+            assert res[0].text == "keywordを指定してください"
+
+    @pytest.mark.asyncio
+    async def test_api_outline_cached(self, mock_mcp: FastMCP, monkeypatch):
+        """APIマニュアルの目次は取得に成功した場合のみ保持されることのテスト"""
+        monkeypatch.delenv("SACLOUD_MCP_MANUAL_OFFLINE", raising=False)
+        handler = APIDocumentsHandler(mock_mcp)
+        results = ["エラー", {"サーバ": "server.html"}]
+
+        async def fetch_api_manual_outline(ctx):
+            return results.pop(0)
+
+        monkeypatch.setattr(handler, "fetch_api_manual_outline", fetch_api_manual_outline)
+        assert await handler.get_api_manual_outline(None) == "エラー"
+        assert await handler.get_api_manual_outline(None) == {"サーバ": "server.html"}
+        assert await handler.get_api_manual_outline(None) == {"サーバ": "server.html"}
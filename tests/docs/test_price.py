@@ -0,0 +1,110 @@
+import pytest
+from docs import price
+from docs.price import PriceCatalog
+
+
+def make_catalog() -> PriceCatalog:
+    """テスト用の料金表を生成する"""
+    return PriceCatalog.from_response(
+        {
+            "Count": 4,
+            "ServiceClasses": [
+                {
+                    "ServiceClassID": 1,
+                    "ServiceClassName": "plan/1core-1gb",
+                    "ServiceClassPath": "cloud/plan/fixed/1core-1gb",
+                    "DisplayName": "1コア/1GB",
+                    "Price": [{"Zone": "is1a", "Hourly": 10}, {"Zone": "tk1a", "Hourly": 11}],
+                },
+                {
+                    "ServiceClassID": 2,
+                    "ServiceClassName": "plan/2core-4gb",
+                    "ServiceClassPath": "cloud/plan/fixed/2core-4gb",
+                    "DisplayName": "2コア/4GB",
+                    "Price": {"Zone": "is1a", "Hourly": 30},
+                },
+                {
+                    "ServiceClassID": 3,
+                    "ServiceClassName": "disk/ssd/20g",
+                    "ServiceClassPath": "cloud/disk/ssd/20g",
+                    "DisplayName": "SSD 20GB",
+                    "Price": [{"Zone": "is1a", "Hourly": 5}],
+                },
+                {
+                    "ServiceClassID": 4,
+                    "ServiceClassName": "license/windows",
+                    "ServiceClassPath": "cloud/os/windows",
+                    "DisplayName": "Windows Server",
+                    "Price": [{"Monthly": 3000}],
+                },
+            ],
+        }
+    )
+
+
+class TestPriceCatalog:
+    """料金表の検索のテスト"""
+
+    def test_find_by_prefix(self):
+        """パスの前方一致で検索できることのテスト"""
+        catalog = make_catalog()
+
+        assert sorted(catalog.find_by_prefix("cloud/plan/")) == [0, 1]
+        assert catalog.find_by_prefix("cloud/disk") == [2]
+        assert catalog.find_by_prefix("cloud/zzz") == []
+
+    def test_lookup_keyword(self):
+        """表示名・パスのキーワード検索と、大文字小文字を区別しないことのテスト"""
+        catalog = make_catalog()
+
+        assert [item["ServiceClassID"] for item in catalog.lookup(keyword="ssd")] == [3]
+        assert [item["ServiceClassID"] for item in catalog.lookup(keyword="コア 4gb")] == [2]
+
+    def test_lookup_zone(self):
+        """ゾーンで絞り込んだ場合は、料金もそのゾーンのもののみになることのテスト"""
+        catalog = make_catalog()
+
+        results = catalog.lookup(path_prefix="cloud/", zone="tk1a")
+
+        assert [item["ServiceClassID"] for item in results] == [1, 4]
+        assert results[0]["Price"] == [{"Zone": "tk1a", "Hourly": 11}]
+
+    def test_lookup_name(self):
+        """サービスクラス名・表示名の完全一致で検索できることのテスト"""
+        catalog = make_catalog()
+
+        assert [
+            item["ServiceClassID"] for item in catalog.lookup(service_class_name="plan/2core-4gb")
+        ] == [2]
+        assert [
+            item["ServiceClassID"] for item in catalog.lookup(service_class_name="Windows Server")
+        ] == [4]
+
+    def test_price_for(self):
+        """ゾーンの料金が優先され、ゾーンに依存しない料金にフォールバックすることのテスト"""
+        catalog = make_catalog()
+
+        assert catalog.price_for("cloud/plan/fixed/1core-1gb", "tk1a")["Hourly"] == 11
+        assert catalog.price_for("cloud/plan/fixed/2core-4gb", "tk1a") is None
+        assert catalog.price_for("cloud/os/windows", "is1a")["Monthly"] == 3000
+        assert catalog.price_for("cloud/unknown", "is1a") is None
+
+    @pytest.mark.asyncio
+    async def test_get_price_catalog_cached(self, monkeypatch):
+        """料金表は一度だけ取得され、以降はキャッシュから返されることのテスト"""
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return make_catalog()
+
+        monkeypatch.setattr(price, "fetch_price_catalog", fetch)
+        price.PRICE_CACHE.clear()
+        try:
+            first = await price.get_price_catalog()
+            second = await price.get_price_catalog()
+        finally:
+            price.PRICE_CACHE.clear()
+
+        assert first is second
+        assert len(calls) == 1
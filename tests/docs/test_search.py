@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+from core.cache import DiskCache
+from docs import manual, search
+from docs.search import ManualSearchIndex, split_sections, tokenize
+
+PAGES = [
+    (
+        "https://manual.sakura.ad.jp/cloud/server/about.html",
+        "# サーバ\nサーバの概要です。\n## プラン変更\nサーバのプラン変更はシャットダウン後に行います。CPUとメモリを変更できます。",
+    ),
+    (
+        "https://manual.sakura.ad.jp/cloud/storage/disk.html",
+        "# ディスク\nディスクの作成方法です。\n## ディスクの修正\nホスト名やパスワードを変更できます。",
+    ),
+    (
+        "https://manual.sakura.ad.jp/cloud-api/1.1/server/index.html",
+        "# サーバ\n## サーバ一覧を取得\nGET /server でサーバの一覧を取得します。",
+    ),
+]
+
+
+class TestManualSearch:
+    """マニュアルの全文検索のテスト"""
+
+    def test_tokenize(self):
+        """英数字は単語ごと、日本語は2文字ずつに分割され、全角英数字は正規化されることのテスト"""
+        assert tokenize("サーバ作成 Server-Plan ＣＰＵ") == [
+            "サー",
+            "ーバ",
+            "バ作",
+            "作成",
+            "server",
+            "plan",
+            "cpu",
+        ]
+        assert tokenize("各 API") == ["各", "api"]
+
+    def test_split_sections(self):
+        """見出しごとに分割され、最初の見出しより前の本文は見出しが空となることのテスト"""
+        markdown = "前書き\n# 概要\n本文1\n## 詳細 ##\n本文2\n"
+
+        assert split_sections(markdown) == [("", "前書き"), ("概要", "本文1"), ("詳細", "本文2")]
+
+        markdown = "概要\n===\n\n本文1\n\n詳細\n---\n本文2\n| a |\n|---|\n"
+        assert split_sections(markdown) == [("概要", "本文1"), ("詳細", "本文2\n| a |\n|---|")]
+
+    def test_search(self):
+        """一致したセクションが関連度の高い順に返され、種類で絞り込めることのテスト"""
+        index = ManualSearchIndex.build(PAGES)
+
+        results = index.search("プラン変更")
+        assert results[0]["Heading"] == "プラン変更"
+        assert results[0]["Title"] == "サーバ"
+        assert "プラン変更" in results[0]["Snippet"]
+
+        results = index.search("サーバ 一覧", source="api")
+        assert {result["Url"] for result in results} == {PAGES[2][0]}
+        assert results[0]["Heading"] == "サーバ一覧を取得"
+
+        assert index.search("存在しない語句xyz") == []
+        assert len(index.search("サーバ", limit=1)) == 1
+
+    def test_save_and_load(self, tmp_path):
+        """保存した索引がメモリマップで読み込まれ、同じ検索結果となることのテスト"""
+        index = ManualSearchIndex.build(PAGES)
+        index.save(tmp_path / "search")
+        # 既存の索引を置き換えられることも確認する
+        index.save(tmp_path / "search")
+
+        loaded = ManualSearchIndex.load(tmp_path / "search")
+        assert isinstance(loaded.postings, np.memmap)
+        assert loaded.search("ディスク 修正") == index.search("ディスク 修正")
+        assert ManualSearchIndex.load(tmp_path / "missing") is None
+
+    @pytest.fixture
+    def cache(self, tmp_path, monkeypatch):
+        """空のキャッシュと、未読み込みの索引"""
+        monkeypatch.setenv("SACLOUD_MCP_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(manual, "MANUAL_CACHE", DiskCache("manual", tmp_path))
+        monkeypatch.setattr(manual, "_CACHE_GENERATION", 0)
+        monkeypatch.setattr(search, "_SEARCH_INDEX", None)
+        monkeypatch.setattr(search, "_SEARCH_INDEX_GENERATION", 0)
+        monkeypatch.setattr(search, "_SEARCH_INDEX_TASK", None)
+        return manual.MANUAL_CACHE
+
+    @pytest.mark.asyncio
+    async def test_build_from_cache(self, tmp_path, cache):
+        """キャッシュ済みのページから索引が作成されることのテスト"""
+        for url, markdown in PAGES:
+            cache.set(url, {"Markdown": markdown})
+
+        index = await search.get_search_index()
+        assert len(index) == 6
+        assert (tmp_path / "search" / "meta.json").exists()
+        assert await search.get_search_index() is index
+
+    @pytest.mark.asyncio
+    async def test_rebuild_when_cache_updated(self, cache, monkeypatch):
+        """キャッシュに新しいページが保存されても、一定の件数に達するまではこれまでの索引を返し、
+        達したらバックグラウンドで作り直すことのテスト"""
+        monkeypatch.setattr(search, "SEARCH_INDEX_REBUILD_PAGES", 2)
+        url, markdown = PAGES[0]
+        cache.set(url, {"Markdown": markdown})
+        index = await search.get_search_index()
+        assert len(index) == 2
+
+        for url, markdown in PAGES[1:]:
+            cache.set(url, {"Markdown": markdown})
+            manual.mark_manual_cache_updated()
+            assert await search.get_search_index() is index
+
+        # 2件目の保存で作り直しが始まり、完了後は新しい索引を返す
+        rebuilt = await search._SEARCH_INDEX_TASK
+        assert len(rebuilt) == 6
+        assert await search.get_search_index() is rebuilt
+        assert rebuilt.search("ディスク 修正")[0]["Url"] == PAGES[1][0]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_after_interval(self, cache, monkeypatch):
+        """件数に達しなくても、一定の時間が経過したら作り直すことのテスト"""
+        url, markdown = PAGES[0]
+        cache.set(url, {"Markdown": markdown})
+        index = await search.get_search_index()
+
+        url, markdown = PAGES[1]
+        cache.set(url, {"Markdown": markdown})
+        manual.mark_manual_cache_updated()
+        assert await search.get_search_index() is index
+        assert search._SEARCH_INDEX_TASK is None
+
+        monkeypatch.setattr(search, "SEARCH_INDEX_REBUILD_INTERVAL_SECONDS", 0)
+        assert await search.get_search_index() is index
+        assert len(await search._SEARCH_INDEX_TASK) == 4
+
+    @pytest.mark.asyncio
+    async def test_explicit_rebuild(self, cache):
+        """rebuildを指定した場合は、件数によらず作り直した索引を返すことのテスト"""
+        url, markdown = PAGES[0]
+        cache.set(url, {"Markdown": markdown})
+        await search.get_search_index()
+
+        url, markdown = PAGES[1]
+        cache.set(url, {"Markdown": markdown})
+        assert len(await search.get_search_index(rebuild=True)) == 4
@@ -0,0 +1,92 @@
+from docs.sections import build_chunks, page_offsets, section_tree, select_chunk
+
+URL = "https://manual.sakura.ad.jp/cloud/server/about.html"
+
+MARKDOWN = """前書き
+
+サーバ
+===
+
+概要
+
+作成
+---
+
+作成の手順
+
+### コントロールパネル
+
+画面から作成する
+
+削除
+---
+
+削除の手順
+"""
+
+
+class TestSections:
+    """ページのセクション・ページ分割のテスト"""
+
+    def test_section_tree(self):
+        """見出しの階層に沿って番号が振られ、セクションの範囲が下位のセクションを含むことのテスト"""
+        sections = section_tree(MARKDOWN)
+
+        assert [(section["Id"], section["Level"], section["Heading"]) for section in sections] == [
+            ("0", 0, ""),
+            ("1", 1, "サーバ"),
+            ("1.1", 2, "作成"),
+            ("1.1.1", 3, "コントロールパネル"),
+            ("1.2", 2, "削除"),
+        ]
+        create = MARKDOWN[sections[2]["Start"] : sections[2]["End"]]
+        assert "画面から作成する" in create
+        assert "削除" not in create
+        assert sections[1]["End"] == len(MARKDOWN)
+
+    def test_page_offsets(self):
+        """セクションの先頭、なければ行の先頭でページが区切られることのテスト"""
+        text = "a" * 5 + "\n" + "b" * 5 + "\n" + "c" * 5
+        assert page_offsets(text, [], size=8) == [0, 6, 12, 17]
+        assert page_offsets(text, [12], size=13) == [0, 12, 17]
+        assert page_offsets("x" * 10, [], size=4) == [0, 4, 8, 10]
+        assert page_offsets(text, [], size=100) == [0, 17]
+
+    def test_select_chunk_short_page(self):
+        """短いページはセクション・ページを指定しなければ本文をそのまま返すことのテスト"""
+        chunks = build_chunks(MARKDOWN)
+
+        assert select_chunk(URL, MARKDOWN, chunks) == MARKDOWN
+
+        result = select_chunk(URL, MARKDOWN, chunks, section="作成")
+        assert result["Section"] == "1.1"
+        assert result["Content"].startswith("作成\n---")
+        assert "画面から作成する" in result["Content"]
+        assert (result["Page"], result["TotalPages"]) == (1, 1)
+
+        assert select_chunk(URL, MARKDOWN, chunks, section="1.2")["Heading"] == "削除"
+        assert "見つかりません" in select_chunk(URL, MARKDOWN, chunks, section="9")
+        assert select_chunk(URL, MARKDOWN, chunks, page=2) == "pageは1-1の範囲で指定してください"
+
+    def test_select_chunk_long_page(self, monkeypatch):
+        """長いページは目次と最初のページを返し、ページ番号で続きを取得できることのテスト"""
+        monkeypatch.setattr("docs.sections.MAX_PAGE_CHARS", 40)
+        chunks = build_chunks(MARKDOWN)
+
+        first = select_chunk(URL, MARKDOWN, chunks)
+        assert [entry["Id"] for entry in first["TableOfContents"]] == [
+            "0",
+            "1",
+            "1.1",
+            "1.1.1",
+            "1.2",
+        ]
+        assert first["Page"] == 1
+        assert first["TotalPages"] == len(chunks["Pages"]) - 1 > 1
+
+        pages = [
+            select_chunk(URL, MARKDOWN, chunks, page=page)["Content"]
+            for page in range(1, first["TotalPages"] + 1)
+        ]
+        assert "".join(pages) == MARKDOWN
+        assert "TableOfContents" not in select_chunk(URL, MARKDOWN, chunks, page=2)
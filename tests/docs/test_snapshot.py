@@ -0,0 +1,95 @@
+import httpx
+import pytest
+from docs import crawler
+from docs.snapshot import ManualSnapshot, current_snapshot, prune_snapshots
+
+CLOUD_URL = "https://manual.sakura.ad.jp/cloud/server/about.html"
+API_URL = "https://manual.sakura.ad.jp/cloud-api/1.1/server/index.html"
+
+API_INDEX_HTML = '<a class="js-toggle-guides" href="server/index.html">サーバ</a>'
+PAGE_HTML = {
+    CLOUD_URL: '<div role="main"><h1>サーバ</h1></div>',
+    API_URL: '<div id="content"><h1>サーバAPI</h1></div>',
+}
+
+
+class TestManualSnapshot:
+    """マニュアルのスナップショットのテスト"""
+
+    def test_create_and_read(self, tmp_path):
+        """作成したスナップショットが現在のものとなり、内容がハッシュ値で検証されることのテスト"""
+        snapshot = ManualSnapshot.create(
+            [(CLOUD_URL, "# サーバ")], {"サーバ": API_URL}, root=tmp_path
+        )
+
+        current = current_snapshot(tmp_path)
+        assert current.version == snapshot.version
+        assert current.read(CLOUD_URL) == "# サーバ"
+        assert current.read(API_URL) is None
+        assert current.manifest["ApiOutline"] == {"サーバ": API_URL}
+        assert list(current.pages()) == [(CLOUD_URL, "# サーバ")]
+
+        # 内容が書き換えられたページは返さない
+        (snapshot.directory / snapshot.manifest["Pages"][CLOUD_URL]["Path"]).write_text("# 改ざん")
+        assert current.read(CLOUD_URL) is None
+        assert current.verify() == [CLOUD_URL]
+
+    def test_prune(self, tmp_path):
+        """現在のスナップショットを含めて指定数を残し、古いものが削除されることのテスト"""
+        versions = [ManualSnapshot.create([], root=tmp_path).version for _ in range(3)]
+
+        assert prune_snapshots(2, tmp_path) == versions[:1]
+        assert current_snapshot(tmp_path).version == versions[-1]
+        assert not (tmp_path / versions[0]).exists()
+
+    def test_outline_urls(self):
+        """目次の入れ子の項目のurlが重複なく列挙されることのテスト"""
+        outline = {"A": ["a", {"B": ["b", {}], "C": ["a", {"D": ["d", {}]}]}]}
+
+        assert crawler.outline_urls(outline) == ["a", "b", "d"]
+
+    @pytest.mark.asyncio
+    async def test_crawl_manuals(self, tmp_path, monkeypatch):
+        """目次のページを取得してスナップショットを作成し、取得できないページはエラーとして記録されることのテスト"""
+        outline_path = tmp_path / "outline.json"
+        outline_path.write_text(
+            '{"サーバ": ["%s", {"なし": ["https://manual.sakura.ad.jp/cloud/missing.html", {}]}]}'
+            % CLOUD_URL
+        )
+
+        async def request(url, headers):
+            request = httpx.Request("GET", url)
+            if url == crawler.API_MANUAL_INDEX_URL:
+                return httpx.Response(200, text=API_INDEX_HTML, request=request)
+            if url in PAGE_HTML:
+                return httpx.Response(200, text=PAGE_HTML[url], request=request)
+            response = httpx.Response(404, request=request)
+            response.raise_for_status()
+
+        monkeypatch.setattr(crawler, "OUTLINE_PATH", outline_path)
+        monkeypatch.setattr(crawler, "request_manual_page", request)
+
+        snapshot = await crawler.crawl_manuals(concurrency=2, rate=0, root=tmp_path / "snapshots")
+
+        assert snapshot.read(CLOUD_URL).startswith("サーバ")
+        assert snapshot.read(API_URL).startswith("サーバAPI")
+        assert snapshot.manifest["ApiOutline"] == {"サーバ": API_URL}
+        assert [error["Url"] for error in snapshot.manifest["Errors"]] == [
+            "https://manual.sakura.ad.jp/cloud/missing.html"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_crawl_page_parse_error(self, monkeypatch):
+        """ページの変換で例外が発生した場合にエラーとして返されることのテスト"""
+
+        async def request(url, headers):
+            return httpx.Response(200, text="<html></html>", request=httpx.Request("GET", url))
+
+        def reformat(html):
+            raise ValueError("想定外の構造です")
+
+        monkeypatch.setattr(crawler, "request_manual_page", request)
+
+        result = await crawler.crawl_page(CLOUD_URL, reformat, crawler.RateLimiter(0))
+
+        assert result == (CLOUD_URL, None, "想定外の構造です")
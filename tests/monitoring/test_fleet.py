@@ -0,0 +1,176 @@
+import math
+import numpy as np
+import pytest
+from src.core.auth import SacloudApiKey
+from monitoring.handlers.fleet import (
+    FleetMonitorHandler,
+    rank_top_k,
+    select_metric,
+    series_statistic,
+)
+from fastmcp import FastMCP, Client
+from core.consts import ZONE_URLS
+from tests.error import INVALID_AUTH_ERROR, get_invalid_zone_message
+
+
+class TestFleetMonitor:
+    """フリートモニタの集計処理のテスト"""
+
+    def test_select_metric(self):
+        """ルータとアプライアンスの項目名の違いを吸収し、合計では欠損値を除いて足し合わせることのテスト"""
+        router = {"In": np.array([1.0, np.nan, np.nan]), "Out": np.array([2.0, 3.0, np.nan])}
+        appliance = {"Receive": np.array([5.0]), "Send": np.array([6.0])}
+
+        assert select_metric(appliance, "in").tolist() == [5.0]
+        assert select_metric(appliance, "out").tolist() == [6.0]
+        total = select_metric(router, "total")
+        assert total[:2].tolist() == [3.0, 3.0]
+        assert math.isnan(total[2])
+        assert select_metric({}, "total") is None
+
+    def test_series_statistic(self):
+        """統計値の計算のテスト"""
+        values = np.array([1.0, 4.0, np.nan, 2.0, np.nan])
+
+        assert series_statistic(values, "Latest") == 2.0
+        assert series_statistic(values, "Max") == 4.0
+        assert series_statistic(values, "Mean") == 7.0 / 3
+        assert math.isnan(series_statistic(None, "Mean"))
+        assert math.isnan(series_statistic(np.array([np.nan]), "Max"))
+
+    def test_rank_top_k(self):
+        """NaNを除いて値の大きい順に上位k件が返ることのテスト"""
+        values = np.array([3.0, np.nan, 9.0, 1.0, 7.0])
+
+        assert rank_top_k(values, 2).tolist() == [2, 4]
+        assert rank_top_k(values, 10).tolist() == [2, 4, 0, 3]
+
+
+class TestFleetMonitorHandler:
+    """FleetMonitorHandlerのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_init(self, mock_mcp: FastMCP, zone_urls: dict[str, str], api_key: SacloudApiKey):
+        """FleetMonitorHandlerの初期化テスト"""
+        handler = FleetMonitorHandler(mock_mcp, zone_urls, api_key)
+
+        # ハンドラの各要素が正しいか検証
+        assert handler.mcp == mock_mcp
+        assert handler.zone_urls == ZONE_URLS
+
+        # ツールの配列取得
+        tool_list = await mock_mcp.list_tools()
+
+        # ツールの要素数が正しいか検証
+        assert len(tool_list) == 2
+
+        tool_names = [tool.name for tool in tool_list]
+
+        # ツールが正しく設定されているか検証
+        assert "get_fleet_monitor_top" in tool_names
+        assert "detect_traffic_anomalies" in tool_names
+
+    @pytest.mark.asyncio
+    async def test_get_fleet_monitor_top_invalid_zone(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str]
+    ):
+        """
+        フリートモニタの無効なゾーン指定時のエラーテスト
+        """
+
+        _fleet_handler = FleetMonitorHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("get_fleet_monitor_top", {"zones": ["invalid"]})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert get_invalid_zone_message(zone_urls) == result
+
+    @pytest.mark.asyncio
+    async def test_get_fleet_monitor_top_invalid_api_key(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str]
+    ):
+        """
+        フリートモニタの無効なAPIキーのエラーテスト
+        """
+
+        invalid_api_key = ("", "")
+        _fleet_handler = FleetMonitorHandler(mock_mcp, zone_urls, invalid_api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("get_fleet_monitor_top", {})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert INVALID_AUTH_ERROR == result
+
+    @pytest.mark.asyncio
+    async def test_get_fleet_monitor_top_invalid_metric(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str]
+    ):
+        """
+        フリートモニタの無効な項目指定時のエラーテスト
+        """
+
+        _fleet_handler = FleetMonitorHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("get_fleet_monitor_top", {"metric": "cpu"})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert result == "項目は in, out または total を指定する必要があります。"
+
+    @pytest.mark.asyncio
+    async def test_detect_traffic_anomalies_invalid_method(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str]
+    ):
+        """
+        異常検知の無効な計算方法指定時のエラーテスト
+        """
+
+        _fleet_handler = FleetMonitorHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("detect_traffic_anomalies", {"method": "iqr"})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert result == "計算方法は zscore または mad を指定する必要があります。"
+
+    @pytest.mark.asyncio
+    async def test_detect_traffic_anomalies_invalid_window(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str]
+    ):
+        """
+        異常検知の集計期間が上限を超える場合のエラーテスト
+        """
+
+        _fleet_handler = FleetMonitorHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "detect_traffic_anomalies", {"window_minutes": 7 * 24 * 60 + 1}
+            )
+            result = res[0].text
+
+            assert result == "集計期間は1-10080分の範囲で指定する必要があります。"
+
+    @pytest.mark.asyncio
+    async def test_detect_traffic_anomalies_invalid_api_key(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str]
+    ):
+        """
+        異常検知の無効なAPIキーのエラーテスト
+        """
+
+        invalid_api_key = ("", "")
+        _fleet_handler = FleetMonitorHandler(mock_mcp, zone_urls, invalid_api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("detect_traffic_anomalies", {})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert INVALID_AUTH_ERROR == result
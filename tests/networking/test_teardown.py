@@ -0,0 +1,182 @@
+import pytest
+from src.core.auth import SacloudApiKey
+from networking.handlers.teardown import (
+    DELETE_BRIDGE,
+    DELETE_ROUTER,
+    DELETE_SERVER,
+    DELETE_SWITCH,
+    DISCONNECT_BRIDGE,
+    DISCONNECT_INTERFACE,
+    STOP_SERVER,
+    TeardownHandler,
+    build_teardown_graph,
+    plan_levels,
+)
+from fastmcp import FastMCP, Client
+from core.consts import ZONE_URLS
+from tests.error import INVALID_AUTH_ERROR, get_invalid_zone_message
+
+
+@pytest.fixture
+def resources() -> dict:
+    """テスト用のリソース構成（サーバ2台、スイッチ、ルータ、ブリッジ）"""
+    return {
+        "Servers": [
+            {"ID": "s1", "Name": "web", "Tags": ["env-test"], "Instance": {"Status": "up"}},
+            {"ID": "s2", "Name": "other", "Tags": [], "Instance": {"Status": "down"}},
+        ],
+        "Interfaces": [
+            {"ID": "i1", "Server": {"ID": "s1"}, "Switch": {"ID": "sw1"}},
+            {"ID": "i2", "Server": {"ID": "s2"}, "Switch": {"ID": "sw1"}},
+            {"ID": "i3", "Server": {"ID": "s1"}, "Switch": {"ID": "rsw1"}},
+        ],
+        "Switches": [
+            {"ID": "sw1", "Name": "private", "Tags": ["env-test"], "Bridge": {"ID": "b1"}},
+            {"ID": "rsw1", "Name": "router-switch", "Tags": [], "Internet": {"ID": "r1"}},
+        ],
+        "Internet": [
+            {"ID": "r1", "Name": "router", "Tags": ["env-test"], "Switch": {"ID": "rsw1"}},
+        ],
+        "Bridges": [{"ID": "b1", "Name": "bridge"}],
+    }
+
+
+class TestTeardownGraph:
+    """依存グラフ構築のテスト"""
+
+    def test_plan_levels_by_tag(self, resources: dict):
+        """タグ指定時に、依存関係の順にレベル分けされることのテスト"""
+        _nodes, edges, not_found, blockers = build_teardown_graph(resources, ["b1"], "env-test")
+        levels = plan_levels(edges)
+
+        assert not_found == []
+        assert blockers == []
+        assert levels == [
+            [
+                (DISCONNECT_BRIDGE, "sw1"),
+                (DISCONNECT_INTERFACE, "i2"),
+                (STOP_SERVER, "s1"),
+            ],
+            [(DELETE_BRIDGE, "b1"), (DELETE_SERVER, "s1")],
+            [(DELETE_ROUTER, "r1"), (DELETE_SWITCH, "sw1")],
+        ]
+
+    def test_router_switch_selects_router(self, resources: dict):
+        """ルータのスイッチを指定した場合に、ルータの削除として扱われることのテスト"""
+        resources["Servers"][0]["Instance"]["Status"] = "down"
+        nodes, edges, not_found, blockers = build_teardown_graph(
+            resources, ["rsw1", "unknown"], None, True
+        )
+
+        assert not_found == ["unknown"]
+        assert blockers == []
+        # 対象外のサーバのNICを切断してからルータを削除する
+        assert set(nodes) == {(DISCONNECT_INTERFACE, "i3"), (DELETE_ROUTER, "r1")}
+        assert edges[(DISCONNECT_INTERFACE, "i3")] == {(DELETE_ROUTER, "r1")}
+
+    def test_running_server_interface_blocks(self, resources: dict):
+        """削除するスイッチに起動中の対象外サーバのNICがある場合に、切断せずBlockersとして返されることのテスト"""
+        nodes, _edges, _not_found, blockers = build_teardown_graph(resources, ["r1"], None)
+
+        assert set(nodes) == {(DELETE_ROUTER, "r1")}
+        assert blockers == [
+            {"InterfaceID": "i3", "ServerID": "s1", "ServerName": None, "SwitchID": "rsw1"}
+        ]
+
+    def test_plan_levels_cycle(self):
+        """依存関係が循環している場合のエラーテスト"""
+        edges = {("a", "1"): {("b", "2")}, ("b", "2"): {("a", "1")}}
+
+        with pytest.raises(ValueError):
+            plan_levels(edges)
+
+
+class TestTeardownHandler:
+    """TeardownHandlerのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_init(self, mock_mcp: FastMCP, zone_urls: dict[str, str], api_key: SacloudApiKey):
+        """TeardownHandlerの初期化テスト"""
+        handler = TeardownHandler(mock_mcp, zone_urls, api_key)
+
+        # ハンドラの各要素が正しいか検証
+        assert handler.mcp == mock_mcp
+        assert handler.zone_urls == ZONE_URLS
+
+        # ツールの配列取得
+        tool_list = await mock_mcp.list_tools()
+
+        # ツールの要素数が正しいか検証
+        assert len(tool_list) == 1
+
+        tool_names = [tool.name for tool in tool_list]
+
+        # ツールが正しく設定されているか検証
+        assert "teardown_resources" in tool_names
+
+    @pytest.mark.asyncio
+    async def test_teardown_resources_invalid_zone(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], api_key: SacloudApiKey
+    ):
+        """
+        一括削除の無効なゾーン指定時のエラーテスト
+        """
+
+        _teardown_handler = TeardownHandler(mock_mcp, zone_urls, api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("teardown_resources", {"zone": "", "tag": "env-test"})
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert get_invalid_zone_message(zone_urls) == result
+
+    @pytest.mark.asyncio
+    async def test_teardown_resources_invalid_api_key(
+        self, mock_mcp: FastMCP, zone_urls: dict[str, str], test_zone: str
+    ):
+        """
+        一括削除の無効なAPIキーのエラーテスト
+        """
+
+        invalid_api_key = ("", "")
+        _teardown_handler = TeardownHandler(mock_mcp, zone_urls, invalid_api_key)
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "teardown_resources", {"zone": test_zone, "tag": "env-test"}
+            )
+            result = res[0].text
+
+            assert isinstance(result, str)
+            assert INVALID_AUTH_ERROR == result
+
+    @pytest.mark.asyncio
+    async def test_teardown_resources_blocked(
+        self,
+        mock_mcp: FastMCP,
+        zone_urls: dict[str, str],
+        test_zone: str,
+        resources: dict,
+        monkeypatch,
+    ):
+        """
+        起動中の対象外サーバのNICがある場合に、削除を実行せずBlockersを返すことのテスト
+        """
+
+        handler = TeardownHandler(mock_mcp, zone_urls, ("token", "secret"))
+
+        async def fetch_resources(ctx, zone):
+            return resources
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("APIが呼ばれました")
+
+        monkeypatch.setattr(handler, "_fetch_resources", fetch_resources)
+        monkeypatch.setattr(handler, "handle_api_request", fail)
+
+        result = await handler.teardown_resources(None, test_zone, ["r1"], dry_run=False)
+
+        assert [blocker["InterfaceID"] for blocker in result["Blockers"]] == ["i3"]
+        assert "Error" in result
+        assert "Results" not in result
@@ -0,0 +1,214 @@
+import bisect
+import datetime
+import json
+
+import pytest
+from fastmcp import Client, FastMCP
+from objectstorage import listing
+from objectstorage.consts import OBJDCTSTORAGE_ZONE_URLS
+from objectstorage.handlers import objectstorage
+from objectstorage.handlers.objectstorage import ObjectStorageHandler
+
+KEYS = sorted(
+    ["readme.txt", "top.txt"]
+    + [f"logs/{day:02d}/{hour:02d}.log" for day in range(1, 4) for hour in range(10)]
+    + [f"images/{index:03d}.png" for index in range(25)]
+    + [f"backup/{index}.tar" for index in range(7)]
+)
+
+MODIFIED = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class FakePaginator:
+    """キーのリストに対するListObjectsV2のページネータ"""
+
+    def __init__(self, s3: "FakeS3"):
+        self.s3 = s3
+
+    def paginate(
+        self, Bucket, Prefix="", Delimiter=None, ContinuationToken=None, PaginationConfig=None
+    ):
+        page_size = PaginationConfig["PageSize"]
+        position = int(ContinuationToken) if ContinuationToken else 0
+        # キーは整列しているため、プレフィックスに一致する範囲を二分探索で求める
+        keys = self.s3.keys
+        position = max(position, bisect.bisect_left(keys, Prefix))
+        while True:
+            self.s3.requests += 1
+            contents, prefixes = [], []
+            while (
+                position < len(keys)
+                and keys[position].startswith(Prefix)
+                and len(contents) + len(prefixes) < page_size
+            ):
+                key = keys[position]
+                position += 1
+                if Delimiter and Delimiter in key[len(Prefix) :]:
+                    common = key[: key.index(Delimiter, len(Prefix)) + len(Delimiter)]
+                    if common not in prefixes:
+                        prefixes.append(common)
+                    # 同じ共通のプレフィックスのキーは読み飛ばす
+                    while position < len(keys) and keys[position].startswith(common):
+                        position += 1
+                    continue
+                contents.append({"Key": key, "Size": len(key), "LastModified": MODIFIED})
+            truncated = position < len(keys) and keys[position].startswith(Prefix)
+            page = {"IsTruncated": truncated, "Contents": contents}
+            if prefixes:
+                page["CommonPrefixes"] = [{"Prefix": common} for common in prefixes]
+            if truncated:
+                page["NextContinuationToken"] = str(position)
+            yield page
+            if not truncated:
+                return
+
+
+class FakeS3:
+    """ListObjectsV2のページネータのみを持つS3クライアント"""
+
+    def __init__(self, keys: list = KEYS):
+        self.keys = keys
+        self.requests = 0
+
+    def get_paginator(self, operation_name: str) -> FakePaginator:
+        assert operation_name == "list_objects_v2"
+        return FakePaginator(self)
+
+
+async def collect(function, max_keys: int, **kwargs) -> list:
+    """カーソルをたどって全件を取得し、1回あたりの件数が上限以下であることを確認する"""
+    s3 = FakeS3()
+    keys, cursor = [], None
+    for _ in range(100):
+        result = await function(s3, "bucket", max_keys=max_keys, cursor=cursor, **kwargs)
+        assert len(result["Contents"]) <= max_keys
+        keys.extend(obj["Key"] for obj in result["Contents"])
+        cursor = result["NextCursor"]
+        if not cursor:
+            return keys
+    raise AssertionError("カーソルが終了しない")
+
+
+class TestObjectList:
+    """オブジェクト一覧の取得のテスト"""
+
+    def test_list_objects_page(self):
+        """上限を超えない範囲でページをまとめて取得し、続きのトークンを返すことのテスト"""
+        result = listing.list_objects_page(FakeS3(), "bucket", "logs/", None, 12)
+        assert [obj["Key"] for obj in result["Contents"]] == KEYS[KEYS.index("logs/01/00.log") :][
+            :12
+        ]
+        assert result["Contents"][0]["LastModified"] == "2024-01-01T00:00:00+00:00"
+        assert result["Token"] == str(KEYS.index("logs/01/00.log") + 12)
+
+        result = listing.list_objects_page(FakeS3(), "bucket", "", "/", 1000)
+        assert result["CommonPrefixes"] == ["backup/", "images/", "logs/"]
+        assert [obj["Key"] for obj in result["Contents"]] == ["readme.txt", "top.txt"]
+        assert result["Token"] is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_keys", [1, 7, 1000])
+    async def test_list_objects(self, max_keys):
+        """カーソルをたどると全てのオブジェクトが順に1回ずつ取得されることのテスト"""
+        assert await collect(listing.list_objects, max_keys) == KEYS
+        assert await collect(listing.list_objects, max_keys, prefix="images/") == [
+            key for key in KEYS if key.startswith("images/")
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_keys", [1, 5, 1000])
+    async def test_list_objects_parallel(self, max_keys):
+        """共通のプレフィックスごとに並列に取得しても、全てのオブジェクトが1回ずつ取得されることのテスト"""
+        keys = await collect(listing.list_objects_parallel, max_keys, concurrency=2)
+        assert sorted(keys) == KEYS
+        assert len(keys) == len(set(keys))
+
+        keys = await collect(listing.list_objects_parallel, max_keys, prefix="logs/", concurrency=3)
+        assert sorted(keys) == [key for key in KEYS if key.startswith("logs/")]
+
+    @pytest.mark.asyncio
+    async def test_parallel_fans_out(self):
+        """最初の呼び出しで、見つけたプレフィックスを並列に取得することのテスト"""
+        result = await listing.list_objects_parallel(
+            FakeS3(), "bucket", max_keys=1000, concurrency=10
+        )
+        assert sorted(obj["Key"] for obj in result["Contents"]) == KEYS
+        assert result["NextCursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_parallel_many_prefixes(self):
+        """小さなプレフィックスが多数ある場合も、カーソルが大きくならず、1回でmax_keys件近くを返すことのテスト"""
+        keys = sorted(f"{prefix:04d}/{index}.txt" for prefix in range(3000) for index in range(2))
+        s3 = FakeS3(keys)
+        collected, cursor, calls = [], None, 0
+        while True:
+            result = await listing.list_objects_parallel(
+                s3, "bucket", max_keys=1000, cursor=cursor, concurrency=10
+            )
+            calls += 1
+            collected.extend(obj["Key"] for obj in result["Contents"])
+            cursor = result["NextCursor"]
+            if not cursor:
+                break
+            assert len(result["Contents"]) >= 990
+            assert len(cursor) < 2000
+        assert sorted(collected) == keys
+        assert calls <= 7
+
+    @pytest.mark.asyncio
+    async def test_cursor_mismatch(self):
+        """別の条件のカーソル・不正なカーソルはエラーとなることのテスト"""
+        result = await listing.list_objects(FakeS3(), "bucket", max_keys=1)
+        with pytest.raises(ValueError):
+            await listing.list_objects_parallel(FakeS3(), "bucket", cursor=result["NextCursor"])
+        with pytest.raises(ValueError):
+            await listing.list_objects(FakeS3(), "other", cursor=result["NextCursor"])
+        with pytest.raises(ValueError):
+            await listing.list_objects(FakeS3(), "bucket", cursor="!!")
+
+    @pytest.mark.asyncio
+    async def test_get_objectstorage_object_list(self, mock_mcp: FastMCP, monkeypatch):
+        """オブジェクト一覧の取得ツールのテスト"""
+        monkeypatch.setattr(objectstorage, "get_s3_client", lambda endpoint, api_key: FakeS3())
+        ObjectStorageHandler(mock_mcp, OBJDCTSTORAGE_ZONE_URLS, ("", ""), ("key", "secret"))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool(
+                "get_objectstorage_object_list",
+                {"bucket": "bucket", "delimiter": "/", "max_keys": 2},
+            )
+            result = json.loads(res[0].text)
+            assert result["KeyCount"] == 0
+            assert result["CommonPrefixes"] == ["backup/", "images/"]
+
+            res = await client.call_tool(
+                "get_objectstorage_object_list",
+                {
+                    "bucket": "bucket",
+                    "delimiter": "/",
+                    "max_keys": 2,
+                    "cursor": result["NextCursor"],
+                },
+            )
+            result = json.loads(res[0].text)
+            assert result["CommonPrefixes"] == ["logs/"]
+            assert [obj["Key"] for obj in result["Contents"]] == ["readme.txt"]
+
+            res = await client.call_tool(
+                "get_objectstorage_object_list", {"bucket": "bucket", "max_keys": 0}
+            )
+            assert res[0].text == "max_keysは1-10000の範囲で指定してください"
+
+            res = await client.call_tool(
+                "get_objectstorage_object_list", {"bucket": "bucket", "cursor": "!!"}
+            )
+            assert res[0].text.startswith("cursorが不正です")
+
+    @pytest.mark.asyncio
+    async def test_get_objectstorage_object_list_invalid_api_key(self, mock_mcp: FastMCP):
+        """オブジェクト一覧の取得の無効なAPIキーのエラーテスト"""
+        ObjectStorageHandler(mock_mcp, OBJDCTSTORAGE_ZONE_URLS, ("", ""), ("", ""))
+
+        async with Client(mock_mcp) as client:
+            res = await client.call_tool("get_objectstorage_object_list", {"bucket": "bucket"})
+            assert res[0].text.startswith("オブジェクトストレージの認証情報が設定されていません。")
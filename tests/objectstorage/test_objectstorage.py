@@ -22,7 +22,7 @@ class TestObjectStorageHandler:
         tool_list = await mock_mcp.list_tools()
 
         # ツールの要素数が正しいか検証
-        assert len(tool_list) == 3
+        assert len(tool_list) == 4
 
         tool_names = [tool.name for tool in tool_list]     
 
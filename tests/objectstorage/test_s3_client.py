@@ -0,0 +1,90 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastmcp import Client, FastMCP
+from objectstorage import client
+from objectstorage.client import clear_s3_clients, get_s3_client, run_s3
+from objectstorage.consts import OBJDCTSTORAGE_ZONE_URLS
+from objectstorage.handlers import objectstorage
+from objectstorage.handlers.objectstorage import ObjectStorageHandler
+
+ENDPOINT = "https://s3.isk01.sakurastorage.jp"
+
+
+class TestS3Client:
+    """S3クライアントの使い回しのテスト"""
+
+    def test_cached_per_endpoint_and_key(self):
+        """エンドポイントと認証情報の組ごとに同じクライアントが返されることのテスト"""
+        clear_s3_clients()
+        try:
+            s3 = get_s3_client(ENDPOINT, ("key", "secret"))
+
+            assert get_s3_client(ENDPOINT, ("key", "secret")) is s3
+            assert get_s3_client(ENDPOINT, ("key", "other")) is not s3
+            assert get_s3_client("https://example.com", ("key", "secret")) is not s3
+            # シークレットアクセスキーはそのままキャッシュのキーに含めない
+            assert all("secret" not in key for key in client._CLIENTS)
+
+            config = s3.meta.config
+            assert config.max_pool_connections == client.S3_MAX_POOL_CONNECTIONS
+            assert config.tcp_keepalive is True
+            assert config.retries["mode"] == "standard"
+            assert s3.meta.region_name == client.S3_REGION
+        finally:
+            clear_s3_clients()
+        assert get_s3_client(ENDPOINT, ("key", "secret")) is not s3
+        clear_s3_clients()
+
+
+class SlowS3Client:
+    """呼び出しに時間のかかるS3クライアント"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.threads = set()
+
+    def list_buckets(self):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return {"Buckets": [{"Name": "bucket"}]}
+
+
+class TestRunS3:
+    """S3クライアントの呼び出しをスレッドで実行するテスト"""
+
+    @pytest.mark.asyncio
+    async def test_bucket_list_overlaps(self, mock_mcp: FastMCP, monkeypatch):
+        """バケット一覧の取得がイベントループを止めず、並行した呼び出しが重なって実行されることのテスト"""
+        slow = SlowS3Client(0.2)
+        monkeypatch.setattr(objectstorage, "get_s3_client", lambda endpoint, api_key: slow)
+        ObjectStorageHandler(mock_mcp, OBJDCTSTORAGE_ZONE_URLS, ("", ""), ("key", "secret"))
+
+        async with Client(mock_mcp) as client:
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(client.call_tool("get_objectstorage_bucket_list") for _ in range(4))
+            )
+            elapsed = time.perf_counter() - start
+
+        assert all(json.loads(res[0].text)["Buckets"][0]["Name"] == "bucket" for res in results)
+        assert threading.get_ident() not in slow.threads
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_cancel(self):
+        """キャンセルされた呼び出しは待たずに終了することのテスト"""
+        slow = SlowS3Client(0.3)
+        task = asyncio.create_task(run_s3(slow.list_buckets))
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        start = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert time.perf_counter() - start < 0.1
+        # 実行中の呼び出しの終了を待ってから次のテストに進む
+        await asyncio.sleep(0.35)